@@ -46,6 +46,18 @@ class MovieRentalGUI:
         date_numbers.reverse()
         return [int(number) for number in date_numbers]
 
+    def get_report_limit(self):
+        limit = self._lbl_with_ent_report_limit.get().strip()
+        if limit == "":
+            return None
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise DataException("Invalid number of entries! It must be an integer!")
+        if limit < 1:
+            raise DataException("Invalid number of entries! It must be positive!")
+        return limit
+
     def clear_result_box(self):
         self._result_box["state"] = "normal"
         self._result_box.delete(1.0, tkinter.END)
@@ -90,6 +102,7 @@ class MovieRentalGUI:
         self._lbl_with_ent_rental_date.clear()
         self._lbl_with_ent_rental_due_date.clear()
         self._lbl_with_ent_rental_return_date.clear()
+        self._lbl_with_ent_report_limit.clear()
 
     def add_client(self):
         client_id = self._lbl_with_ent_client_id.get()
@@ -354,9 +367,10 @@ class MovieRentalGUI:
 
     def most_rented_movies(self):
         self.clear_result_box()
-        self.clear_inputs()
         try:
-            most_rented_movies = self.__rental_service.generate_most_rented_movies()
+            limit = self.get_report_limit()
+            self.clear_inputs()
+            most_rented_movies = self.__rental_service.generate_most_rented_movies(limit)
             if len(most_rented_movies) == 0:
                 raise DataException("No movies have been rented!")
         except ShopException as se:
@@ -366,9 +380,10 @@ class MovieRentalGUI:
 
     def most_active_clients(self):
         self.clear_result_box()
-        self.clear_inputs()
         try:
-            most_active_clients = self.__rental_service.generate_most_active_clients()
+            limit = self.get_report_limit()
+            self.clear_inputs()
+            most_active_clients = self.__rental_service.generate_most_active_clients(limit)
             if len(most_active_clients) == 0:
                 raise DataException("No movies have been rented!")
         except ShopException as se:
@@ -378,9 +393,10 @@ class MovieRentalGUI:
 
     def overdue_movies(self):
         self.clear_result_box()
-        self.clear_inputs()
         try:
-            overdue_movies = self.__rental_service.generate_late_rentals()
+            limit = self.get_report_limit()
+            self.clear_inputs()
+            overdue_movies = self.__rental_service.generate_late_rentals(limit)
             if len(overdue_movies) == 0:
                 raise DataException("There are no overdue movies!")
         except ShopException as se:
@@ -421,6 +437,8 @@ class MovieRentalGUI:
         self.print_line_to_result_box("In order to rent a movie, all fields except the return date are necessary\n")
         self.print_line_to_result_box("In order to return a movie, only the rental id and the return date are "
                                       "necessary\n")
+        self.print_line_to_result_box("The statistics buttons show only as many entries as the number in the Top "
+                                      "field, or all of them if it is empty\n")
         self.print_line_to_result_box("Every other button requires no input\n")
         self.print_line_to_result_box("Dates must be given in the following format: DD/MM/YYYY")
 
@@ -529,6 +547,8 @@ class MovieRentalGUI:
         btn_most_active_clients.pack(side=tkinter.LEFT)
         btn_overdue_movies = tkinter.Button(master=frm_bottom_line, text="OVERDUE MOVIES", command=self.overdue_movies)
         btn_overdue_movies.pack(side=tkinter.LEFT)
+        self._lbl_with_ent_report_limit = LabelEntry(frm_bottom_line, "Top", 5)
+        self._lbl_with_ent_report_limit.pack(side=tkinter.LEFT)
         btn_help = tkinter.Button(master=frm_bottom_line, text="HELP", command=self.print_help)
         btn_help.pack(side=tkinter.RIGHT)
         btn_redo = tkinter.Button(master=frm_bottom_line, text="REDO", command=self.redo)
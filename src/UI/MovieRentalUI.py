@@ -36,6 +36,19 @@ class MovieRentalUI:
         date_numbers.reverse()
         return [int(number) for number in date_numbers]
 
+    @staticmethod
+    def read_report_limit():
+        limit = input("How many entries should be shown (leave empty for all): ").strip()
+        if limit == "":
+            return None
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("Invalid number of entries! It must be an integer!")
+        if limit < 1:
+            raise ValueError("Invalid number of entries! It must be positive!")
+        return limit
+
     @staticmethod
     def print_unordered_list_of_elements(element_list):
         for element in element_list:
@@ -215,19 +228,19 @@ class MovieRentalUI:
         self.print_unordered_list_of_elements(searched_list)
 
     def most_rented_movies_menu(self):
-        most_rented_movies = self.rental_service.generate_most_rented_movies()
+        most_rented_movies = self.rental_service.generate_most_rented_movies(self.read_report_limit())
         if len(most_rented_movies) == 0:
             raise MovieException("No movies have been rented!")
         self.print_ordered_list_of_elements(most_rented_movies)
 
     def most_active_clients_menu(self):
-        most_active_clients = self.rental_service.generate_most_active_clients()
+        most_active_clients = self.rental_service.generate_most_active_clients(self.read_report_limit())
         if len(most_active_clients) == 0:
             raise ClientException("No client has rented anything!")
         self.print_ordered_list_of_elements(most_active_clients)
 
     def late_rentals_menu(self):
-        late_rentals = self.rental_service.generate_late_rentals()
+        late_rentals = self.rental_service.generate_late_rentals(self.read_report_limit())
         if len(late_rentals) == 0:
             raise MovieException("There are no late rentals!")
         self.print_ordered_list_of_elements(late_rentals)
@@ -0,0 +1,48 @@
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from domain.validators import RentalValidator, RentalException
+from repository.textdataaccessentity import RentalTextDataAccess
+from repository.textfilerepository import TextFileRepository
+
+
+def write_rentals_file(file_name, rows):
+    """
+    Writes a rentals text file with a given number of generated rentals
+    :param file_name: The name of the file
+    :param rows: The number of rentals to be written
+    :return: nothing
+    """
+    start = date(2018, 1, 1)
+    with open(file_name, "wt") as f:
+        for rental_id in range(1, rows + 1):
+            rented_date = start + timedelta(days=rental_id % 1000)
+            due_date = rented_date + timedelta(days=14)
+            f.write("{0};{1};{2};{3};{4};{5}\n".format(rental_id, rental_id % 5000 + 1, rental_id % 20000 + 1,
+                                                       rented_date, due_date, due_date))
+
+
+def time_load(rows):
+    """
+    Measures the time needed to load a rentals text file into a TextFileRepository
+    :param rows: The number of rentals in the file
+    :return: The loading time, in seconds
+    """
+    file_descriptor, file_name = tempfile.mkstemp(suffix=".txt")
+    os.close(file_descriptor)
+    try:
+        write_rentals_file(file_name, rows)
+        start = time.perf_counter()
+        TextFileRepository(RentalValidator, RentalException, RentalTextDataAccess(), file_name)
+        return time.perf_counter() - start
+    finally:
+        os.remove(file_name)
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [10000, 100000, 1000000]
+    for size in sizes:
+        print("{0:>9} rentals: {1:.2f}s".format(size, time_load(size)))
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date
+
+from domain.validators import RentalValidator, RentalException
+from repository.repo import Repository
+from repository.sqldataaccessentity import RentalSQLDataAccess
+from repository.sqlrepository import SQLRepository
+from repository.sqlschemamigrator import SQLSchemaMigrator
+
+
+def create_rentals_database(rows):
+    """
+    Creates a rentals database in a temporary file, holding a given number of generated rentals
+    :param rows: The number of rentals
+    :return: The name of the file
+    """
+    file_descriptor, file_name = tempfile.mkstemp(suffix=".db")
+    os.close(file_descriptor)
+    connection = sqlite3.connect(file_name)
+    SQLSchemaMigrator(connection).migrate("rentals", RentalSQLDataAccess().get_schema_migrations())
+    start = date(2018, 1, 1).toordinal()
+    connection.executemany("INSERT INTO rentals VALUES(?, ?, ?, ?, ?, ?)",
+                           ((rental_id, rental_id % 5000 + 1, rental_id % 20000 + 1, start + rental_id % 1000,
+                             start + rental_id % 1000 + 14, start + rental_id % 1000 + 14)
+                            for rental_id in range(1, rows + 1)))
+    connection.commit()
+    connection.close()
+    return file_name
+
+
+def load_row_by_row(file_name):
+    """
+    Loads the rentals of a database the way SQLRepository used to, adding every row to the repository on its own
+    :param file_name: The name of the database file
+    :return: nothing
+    """
+    repository = Repository(RentalValidator, RentalException)
+    data_access = RentalSQLDataAccess()
+    connection = sqlite3.connect(file_name)
+    for row in connection.execute("SELECT * FROM rentals"):
+        repository.add(data_access.read_from_line(row))
+    connection.close()
+
+
+def load_in_bulk(file_name):
+    """
+    Opens an SQLRepository on the rentals of a database, which loads them in bulk
+    :param file_name: The name of the database file
+    :return: nothing
+    """
+    SQLRepository(RentalValidator, RentalException, RentalSQLDataAccess(), file_name, "rentals").close()
+
+
+def time_load(load_function, file_name):
+    """
+    Measures the time needed by a load function
+    :param load_function: The function that loads the rentals of a database
+    :param file_name: The name of the database file
+    :return: The loading time, in seconds
+    """
+    start = time.perf_counter()
+    load_function(file_name)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or [10000, 100000, 1000000]
+    for size in sizes:
+        database = create_rentals_database(size)
+        try:
+            for name, function in (("row by row", load_row_by_row), ("bulk", load_in_bulk)):
+                seconds = time_load(function, database)
+                print("{0:>9} rentals, {1:<10} {2:.2f}s ({3:.2f}s per 100k rows)".format(size, name, seconds,
+                                                                                        seconds * 100000 / size))
+        finally:
+            os.remove(database)
@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from domain.rental import Rental
+from domain.validators import RentalValidator, RentalException
+from repository.sqlconnectionpool import SQLConnectionPool
+from repository.sqldataaccessentity import RentalSQLDataAccess
+from repository.sqlrepository import SQLRepository
+from repository.sqlschemamigrator import SQLSchemaMigrator
+
+
+def create_rentals_database():
+    """
+    Creates an empty rentals database in a temporary file
+    :return: The name of the file
+    """
+    file_descriptor, file_name = tempfile.mkstemp(suffix=".db")
+    os.close(file_descriptor)
+    connection = sqlite3.connect(file_name)
+    SQLSchemaMigrator(connection).migrate("rentals", RentalSQLDataAccess().get_schema_migrations())
+    connection.close()
+    return file_name
+
+
+def generate_rentals(count):
+    """
+    Generates a number of rentals
+    :param count: The number of rentals
+    :return: The list of rentals
+    """
+    start = date(2018, 1, 1)
+    return [Rental(rental_id, rental_id % 50 + 1, rental_id % 200 + 1, start + timedelta(days=rental_id % 1000),
+                   start + timedelta(days=rental_id % 1000 + 14)) for rental_id in range(1, count + 1)]
+
+
+def run_with_connection_per_operation(file_name, rentals):
+    """
+    Adds, updates and deletes rentals opening a new connection for every statement
+    :param file_name: The name of the database file
+    :param rentals: The rentals
+    :return: nothing
+    """
+    data_access = RentalSQLDataAccess()
+    for operation in (data_access.add, data_access.update, lambda rental, connection:
+                      data_access.remove(rental.id, connection)):
+        for rental in rentals:
+            connection = sqlite3.connect(file_name)
+            operation(rental, connection)
+            connection.commit()
+            connection.close()
+
+
+def run_with_connection_pool(file_name, rentals):
+    """
+    Adds, updates and deletes rentals through the long-lived connection of a connection pool
+    :param file_name: The name of the database file
+    :param rentals: The rentals
+    :return: nothing
+    """
+    data_access = RentalSQLDataAccess()
+    connection_pool = SQLConnectionPool(file_name)
+    for operation in (data_access.add, data_access.update, lambda rental, connection:
+                      data_access.remove(rental.id, connection)):
+        for rental in rentals:
+            connection = connection_pool.get_connection()
+            operation(rental, connection)
+            connection.commit()
+    connection_pool.close()
+
+
+def run_with_repository(file_name, rentals):
+    """
+    Adds, returns and deletes rentals through an SQLRepository, which keeps its connection open
+    :param file_name: The name of the database file
+    :param rentals: The rentals
+    :return: nothing
+    """
+    repository = SQLRepository(RentalValidator, RentalException, RentalSQLDataAccess(), file_name, "rentals")
+    for rental in rentals:
+        repository.add(rental)
+    for rental in rentals:
+        repository.update(Rental(rental.id, rental.movie_id, rental.client_id, rental.rented_date, rental.due_date,
+                                 rental.due_date))
+    for rental in rentals:
+        repository.remove(rental.id)
+    repository.close()
+
+
+def operations_per_second(function, count):
+    """
+    Measures the number of operations per second done by a benchmark function on a fresh database
+    :param function: The benchmark function, that takes a file name and a list of rentals
+    :param count: The number of rentals
+    :return: The number of operations per second
+    """
+    file_name = create_rentals_database()
+    try:
+        rentals = generate_rentals(count)
+        start = time.perf_counter()
+        function(file_name, rentals)
+        return 3 * count / (time.perf_counter() - start)
+    finally:
+        os.remove(file_name)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    benchmarks = [("connection per operation", run_with_connection_per_operation),
+                  ("connection pool", run_with_connection_pool), ("SQLRepository", run_with_repository)]
+    for name, function in benchmarks:
+        print("{0:<25} {1:.0f} ops/s".format(name, operations_per_second(function, count)))
@@ -1,7 +1,14 @@
 import configparser
 
+from domain.validators import SettingsException
+
 
 class Settings:
+    JOURNAL_MODES = ["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"]
+    SYNCHRONOUS_MODES = ["OFF", "NORMAL", "FULL", "EXTRA"]
+    DURABILITY_MODES = ["SYNC", "WRITE_BEHIND"]
+    JSON_FORMATS = ["INDENTED", "COMPACT"]
+
     def __init__(self, file_name):
         self.__file_name = file_name
         self.__load()
@@ -18,6 +25,72 @@ class Settings:
         self.__movie_repo = config.get("DEFAULT", "movies").strip("\"")
         self.__rental_repo = config.get("DEFAULT", "rentals").strip("\"")
         self.__ui_type = config.get("DEFAULT", "ui").strip("\"")
+        self.__database = config.get("DEFAULT", "database", fallback=None)
+        if self.__database is not None:
+            self.__database = self.__database.strip("\"")
+        self.__load_storage_settings(config)
+
+    def __load_storage_settings(self, config):
+        """
+        Load the optional storage tuning settings of the repositories from the storage section of the settings file
+        :param config: The parsed settings file
+        :return: nothing
+        Raise SettingsException if a storage setting has an invalid value
+        """
+        def get_storage_option(option):
+            if not config.has_section("storage") or not config.has_option("storage", option):
+                return None
+            return config.get("storage", option).strip("\"")
+
+        def get_integer_storage_option(option):
+            value = get_storage_option(option)
+            try:
+                return int(value) if value is not None else None
+            except ValueError:
+                raise SettingsException("The storage option " + option + " must be an integer!")
+
+        def get_float_storage_option(option):
+            value = get_storage_option(option)
+            try:
+                return float(value) if value is not None else None
+            except ValueError:
+                raise SettingsException("The storage option " + option + " must be a number!")
+
+        self.__journal_mode = get_storage_option("journal_mode")
+        if self.__journal_mode is not None and self.__journal_mode.upper() not in self.JOURNAL_MODES:
+            raise SettingsException("Invalid journal mode!")
+        self.__synchronous = get_storage_option("synchronous")
+        if self.__synchronous is not None and self.__synchronous.upper() not in self.SYNCHRONOUS_MODES:
+            raise SettingsException("Invalid synchronous mode!")
+        self.__mmap_size = get_integer_storage_option("mmap_size")
+        self.__cache_size = get_integer_storage_option("cache_size")
+        self.__page_size = get_integer_storage_option("page_size")
+        self.__pool_size = get_integer_storage_option("pool_size")
+        if self.__pool_size is None:
+            self.__pool_size = 1
+        elif self.__pool_size < 1:
+            raise SettingsException("The storage option pool_size must be positive!")
+        self.__group_commit_window = get_float_storage_option("group_commit_window")
+        self.__durability = (get_storage_option("durability") or "sync").lower()
+        if self.__durability.upper() not in self.DURABILITY_MODES:
+            raise SettingsException("Invalid durability mode!")
+        self.__flush_interval = get_float_storage_option("flush_interval")
+        if self.__flush_interval is None:
+            self.__flush_interval = 1.0
+        elif self.__flush_interval <= 0:
+            raise SettingsException("The storage option flush_interval must be positive!")
+        self.__flush_threshold = get_integer_storage_option("flush_threshold")
+        if self.__flush_threshold is None:
+            self.__flush_threshold = 100
+        elif self.__flush_threshold < 1:
+            raise SettingsException("The storage option flush_threshold must be positive!")
+        try:
+            self.__checksum = config.getboolean("storage", "checksum", fallback=False)
+        except ValueError:
+            raise SettingsException("The storage option checksum must be true or false!")
+        self.__json_format = (get_storage_option("json_format") or "indented").lower()
+        if self.__json_format.upper() not in self.JSON_FORMATS:
+            raise SettingsException("Invalid JSON format!")
 
     @property
     def repo_type(self):
@@ -38,3 +111,94 @@ class Settings:
     @property
     def ui_type(self):
         return self.__ui_type
+
+    @property
+    def database(self):
+        return self.__database
+
+    @property
+    def journal_mode(self):
+        return self.__journal_mode
+
+    @property
+    def synchronous(self):
+        return self.__synchronous
+
+    @property
+    def mmap_size(self):
+        return self.__mmap_size
+
+    @property
+    def cache_size(self):
+        return self.__cache_size
+
+    @property
+    def page_size(self):
+        return self.__page_size
+
+    @property
+    def pool_size(self):
+        return self.__pool_size
+
+    @property
+    def group_commit_window(self):
+        return self.__group_commit_window
+
+    @property
+    def durability(self):
+        return self.__durability
+
+    @property
+    def flush_interval(self):
+        return self.__flush_interval
+
+    @property
+    def flush_threshold(self):
+        return self.__flush_threshold
+
+    @property
+    def checksum(self):
+        return self.__checksum
+
+    @property
+    def json_format(self):
+        return self.__json_format
+
+    @property
+    def file_storage_options(self):
+        """
+        Returns the options of the file repositories given in the storage section; the sync durability mode saves
+        every change at once, the write_behind mode saves the changes in the background
+        :return: A dictionary that maps the names of the options to their values
+        """
+        if self.durability == "sync":
+            return {"checksum": self.checksum}
+        return {"flush_interval": self.flush_interval, "flush_threshold": self.flush_threshold,
+                "checksum": self.checksum}
+
+    def get_file_storage_options(self, supported_options):
+        """
+        Returns the options of the file repositories given in the storage section that a kind of file repository
+        supports
+        :param supported_options: The names of the options that the repository supports
+        :return: A dictionary that maps the names of the supported options to their values
+        Raise SettingsException if the storage section asks for the write_behind durability mode or for checksums and
+        the repository does not support them
+        """
+        options = self.file_storage_options
+        if "flush_interval" in options and "flush_interval" not in supported_options:
+            raise SettingsException("The " + self.repo_type + " repository does not support the write_behind "
+                                    "durability mode!")
+        if options["checksum"] and "checksum" not in supported_options:
+            raise SettingsException("The " + self.repo_type + " repository does not support checksums!")
+        return {name: value for name, value in options.items() if name in supported_options}
+
+    @property
+    def sql_pragmas(self):
+        """
+        Returns the SQLite pragmas given in the storage section, in the order in which they should be applied
+        :return: A dictionary that maps the names of the given pragmas to their values
+        """
+        pragmas = {"page_size": self.page_size, "journal_mode": self.journal_mode, "synchronous": self.synchronous,
+                   "mmap_size": self.mmap_size, "cache_size": self.cache_size}
+        return {name: value for name, value in pragmas.items() if value is not None}
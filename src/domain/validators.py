@@ -116,25 +116,27 @@ class RentalValidator:
          - the due date is not a date bigger than the rental date
          - the return date is not None or a date bigger than the rental date
         """
-        if not isinstance(rental.id, int):
+        rental_id, movie_id, client_id = rental.id, rental.movie_id, rental.client_id
+        rented_date, due_date, returned_date = rental.rented_date, rental.due_date, rental.returned_date
+        if not isinstance(rental_id, int):
             raise RentalException("Invalid Rental! The ID must be an integer!")
-        if rental.id < 1:
+        if rental_id < 1:
             raise RentalException("Invalid Rental! The ID must be positive!")
-        if not isinstance(rental.movie_id, int):
+        if not isinstance(movie_id, int):
             raise RentalException("Invalid Rental! The movie's ID must be an integer!")
-        if rental.movie_id < 1:
+        if movie_id < 1:
             raise RentalException("Invalid Rental! The movie's ID must be positive!")
-        if not isinstance(rental.client_id, int):
+        if not isinstance(client_id, int):
             raise RentalException("Invalid Rental! The client's ID must be an integer!")
-        if rental.client_id < 1:
+        if client_id < 1:
             raise RentalException("Invalid Rental! The client's ID must be positive!")
-        if not isinstance(rental.rented_date, date):
+        if not isinstance(rented_date, date):
             raise RentalException("Invalid Rental! The rental date must be a date!")
-        if not isinstance(rental.due_date, date):
+        if not isinstance(due_date, date):
             raise RentalException("Invalid Rental! The due date must be a date!")
-        if rental.returned_date is not None and not isinstance(rental.returned_date, date):
+        if returned_date is not None and not isinstance(returned_date, date):
             raise RentalException("Invalid Rental! The returned date must be a date or None!")
-        if rental.rented_date > rental.due_date:
+        if rented_date > due_date:
             raise RentalException("Invalid Rental! The rental date cannot be bigger than the due date!")
-        if rental.returned_date is not None and rental.returned_date < rental.rented_date:
+        if returned_date is not None and returned_date < rented_date:
             raise RentalException("Invalid Rental! The rental date cannot be bigger than the returned date!")
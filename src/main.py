@@ -5,12 +5,18 @@ from UI.MovieRentalUI import MovieRentalUI
 from domain.settings import Settings
 from domain.validators import ClientValidator, MovieValidator, RentalValidator, ClientException, MovieException, \
     RentalException, SettingsException
+from repository.binaryrecordrepository import BinaryRecordRepository
 from repository.binaryrepository import BinaryRepository
 from repository.jsondataaccessentity import ClientJSONDataAccess, MovieJSONDataAccess, RentalJSONDataAccess
+from repository.jsonlinesrepository import JSONLinesRepository
 from repository.jsonrepository import JSONRepository
+from repository.mappedrentalrepository import MappedRentalRepository
 from repository.repo import Repository
+from repository.sqlconnectionpool import SQLConnectionPool
 from repository.sqldataaccessentity import ClientSQLDataAccess, MovieSQLDataAccess, RentalSQLDataAccess
+from repository.sqlqueryrepository import SQLQueryRepository
 from repository.sqlrepository import SQLRepository
+from repository.streamingloader import StreamingLoader
 from repository.textdataaccessentity import ClientTextDataAccess, MovieTextDataAccess, RentalTextDataAccess
 from repository.textfilerepository import TextFileRepository
 from services.clientservice import ClientService
@@ -25,28 +31,86 @@ if __name__ == "__main__":
         client_repo_lct = file_location + settings.client_repo
         movie_repo_lct = file_location + settings.movie_repo
         rental_repo_lct = file_location + settings.rental_repo
+        if settings.ui_type == "Console":
+            loader = StreamingLoader(progress_callback=lambda file_name, loaded_count: print(
+                "Loaded {0} entities from {1}".format(loaded_count, file_name)))
+        else:
+            loader = StreamingLoader()
+        snapshot_options = ("flush_interval", "flush_threshold", "checksum")
         if settings.repo_type == "inmemory":
             client_repo = Repository(ClientValidator, ClientException)
             movie_repo = Repository(MovieValidator, MovieException)
             rental_repo = Repository(RentalValidator, RentalException)
         elif settings.repo_type == "textfiles":
-            client_repo = TextFileRepository(ClientValidator, ClientException, ClientTextDataAccess(), client_repo_lct)
-            movie_repo = TextFileRepository(MovieValidator, MovieException, MovieTextDataAccess(), movie_repo_lct)
-            rental_repo = TextFileRepository(RentalValidator, RentalException, RentalTextDataAccess(), rental_repo_lct)
+            file_options = dict(settings.get_file_storage_options(snapshot_options), loader=loader)
+            client_repo = TextFileRepository(ClientValidator, ClientException, ClientTextDataAccess(), client_repo_lct,
+                                             **file_options)
+            movie_repo = TextFileRepository(MovieValidator, MovieException, MovieTextDataAccess(), movie_repo_lct,
+                                            **file_options)
+            rental_repo = TextFileRepository(RentalValidator, RentalException, RentalTextDataAccess(), rental_repo_lct,
+                                             **file_options)
+        elif settings.repo_type == "journaledtextfiles":
+            file_options = dict(settings.get_file_storage_options(("checksum",)), journaled=True, loader=loader)
+            client_repo = TextFileRepository(ClientValidator, ClientException, ClientTextDataAccess(), client_repo_lct,
+                                             **file_options)
+            movie_repo = TextFileRepository(MovieValidator, MovieException, MovieTextDataAccess(), movie_repo_lct,
+                                            **file_options)
+            rental_repo = TextFileRepository(RentalValidator, RentalException, RentalTextDataAccess(), rental_repo_lct,
+                                             **file_options)
         elif settings.repo_type == "binaryfiles":
-            client_repo = BinaryRepository(ClientValidator, ClientException, client_repo_lct)
-            movie_repo = BinaryRepository(MovieValidator, MovieException, movie_repo_lct)
-            rental_repo = BinaryRepository(RentalValidator, RentalException, rental_repo_lct)
+            file_options = dict(settings.get_file_storage_options(snapshot_options), loader=loader)
+            client_repo = BinaryRepository(ClientValidator, ClientException, client_repo_lct, **file_options)
+            movie_repo = BinaryRepository(MovieValidator, MovieException, movie_repo_lct, **file_options)
+            rental_repo = BinaryRepository(RentalValidator, RentalException, rental_repo_lct, **file_options)
+        elif settings.repo_type == "binaryrecordfiles":
+            settings.get_file_storage_options(())
+            client_repo = BinaryRecordRepository(ClientValidator, ClientException, client_repo_lct, loader=loader)
+            movie_repo = BinaryRecordRepository(MovieValidator, MovieException, movie_repo_lct, loader=loader)
+            rental_repo = BinaryRecordRepository(RentalValidator, RentalException, rental_repo_lct, loader=loader)
+        elif settings.repo_type == "mappedrentals":
+            settings.get_file_storage_options(())
+            client_repo = BinaryRecordRepository(ClientValidator, ClientException, client_repo_lct, loader=loader)
+            movie_repo = BinaryRecordRepository(MovieValidator, MovieException, movie_repo_lct, loader=loader)
+            rental_repo = MappedRentalRepository(RentalValidator, RentalException, rental_repo_lct, loader=loader)
         elif settings.repo_type == "jsonfiles":
-            client_repo = JSONRepository(ClientValidator, ClientException, ClientJSONDataAccess(), client_repo_lct)
-            movie_repo = JSONRepository(MovieValidator, MovieException, MovieJSONDataAccess(), movie_repo_lct)
-            rental_repo = JSONRepository(RentalValidator, RentalException, RentalJSONDataAccess(), rental_repo_lct)
-        elif settings.repo_type == "sqlfiles":
-            client_repo = SQLRepository(ClientValidator, ClientException, ClientSQLDataAccess(), client_repo_lct,
-                                        "clients")
-            movie_repo = SQLRepository(MovieValidator, MovieException, MovieSQLDataAccess(), movie_repo_lct, "movies")
-            rental_repo = SQLRepository(RentalValidator, RentalException, RentalSQLDataAccess(), rental_repo_lct,
-                                        "rentals")
+            file_options = dict(settings.get_file_storage_options(snapshot_options), loader=loader,
+                                compact=settings.json_format == "compact")
+            client_repo = JSONRepository(ClientValidator, ClientException, ClientJSONDataAccess(), client_repo_lct,
+                                         **file_options)
+            movie_repo = JSONRepository(MovieValidator, MovieException, MovieJSONDataAccess(), movie_repo_lct,
+                                        **file_options)
+            rental_repo = JSONRepository(RentalValidator, RentalException, RentalJSONDataAccess(), rental_repo_lct,
+                                         **file_options)
+        elif settings.repo_type == "jsonlines":
+            settings.get_file_storage_options(())
+            client_repo = JSONLinesRepository(ClientValidator, ClientException, ClientJSONDataAccess(), client_repo_lct,
+                                              loader=loader)
+            movie_repo = JSONLinesRepository(MovieValidator, MovieException, MovieJSONDataAccess(), movie_repo_lct,
+                                             loader=loader)
+            rental_repo = JSONLinesRepository(RentalValidator, RentalException, RentalJSONDataAccess(),
+                                              rental_repo_lct, loader=loader)
+        elif settings.repo_type in ("sqlfiles", "sqlqueries"):
+            sql_repository_class = SQLRepository if settings.repo_type == "sqlfiles" else SQLQueryRepository
+            storage_options = {"pool_size": settings.pool_size, "group_commit_window": settings.group_commit_window,
+                               "pragmas": settings.sql_pragmas}
+            client_repo = sql_repository_class(ClientValidator, ClientException, ClientSQLDataAccess(), client_repo_lct,
+                                               "clients", **storage_options)
+            movie_repo = sql_repository_class(MovieValidator, MovieException, MovieSQLDataAccess(), movie_repo_lct,
+                                              "movies", **storage_options)
+            rental_repo = sql_repository_class(RentalValidator, RentalException, RentalSQLDataAccess(), rental_repo_lct,
+                                               "rentals", **storage_options)
+        elif settings.repo_type == "sqldatabase":
+            if settings.database is None:
+                raise SettingsException("The sqldatabase repository needs a database file!")
+            connection_pool = SQLConnectionPool(file_location + settings.database, settings.pool_size,
+                                                pragmas=dict(settings.sql_pragmas, foreign_keys="ON"))
+            storage_options = {"group_commit_window": settings.group_commit_window, "connection_pool": connection_pool}
+            client_repo = SQLQueryRepository(ClientValidator, ClientException, ClientSQLDataAccess(), None, "clients",
+                                             **storage_options)
+            movie_repo = SQLQueryRepository(MovieValidator, MovieException, MovieSQLDataAccess(), None, "movies",
+                                            **storage_options)
+            rental_repo = SQLQueryRepository(RentalValidator, RentalException, RentalSQLDataAccess(True), None,
+                                             "rentals", **storage_options)
         else:
             raise SettingsException("Invalid option!")
         client_service = ClientService(client_repo, rental_repo)
@@ -57,17 +121,25 @@ if __name__ == "__main__":
             movie_service.generate_starting_movies()
             rental_service.generate_starting_rentals()
         operation_manager = OperationManager()
-        if settings.ui_type == "Console":
-            UI = MovieRentalUI(client_service, movie_service, rental_service, operation_manager)
-            done = False
-            while not done:
-                try:
-                    done = UI.run_menu()
-                except Exception as ex:
-                    print("Unexpected exception!", ex)
-                    traceback.print_exc()
-        elif settings.ui_type == "GUI":
-            GUI = MovieRentalGUI(client_service, movie_service, rental_service, operation_manager)
+        try:
+            if settings.ui_type == "Console":
+                UI = MovieRentalUI(client_service, movie_service, rental_service, operation_manager)
+                done = False
+                while not done:
+                    try:
+                        done = UI.run_menu()
+                    except Exception as ex:
+                        print("Unexpected exception!", ex)
+                        traceback.print_exc()
+            elif settings.ui_type == "GUI":
+                GUI = MovieRentalGUI(client_service, movie_service, rental_service, operation_manager)
+        finally:
+            for repository in (client_repo, movie_repo, rental_repo):
+                repository.close()
+            if settings.repo_type == "sqldatabase":
+                connection_pool.close()
+    except ValueError as ve:
+        print("Invalid files!" + str(ve))
     except OSError as ose:
         print("Invalid files!" + str(ose))
     except SettingsException as se:
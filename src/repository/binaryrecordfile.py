@@ -0,0 +1,181 @@
+import os
+import pickle
+import struct
+
+from repository.snapshotwriter import SnapshotWriter
+
+
+class BinaryRecordFile:
+    HEADER = struct.Struct(">BqI")
+    ENTITY_RECORD = 1
+    TOMBSTONE_RECORD = 2
+    COMMIT_RECORD = 3
+
+    def __init__(self, file_name, compaction_threshold=1000):
+        """
+        Opens a file of length-prefixed binary records, creating it if it does not exist
+        Every record starts with a header holding its kind, the ID of its entity and the length of its payload. An
+        entity record holds a pickled entity, a tombstone record marks the entity with its ID as removed, and a commit
+        record ends a group of records that were written together. The offset of the latest entity record of every
+        stored entity is kept in an index, so that entities can be read one at a time
+        :param file_name: The name of the binary file
+        :param compaction_threshold: The minimum number of dead records after which the file is compacted, once they
+        are at least as many as the stored entities
+        Raise ValueError if the file is not a binary record file
+        """
+        self.__file_name = file_name
+        self.__compaction_threshold = compaction_threshold
+        self.__offsets = {}
+        self.__dead_count = 0
+        self.__file = open(file_name, "r+b" if os.path.exists(file_name) else "w+b")
+        self.__build_index()
+
+    @property
+    def file_name(self):
+        return self.__file_name
+
+    @property
+    def dead_count(self):
+        return self.__dead_count
+
+    def __len__(self):
+        return len(self.__offsets)
+
+    def __contains__(self, entity_id):
+        return entity_id in self.__offsets
+
+    def read(self, entity_id):
+        """
+        Reads a stored entity from the file, using the offset of its record
+        :param entity_id: The ID of the entity
+        :return: The entity
+        Raise KeyError if no entity with the given ID is stored
+        """
+        self.__file.seek(self.__offsets[entity_id])
+        kind, record_id, length = self.HEADER.unpack(self.__file.read(self.HEADER.size))
+        return pickle.loads(self.__file.read(length))
+
+    def entities(self):
+        """
+        Reads the stored entities from the file one at a time, in the order of their records
+        :return: A generator of the entities
+        """
+        for offset in sorted(self.__offsets.values()):
+            self.__file.seek(offset)
+            kind, entity_id, length = self.HEADER.unpack(self.__file.read(self.HEADER.size))
+            yield pickle.loads(self.__file.read(length))
+
+    def write(self, changes):
+        """
+        Appends a group of records for some changes to the end of the file, followed by a commit record, then compacts
+        the file if it holds too many dead records
+        :param changes: A list of (entity_id, entity) pairs, where entity is the added or updated entity, or None if
+        the entity was removed
+        :return: nothing
+        """
+        if len(changes) == 0:
+            return
+        self.__file.seek(0, os.SEEK_END)
+        offset = self.__file.tell()
+        group = bytearray()
+        offsets = []
+        for entity_id, entity in changes:
+            if entity is not None:
+                payload = pickle.dumps(entity)
+                offsets.append((entity_id, offset + len(group)))
+                group += self.HEADER.pack(self.ENTITY_RECORD, entity_id, len(payload)) + payload
+            else:
+                offsets.append((entity_id, None))
+                group += self.HEADER.pack(self.TOMBSTONE_RECORD, entity_id, 0)
+        group += self.HEADER.pack(self.COMMIT_RECORD, 0, 0)
+        self.__file.write(group)
+        self.__file.flush()
+        self.__apply(offsets)
+        if self.__dead_count >= max(self.__compaction_threshold, len(self.__offsets)):
+            self.compact()
+
+    def compact(self):
+        """
+        Copies the latest record of every stored entity to a new snapshot of the file, which atomically replaces the
+        old one
+        :return: nothing
+        """
+        offsets = {}
+        try:
+            with SnapshotWriter(self.__file_name, True) as f:
+                position = 0
+                for entity_id, offset in sorted(self.__offsets.items(), key=lambda item: item[1]):
+                    self.__file.seek(offset)
+                    header = self.__file.read(self.HEADER.size)
+                    record = header + self.__file.read(self.HEADER.unpack(header)[2])
+                    offsets[entity_id] = position
+                    f.write(record)
+                    position += len(record)
+                f.write(self.HEADER.pack(self.COMMIT_RECORD, 0, 0))
+                self.__file.close()
+            self.__offsets = offsets
+            self.__dead_count = 0
+        finally:
+            if self.__file.closed:
+                self.__file = open(self.__file_name, "r+b")
+
+    def flush(self):
+        """
+        Writes the buffered records to the operating system
+        :return: nothing
+        """
+        self.__file.flush()
+
+    def close(self):
+        """
+        Closes the file
+        :return: nothing
+        """
+        self.__file.close()
+
+    def __apply(self, offsets):
+        """
+        Updates the offset index with the records of a committed group; the records that were superseded and the
+        tombstone records are counted as dead
+        :param offsets: A list of (entity_id, offset) pairs, where offset is None for a tombstone record
+        :return: nothing
+        """
+        for entity_id, offset in offsets:
+            if entity_id in self.__offsets:
+                self.__dead_count += 1
+            if offset is not None:
+                self.__offsets[entity_id] = offset
+            else:
+                self.__offsets.pop(entity_id, None)
+                self.__dead_count += 1
+
+    def __build_index(self):
+        """
+        Scans the headers of the records of the file to build the offset index, without reading the entities; the
+        records after the last commit record, which were not fully written, are cut from the file
+        :return: nothing
+        Raise ValueError if the file holds a record of an unknown kind
+        """
+        committed_end = 0
+        offset = 0
+        group = []
+        self.__file.seek(0)
+        while True:
+            header = self.__file.read(self.HEADER.size)
+            if len(header) < self.HEADER.size:
+                break
+            kind, entity_id, length = self.HEADER.unpack(header)
+            if kind == self.COMMIT_RECORD:
+                self.__apply(group)
+                group = []
+                committed_end = offset + self.HEADER.size
+            elif kind == self.ENTITY_RECORD:
+                group.append((entity_id, offset))
+            elif kind == self.TOMBSTONE_RECORD:
+                group.append((entity_id, None))
+            else:
+                self.__file.close()
+                raise ValueError("The file " + self.__file_name + " is not a binary record file!")
+            offset += self.HEADER.size + length
+            self.__file.seek(offset)
+        self.__file.truncate(committed_end)
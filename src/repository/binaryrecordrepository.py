@@ -0,0 +1,110 @@
+from repository.binaryrecordfile import BinaryRecordFile
+from repository.repo import Repository
+from repository.streamingloader import StreamingLoader
+
+
+class BinaryRecordRepository(Repository):
+    def __init__(self, validator_class, error_class, file_name, compaction_threshold=1000, loader=None):
+        """
+        Creates a new binary repository that keeps every entity in its own record of a binary record file, so that a
+        change only appends the records of the changed entities
+        The entities are still all loaded into memory when the repository is created, since the secondary indexes of
+        the services are built over every entity; the offset index of the record file is what lets a single entity be
+        read back with read, and lets the file be compacted without unpickling it
+        :param validator_class: The class that is used to validate the repository objects
+        :param error_class: The error class that should be raised if the repository operations are invalid
+        :param file_name: The name of the binary record file
+        :param compaction_threshold: The minimum number of dead records after which the file is compacted
+        :param loader: The streaming loader that loads the binary record file in chunks, or None to use a default one
+        """
+        super().__init__(validator_class, error_class)
+        self.__record_file = BinaryRecordFile(file_name, compaction_threshold)
+        self.__pending_changes = []
+        self.__loader = loader if loader is not None else StreamingLoader()
+        self.__loader.load(file_name, self.__record_file.entities(), lambda entity: entity, super().add_all)
+
+    @property
+    def record_file(self):
+        return self.__record_file
+
+    def add(self, entity):
+        """
+        Adds a given entity to the binary record repository
+        :param entity: The entity that will be added to the repo
+        :return: nothing
+        """
+        super().add(entity)
+        self.__save_changes([(entity.id, entity)])
+
+    def add_all(self, entities):
+        """
+        Adds a list of entities to the binary record repository, writing their records as one group
+        :param entities: The entities that will be added to the repo
+        :return: nothing
+        """
+        entities = list(entities)
+        super().add_all(entities)
+        self.__save_changes([(entity.id, entity) for entity in entities])
+
+    def remove(self, entity_id):
+        """
+        Removes the entity with a given ID from the binary record repository
+        :param entity_id: The ID of the entity to be removed
+        :return: The removed entity
+        """
+        removed_entity = super().remove(entity_id)
+        if removed_entity is not None:
+            self.__save_changes([(entity_id, None)])
+        return removed_entity
+
+    def update(self, entity):
+        """
+        Updates an entity from the binary record repository
+        :param entity: The updated form of the entity
+        :return: The old form of the entity
+        """
+        old_entity = super().update(entity)
+        if old_entity is not None:
+            self.__save_changes([(entity.id, entity)])
+        return old_entity
+
+    def flush(self):
+        """
+        Writes the buffered records to the operating system
+        :return: nothing
+        """
+        self.__record_file.flush()
+
+    def close(self):
+        """
+        Closes the binary record file
+        :return: nothing
+        """
+        self.__record_file.close()
+
+    def _commit_transaction(self):
+        """
+        Appends the records of the changes of a transaction to the binary record file as one group
+        :return: nothing
+        """
+        pending_changes, self.__pending_changes = self.__pending_changes, []
+        self.__record_file.write(pending_changes)
+
+    def _rollback_transaction(self):
+        """
+        Discards the records of a transaction that failed
+        :return: nothing
+        """
+        self.__pending_changes = []
+
+    def __save_changes(self, changes):
+        """
+        Writes the records of some changes, unless they are part of a transaction, which writes its changes when it
+        commits
+        :param changes: A list of (entity_id, entity) pairs, where entity is None if the entity was removed
+        :return: nothing
+        """
+        if self.in_transaction:
+            self.__pending_changes.extend(changes)
+        else:
+            self.__record_file.write(changes)
@@ -1,13 +1,31 @@
 import pickle
 
 from repository.repo import Repository
+from repository.snapshotwriter import SnapshotWriter
+from repository.streamingloader import StreamingLoader
+from repository.writebehindflusher import WriteBehindFlusher
 
 
 class BinaryRepository(Repository):
-    def __init__(self, validator_class, error_class, file_name):
+    def __init__(self, validator_class, error_class, file_name, loader=None, flush_interval=None,
+                 flush_threshold=100, checksum=False):
+        """
+        Creates a new binary repository
+        :param validator_class: The class that is used to validate the repository objects
+        :param error_class: The error class that should be raised if the repository operations are invalid
+        :param file_name: The name of the binary file
+        :param loader: The streaming loader that loads the binary file in chunks, or None to use a default one
+        :param flush_interval: The number of seconds between two saves of the binary file by a background flusher, or
+        None to save the file on every change
+        :param flush_threshold: The number of unsaved changes after which the background flusher saves them right away
+        :param checksum: True to save a checksum with every snapshot of the binary file and verify it on load
+        """
         super().__init__(validator_class, error_class)
         self.__file_name = file_name
+        self.__loader = loader if loader is not None else StreamingLoader()
+        self.__checksum = checksum
         self.__load()
+        self.__flusher = WriteBehindFlusher(self.__save_to_file, flush_interval, flush_threshold)
 
     def add(self, entity):
         """
@@ -15,8 +33,9 @@ class BinaryRepository(Repository):
         :param entity: The entity that will be added to the repo
         :return: nothing
         """
-        super().add(entity)
-        self.__save_to_file()
+        with self.__flusher.lock:
+            super().add(entity)
+            self.__save_change()
 
     def remove(self, entity_id):
         """
@@ -24,9 +43,10 @@ class BinaryRepository(Repository):
         :param entity_id: The ID of the entity to be removed
         :return: The removed entity
         """
-        removed_entity = super().remove(entity_id)
-        self.__save_to_file()
-        return removed_entity
+        with self.__flusher.lock:
+            removed_entity = super().remove(entity_id)
+            self.__save_change()
+            return removed_entity
 
     def update(self, entity):
         """
@@ -34,24 +54,75 @@ class BinaryRepository(Repository):
         :param entity: The updated form of the entity
         :return: The old form of the entity
         """
-        old_entity = super().update(entity)
-        self.__save_to_file()
-        return old_entity
+        with self.__flusher.lock:
+            old_entity = super().update(entity)
+            self.__save_change()
+            return old_entity
+
+    def flush(self):
+        """
+        Saves the changes that the background flusher has not saved yet
+        :return: nothing
+        """
+        self.__flusher.flush()
+
+    def close(self):
+        """
+        Stops the background flusher and saves the changes it has not saved yet
+        :return: nothing
+        """
+        self.__flusher.close()
+
+    def _begin_transaction(self):
+        """
+        Holds the lock of the flusher until the transaction ends, so that no half done transaction is saved
+        :return: nothing
+        """
+        self.__flusher.lock.acquire()
+
+    def _commit_transaction(self):
+        """
+        Saves the changes of a transaction to the binary file, all at once
+        :return: nothing
+        """
+        self.__flusher.mark_dirty()
+        self.__flusher.lock.release()
+
+    def _rollback_transaction(self):
+        """
+        Releases the lock of the flusher after a failed transaction, whose changes were never saved
+        :return: nothing
+        """
+        self.__flusher.lock.release()
+
+    def __save_change(self):
+        """
+        Marks the binary file as out of date after a change, unless the change is part of a transaction, which saves its
+        changes when it commits
+        :return: nothing
+        """
+        if not self.in_transaction:
+            self.__flusher.mark_dirty()
 
     def __load(self):
         """
-        Loads the entities located in the associated binary file into the repository
+        Loads the entities located in the associated binary file into the repository, unpickling one chunk of entities
+        at a time
         :return: nothing
+        Raise ValueError if the binary file does not match its checksum
         """
+        if self.__checksum:
+            SnapshotWriter.verify(self.__file_name)
         with open(self.__file_name, "rb") as f:
-            entities = pickle.load(f)
-            for entity in entities:
-                super().add(entities[entity])
+            self.__loader.load(self.__file_name, StreamingLoader.read_pickle_records(f), lambda entity: entity,
+                               super().add_all)
 
     def __save_to_file(self):
         """
-        Loads the entities located in the current repository to the associated binary file
+        Loads the entities located in the current repository to a new snapshot of the associated binary file, as
+        consecutive pickled lists of entities that can be loaded one at a time
         :return: nothing
         """
-        with open(self.__file_name, "wb") as file:
-            pickle.dump(self.entities, file)
+        with SnapshotWriter(self.__file_name, True, checksum=self.__checksum) as file:
+            for chunk in StreamingLoader.chunks(self.entities, self.__loader.chunk_size):
+                pickle.dump(chunk, file)
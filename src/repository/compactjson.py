@@ -0,0 +1,80 @@
+import json
+import sys
+
+from repository.jsondataaccessentity import ClientJSONDataAccess, MovieJSONDataAccess, RentalJSONDataAccess
+from repository.snapshotwriter import SnapshotWriter
+from repository.streamingloader import StreamingLoader
+
+
+class CompactJSONFormat:
+    FORMAT_NAME = "compact"
+
+    def __init__(self, data_access_class):
+        """
+        Creates a new reader and writer of the compact JSON format, which holds a top-level array whose first element
+        is a header naming the columns, followed by one array of attribute values per entity, on its own line
+        :param data_access_class: The object that converts the entities to and from rows
+        """
+        self.__data_access_class = data_access_class
+        self.__encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def is_header(self, value):
+        """
+        Checks if the first value of a JSON file is the header of the compact format
+        :param value: The first value of the top-level object or array of the file
+        :return: True if the value is a compact header, False otherwise
+        """
+        return isinstance(value, dict) and value.get("format") == self.FORMAT_NAME
+
+    def read_rows(self, header, rows):
+        """
+        Checks the header of a compact JSON file and turns its rows into entities, one at a time
+        :param header: The header of the file
+        :param rows: An iterable of the rows that follow the header
+        :return: A generator of the entities
+        Raise ValueError if the columns of the header are not the columns of the data access object
+        """
+        if header.get("columns") != self.__data_access_class.COLUMNS:
+            raise ValueError("The columns of the compact JSON file do not match the entities!")
+        return (self.__data_access_class.row_deserializer(row) for row in rows)
+
+    def write(self, file, entities):
+        """
+        Writes entities to a file in the compact format, encoding one row at a time
+        :param file: The File object of the JSON file, open for writing in text mode
+        :param entities: An iterable of the entities
+        :return: The number of written entities
+        """
+        file.write("[" + self.__encoder.encode({"format": self.FORMAT_NAME,
+                                                "columns": self.__data_access_class.COLUMNS}))
+        written_count = 0
+        for entity in entities:
+            file.write(",\n" + self.__encoder.encode(self.__data_access_class.row_serializer(entity)))
+            written_count += 1
+        file.write("]\n")
+        return written_count
+
+    def convert(self, file_name, checksum=False):
+        """
+        Converts a JSON file from the indented format of JSONRepository to the compact format, streaming the entities
+        from the old file to an atomic snapshot of the new one; a file that is already compact is left unchanged
+        :param file_name: The name of the JSON file
+        :param checksum: True to save a checksum with the converted file
+        :return: The number of converted entities
+        """
+        with open(file_name, "rt") as f:
+            if self.is_header(next(StreamingLoader.read_json_values(f), None)):
+                return 0
+        with SnapshotWriter(file_name, checksum=checksum) as target:
+            with open(file_name, "rt") as source:
+                return self.write(target, (self.__data_access_class.deserializer(value)
+                                           for value in StreamingLoader.read_json_values(source)))
+
+
+if __name__ == "__main__":
+    data_access_classes = {"clients": ClientJSONDataAccess(), "movies": MovieJSONDataAccess(),
+                           "rentals": RentalJSONDataAccess()}
+    if len(sys.argv) != 3 or sys.argv[1] not in data_access_classes:
+        print("Usage: python -m repository.compactjson clients|movies|rentals <JSON file>")
+        sys.exit(1)
+    print("Converted {0} entities".format(CompactJSONFormat(data_access_classes[sys.argv[1]]).convert(sys.argv[2])))
@@ -0,0 +1,263 @@
+from bisect import bisect_left
+
+
+class KeyIndex:
+    def __init__(self, key_function):
+        """
+        Creates a new index that groups entities by the value returned by a key function
+        :param key_function: The function that takes an entity and returns the value it is indexed by
+        """
+        self.__key_function = key_function
+        self.__buckets = {}
+
+    def add(self, entity):
+        """
+        Adds an entity to the index
+        :param entity: The entity to be added
+        :return: nothing
+        """
+        self.__buckets.setdefault(self.__key_function(entity), {})[entity.id] = entity
+
+    def remove(self, entity):
+        """
+        Removes an entity from the index
+        :param entity: The entity to be removed
+        :return: nothing
+        """
+        key = self.__key_function(entity)
+        del self.__buckets[key][entity.id]
+        if len(self.__buckets[key]) == 0:
+            del self.__buckets[key]
+
+    def find(self, value):
+        """
+        Returns the entities indexed by a given value
+        :param value: The indexed value
+        :return: The list of entities with the given value, in increasing order of their IDs
+        """
+        try:
+            bucket = self.__buckets.get(value, {})
+        except TypeError:
+            return []
+        return [bucket[entity_id] for entity_id in sorted(bucket)]
+
+
+class IntervalList:
+    def __init__(self):
+        """
+        Creates a new list of intervals, kept sorted by their starting points, that can be queried for overlaps
+        """
+        self.__starts = []
+        self.__ends = []
+        self.__max_ends = []
+
+    def __len__(self):
+        return len(self.__starts)
+
+    def add(self, start, end, identifier):
+        """
+        Adds an interval to the list
+        :param start: The starting point of the interval
+        :param end: The ending point of the interval
+        :param identifier: A value that tells apart intervals with the same starting point
+        :return: nothing
+        """
+        position = bisect_left(self.__starts, (start, identifier))
+        self.__starts.insert(position, (start, identifier))
+        self.__ends.insert(position, end)
+        self.__max_ends.insert(position, None)
+        self.__update_max_ends(position)
+
+    def remove(self, start, identifier):
+        """
+        Removes an interval from the list
+        :param start: The starting point of the interval
+        :param identifier: The identifier the interval was added with
+        :return: nothing
+        """
+        position = bisect_left(self.__starts, (start, identifier))
+        del self.__starts[position]
+        del self.__ends[position]
+        del self.__max_ends[position]
+        self.__update_max_ends(position)
+
+    def overlaps(self, low, high):
+        """
+        Checks if any interval of the list overlaps a given interval
+        :param low: The starting point of the given interval
+        :param high: The ending point of the given interval
+        :return: True if there is an interval that starts before high and ends after low, otherwise False
+        """
+        position = bisect_left(self.__starts, (high,))
+        return position > 0 and self.__max_ends[position - 1] > low
+
+    def __update_max_ends(self, position):
+        """
+        Recomputes the biggest ending point of every prefix of the list, starting from a given position
+        :param position: The first position whose prefix may have changed
+        :return: nothing
+        """
+        max_end = self.__max_ends[position - 1] if position > 0 else None
+        for i in range(position, len(self.__ends)):
+            if max_end is None or self.__ends[i] > max_end:
+                max_end = self.__ends[i]
+            if self.__max_ends[i] == max_end:
+                break
+            self.__max_ends[i] = max_end
+
+
+class SubstringScanIndex:
+    def __init__(self, repository, key_function):
+        """
+        Creates a new index that finds the entities whose value of a key function contains a given string by scanning
+        the entities of a repository
+        :param repository: The repository whose entities are searched
+        :param key_function: The function that takes an entity and returns the value it is searched by
+        """
+        self.__repository = repository
+        self.__key_function = key_function
+
+    @property
+    def repository(self):
+        return self.__repository
+
+    def add(self, entity):
+        """
+        Adds an entity to the index; the entities are read from the repository, so nothing has to be done
+        :param entity: The entity to be added
+        :return: nothing
+        """
+        pass
+
+    def remove(self, entity):
+        """
+        Removes an entity from the index; the entities are read from the repository, so nothing has to be done
+        :param entity: The entity to be removed
+        :return: nothing
+        """
+        pass
+
+    def value_of(self, entity):
+        """
+        Returns the lowercase value an entity is searched by
+        :param entity: The entity
+        :return: The lowercase string form of the value of the key function for the entity
+        """
+        return str(self.__key_function(entity)).lower()
+
+    def find(self, substring):
+        """
+        Returns the entities whose lowercase value contains a given string
+        :param substring: The searched string
+        :return: The list of entities whose value contains the string, in increasing order of their IDs
+        """
+        return [entity for entity in self.__repository.entities if substring in self.value_of(entity)]
+
+
+class IDSubstringIndex(SubstringScanIndex):
+    def __init__(self, repository):
+        """
+        Creates a new index that finds the entities whose ID contains a given string; since the IDs are positive
+        integers, only strings of digits are searched, by scanning the sorted IDs of the repository
+        :param repository: The repository whose entities are searched
+        """
+        super().__init__(repository, lambda entity: entity.id)
+
+    def find(self, substring):
+        """
+        Returns the entities whose ID contains a given string
+        :param substring: The searched string
+        :return: The list of entities whose ID contains the string, in increasing order of their IDs
+        """
+        if substring == "":
+            return list(self.repository.entities)
+        if not substring.isdigit():
+            return []
+        return [self.repository.get_entity_at_id(entity_id) for entity_id in self.repository.get_current_ids()
+                if substring in str(entity_id)]
+
+
+class SubstringIndex(SubstringScanIndex):
+    def __init__(self, repository, key_function, gram_length=3):
+        """
+        Creates a new index that finds the entities whose value of a key function contains a given string through the
+        character n-grams of their values; the entities themselves are read from the repository
+        The n-grams are only computed on the first search, so that an index that is never searched costs nothing
+        :param repository: The repository whose entities are searched
+        :param key_function: The function that takes an entity and returns the value it is searched by
+        :param gram_length: The length of the character n-grams the values are split into; strings shorter than the
+        n-grams are searched by scanning the entities
+        """
+        super().__init__(repository, key_function)
+        self.__gram_length = gram_length
+        self.__postings = None
+
+    def add(self, entity):
+        """
+        Adds an entity to the index, unless the n-grams were not computed yet
+        :param entity: The entity to be added
+        :return: nothing
+        """
+        if self.__postings is None:
+            return
+        postings = self.__postings
+        for gram in self.__grams(self.value_of(entity)):
+            gram_postings = postings.get(gram)
+            if gram_postings is None:
+                postings[gram] = {entity.id}
+            else:
+                gram_postings.add(entity.id)
+
+    def remove(self, entity):
+        """
+        Removes an entity from the index, unless the n-grams were not computed yet
+        :param entity: The entity to be removed, as it was when it was added
+        :return: nothing
+        """
+        if self.__postings is None:
+            return
+        for gram in self.__grams(self.value_of(entity)):
+            postings = self.__postings[gram]
+            postings.discard(entity.id)
+            if len(postings) == 0:
+                del self.__postings[gram]
+
+    def find(self, substring):
+        """
+        Returns the entities whose lowercase value contains a given string
+        :param substring: The searched string
+        :return: The list of entities whose value contains the string, in increasing order of their IDs
+        """
+        if len(substring) < self.__gram_length:
+            return super().find(substring)
+        if self.__postings is None:
+            self.__build()
+        postings = [self.__postings.get(gram, set()) for gram in self.__grams(substring)]
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        entities = map(self.repository.get_entity_at_id, sorted(candidates))
+        return [entity for entity in entities if substring in self.value_of(entity)]
+
+    def __build(self):
+        """
+        Computes the n-grams of every entity of the repository; the IDs of every n-gram are gathered in a list first,
+        which is cheaper than growing a set one ID at a time
+        :return: nothing
+        """
+        postings = {}
+        for entity in self.repository.entities:
+            for gram in self.__grams(self.value_of(entity)):
+                gram_postings = postings.get(gram)
+                if gram_postings is None:
+                    postings[gram] = [entity.id]
+                else:
+                    gram_postings.append(entity.id)
+        self.__postings = {gram: set(entity_ids) for gram, entity_ids in postings.items()}
+
+    def __grams(self, value):
+        """
+        Returns the n-grams of a value
+        :param value: The value
+        :return: The set of substrings of the value that are as long as the n-grams of the index
+        """
+        return {value[i:i + self.__gram_length] for i in range(len(value) - self.__gram_length + 1)}
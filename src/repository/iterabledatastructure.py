@@ -1,9 +1,17 @@
+from functools import cmp_to_key
+from heapq import nlargest
+from operator import itemgetter
+
+
 class IterableStructure:
     class Iterator:
         def __init__(self, collection):
             self.__collection = collection
             self.__poz = 0
 
+        def __iter__(self):
+            return self
+
         def __next__(self):
             if self.__poz == len(self.__collection.data):
                 raise StopIteration()
@@ -40,27 +48,74 @@ class IterableStructure:
         """
         self.__data.append(item)
 
+    def extend(self, items):
+        """
+        Adds the items of an iterable to the end of the current list
+        :param items: The items to be added to the list
+        :return: nothing
+        """
+        self.__data.extend(items)
+
+    def insert(self, position, item):
+        """
+        Inserts a new item at a given position in the current list
+        :param position: The position at which the item will be inserted
+        :param item: The item to be inserted in the list
+        :return: nothing
+        """
+        self.__data.insert(position, item)
+
     @staticmethod
-    def sort(unordered_list, comparison_function):
+    def sort(unordered_list, comparison_function=None, key=None, reverse=False):
         """
-        Sorts an unordered list using comb sort based on a given function
+        Sorts an unordered list in place, based either on a key function or on a given comparison function
         :param unordered_list: The list to be sorted
         :param comparison_function: The comparison function that takes two arguments and returns True if the first is
-        supposed to be placed before the other in the list, otherwise False
+        supposed to be placed before the other in the list, otherwise False; kept for compatibility, key is preferred
+        :param key: A function that takes one argument and returns the value it is sorted by, or a tuple of such
+        functions, in which case the elements are sorted by the first one, then by the second one and so on
+        :param reverse: True if the list should be sorted in decreasing order of the keys, otherwise False
         :return: nothing
+        The sort is stable, so elements with equal keys keep their relative order
+        """
+        if key is None and comparison_function is not None:
+            key = cmp_to_key(IterableStructure.__comparison_to_cmp(comparison_function))
+        elif key is None:
+            key = lambda element: element
+        elif isinstance(key, (tuple, list)):
+            key_functions = tuple(key)
+            key = lambda element: tuple(key_function(element) for key_function in key_functions)
+        decorated_list = [(key(element), element) for element in unordered_list]
+        decorated_list.sort(key=itemgetter(0), reverse=reverse)
+        unordered_list[:] = [element for _, element in decorated_list]
+
+    @staticmethod
+    def largest(unordered_list, limit, key):
+        """
+        Selects the elements with the biggest keys from an unordered list, using a heap
+        :param unordered_list: The list the elements are selected from
+        :param limit: The maximum number of selected elements
+        :param key: A function that takes one argument and returns the value it is compared by
+        :return: The list of at most limit elements with the biggest keys, in decreasing order of their keys, elements
+        with equal keys keeping their relative order
+        """
+        return nlargest(limit, unordered_list, key=key)
+
+    @staticmethod
+    def __comparison_to_cmp(comparison_function):
+        """
+        Transforms a comparison function that returns True if its first argument comes first into a three-way one
+        :param comparison_function: The comparison function that takes two arguments and returns True if the first is
+        supposed to be placed before the other in the list, otherwise False
+        :return: A function that takes two arguments and returns a negative number, zero or a positive number
         """
-        shrink = 1.3
-        gap = len(unordered_list)
-        list_sorted = False
-        while not list_sorted:
-            gap = int(gap / shrink)
-            if gap <= 1:
-                list_sorted = True
-                gap = 1
-            for i in range(len(unordered_list) - gap):
-                if comparison_function(unordered_list[i + gap], unordered_list[i]):
-                    unordered_list[i + gap], unordered_list[i] = unordered_list[i], unordered_list[i + gap]
-                    list_sorted = False
+        def cmp(first, second):
+            if comparison_function(first, second):
+                return -1
+            if comparison_function(second, first):
+                return 1
+            return 0
+        return cmp
 
     @staticmethod
     def filter(unfiltered_list, acceptance_function):
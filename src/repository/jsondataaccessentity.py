@@ -1,5 +1,5 @@
 import abc
-from datetime import datetime
+from datetime import datetime, date
 
 from domain.client import Client
 from domain.movie import Movie
@@ -15,8 +15,18 @@ class JSONDataAccess(metaclass=abc.ABCMeta):
     def serializer(self, entity):
         pass
 
+    @abc.abstractmethod
+    def row_deserializer(self, row):
+        pass
+
+    @abc.abstractmethod
+    def row_serializer(self, entity):
+        pass
+
 
 class ClientJSONDataAccess(JSONDataAccess):
+    COLUMNS = ["id", "name"]
+
     def deserializer(self, dictionary):
         """
         Transforms a dictionary into a Client object
@@ -33,8 +43,25 @@ class ClientJSONDataAccess(JSONDataAccess):
         """
         return {"id": entity.id, "name": entity.name}
 
+    def row_deserializer(self, row):
+        """
+        Transforms a row of the compact JSON format into a Client object
+        :param row: The list of the attributes of the Client object, in the order of COLUMNS
+        :return: The corresponding Client object
+        """
+        return Client(*row)
+
+    def row_serializer(self, entity):
+        """
+        Transforms a Client object into a row of the compact JSON format
+        :param entity: The Client object that will be converted to a row
+        :return: The list of the attributes of the Client object, in the order of COLUMNS
+        """
+        return [entity.id, entity.name]
+
 
 class MovieJSONDataAccess(JSONDataAccess):
+    COLUMNS = ["id", "title", "description", "genre"]
 
     def deserializer(self, dictionary):
         """
@@ -52,8 +79,25 @@ class MovieJSONDataAccess(JSONDataAccess):
         """
         return {"id": entity.id, "title": entity.title, "description": entity.description, "genre": entity.genre}
 
+    def row_deserializer(self, row):
+        """
+        Transforms a row of the compact JSON format into a Movie object
+        :param row: The list of the attributes of the Movie object, in the order of COLUMNS
+        :return: The corresponding Movie object
+        """
+        return Movie(*row)
+
+    def row_serializer(self, entity):
+        """
+        Transforms a Movie object into a row of the compact JSON format
+        :param entity: The Movie object that will be converted to a row
+        :return: The list of the attributes of the Movie object, in the order of COLUMNS
+        """
+        return [entity.id, entity.title, entity.description, entity.genre]
+
 
 class RentalJSONDataAccess(JSONDataAccess):
+    COLUMNS = ["id", "movie_id", "client_id", "rented_date", "due_date", "returned_date"]
 
     def deserializer(self, dictionary):
         """
@@ -81,3 +125,25 @@ class RentalJSONDataAccess(JSONDataAccess):
         returned_date = str(entity.returned_date)
         return {"id": entity.id, "movie_id": entity.movie_id, "client_id": entity.client_id, "rented_date": rented_date,
                 "due_date": due_date, "returned_date": returned_date}
+
+    def row_deserializer(self, row):
+        """
+        Transforms a row of the compact JSON format into a Rental object
+        :param row: The list of the attributes of the Rental object, in the order of COLUMNS, where the dates are day
+        ordinals and the returned date is null if the movie was not returned
+        :return: The corresponding Rental object
+        """
+        rental_id, movie_id, client_id, rented_date, due_date, returned_date = row
+        return Rental(rental_id, movie_id, client_id, date.fromordinal(rented_date), date.fromordinal(due_date),
+                      date.fromordinal(returned_date) if returned_date is not None else None)
+
+    def row_serializer(self, entity):
+        """
+        Transforms a Rental object into a row of the compact JSON format
+        :param entity: The Rental object that will be converted to a row
+        :return: The list of the attributes of the Rental object, in the order of COLUMNS, where the dates are day
+        ordinals and the returned date is None if the movie was not returned
+        """
+        returned_date = entity.returned_date.toordinal() if entity.returned_date is not None else None
+        return [entity.id, entity.movie_id, entity.client_id, entity.rented_date.toordinal(),
+                entity.due_date.toordinal(), returned_date]
@@ -0,0 +1,251 @@
+import json
+import os
+import threading
+
+from repository.repo import Repository
+from repository.snapshotwriter import SnapshotWriter
+from repository.streamingloader import StreamingLoader
+
+
+class JSONLinesRepository(Repository):
+    COMMIT_LINE = b'{"op":"commit"}\n'
+
+    def __init__(self, validator_class, error_class, data_access_class, file_name, compaction_ratio=2.0,
+                 compaction_min_records=1000, loader=None):
+        """
+        Creates a new JSON Lines repository, which keeps a log of change records in a file, one JSON object per line
+        An upsert record holds an added or updated entity and a delete record holds the ID of a removed entity; the
+        records of a change, or of a transaction, are followed by a commit record. The log is replayed on load, and
+        compacted in the background to one upsert record per entity once it grows too long
+        :param validator_class: The class that is used to validate the repository objects
+        :param error_class: The error class that should be raised if the repository operations are invalid
+        :param data_access_class: The object that converts the entities to and from JSON values
+        :param file_name: The name of the JSON Lines file, which is created if it does not exist
+        :param compaction_ratio: The number of records per stored entity above which the log is compacted
+        :param compaction_min_records: The number of records below which the log is never compacted
+        :param loader: The streaming loader that reports the loading progress, or None to use a default one
+        """
+        super().__init__(validator_class, error_class)
+        self.__data_access_class = data_access_class
+        self.__file_name = file_name
+        self.__compaction_ratio = compaction_ratio
+        self.__compaction_min_records = compaction_min_records
+        self.__loader = loader if loader is not None else StreamingLoader()
+        self.__encoder = json.JSONEncoder(separators=(",", ":"), default=data_access_class.serializer)
+        self.__lock = threading.RLock()
+        self.__compaction_lock = threading.Lock()
+        self.__compaction_thread = None
+        self.__pending_records = []
+        self.__log_length = 0
+        self.__load()
+        self.__log = open(file_name, "ab")
+
+    @property
+    def log_length(self):
+        return self.__log_length
+
+    def add(self, entity):
+        """
+        Adds a given entity to the JSON Lines repository
+        :param entity: The entity that will be added to the repo
+        :return: nothing
+        """
+        with self.__lock:
+            super().add(entity)
+            self.__save_change({"op": "upsert", "entity": entity})
+
+    def remove(self, entity_id):
+        """
+        Removes the entity with a given ID from the JSON Lines repository
+        :param entity_id: The ID of the entity to be removed
+        :return: The removed entity
+        """
+        with self.__lock:
+            removed_entity = super().remove(entity_id)
+            if removed_entity is not None:
+                self.__save_change({"op": "delete", "id": entity_id})
+            return removed_entity
+
+    def update(self, entity):
+        """
+        Updates an entity from the JSON Lines repository
+        :param entity: The updated form of the entity
+        :return: The old form of the entity
+        """
+        with self.__lock:
+            old_entity = super().update(entity)
+            if old_entity is not None:
+                self.__save_change({"op": "upsert", "entity": entity})
+            return old_entity
+
+    def flush(self):
+        """
+        Writes the buffered records to the operating system
+        :return: nothing
+        """
+        with self.__lock:
+            self.__log.flush()
+
+    def close(self):
+        """
+        Waits for the background compaction to end and closes the JSON Lines file
+        :return: nothing
+        """
+        if self.__compaction_thread is not None:
+            self.__compaction_thread.join()
+            self.__compaction_thread = None
+        with self.__lock:
+            self.__log.close()
+
+    def compact(self):
+        """
+        Writes one upsert record per stored entity to a new snapshot of the JSON Lines file, followed by the records
+        appended since the compaction started, and replaces the log with it; only the copy of the new records holds
+        back the changes of the repository
+        :return: nothing
+        """
+        with self.__compaction_lock:
+            with self.__lock:
+                self.__log.flush()
+                entities = list(self.entities)
+                snapshot_end = self.__log.tell()
+            locked = False
+            try:
+                with SnapshotWriter(self.__file_name, True) as f:
+                    for entity in entities:
+                        f.write(self.__encode({"op": "upsert", "entity": entity}))
+                    f.write(self.COMMIT_LINE)
+                    self.__lock.acquire()
+                    locked = True
+                    self.__log.close()
+                    tail_length = self.__copy_tail(f, snapshot_end)
+                self.__log_length = len(entities) + tail_length
+            finally:
+                if locked:
+                    self.__log = open(self.__file_name, "ab")
+                    self.__lock.release()
+
+    def _begin_transaction(self):
+        """
+        Holds the lock of the repository until the transaction ends, so that no compaction sees a half done transaction
+        :return: nothing
+        """
+        self.__lock.acquire()
+
+    def _commit_transaction(self):
+        """
+        Appends the records of a transaction to the JSON Lines file, followed by a single commit record
+        :return: nothing
+        """
+        self.__append(self.__pending_records)
+        self.__pending_records = []
+        self.__lock.release()
+
+    def _rollback_transaction(self):
+        """
+        Discards the records of a transaction that failed
+        :return: nothing
+        """
+        self.__pending_records = []
+        self.__lock.release()
+
+    def __save_change(self, record):
+        """
+        Appends the record of a change to the JSON Lines file, unless it is part of a transaction, which appends its
+        records when it commits
+        :param record: The upsert or delete record
+        :return: nothing
+        """
+        if self.in_transaction:
+            self.__pending_records.append(record)
+        else:
+            self.__append([record])
+
+    def __append(self, records):
+        """
+        Appends a group of records to the JSON Lines file, followed by a commit record, and starts a background
+        compaction if the log grew too long
+        :param records: The list of records
+        :return: nothing
+        """
+        if len(records) == 0:
+            return
+        self.__log.write(b"".join(self.__encode(record) for record in records) + self.COMMIT_LINE)
+        self.__log.flush()
+        self.__log_length += len(records)
+        if self.__log_length > max(self.__compaction_min_records, self.__compaction_ratio * len(self.entities)) and \
+                (self.__compaction_thread is None or not self.__compaction_thread.is_alive()):
+            self.__compaction_thread = threading.Thread(target=self.compact, daemon=True)
+            self.__compaction_thread.start()
+
+    def __encode(self, record):
+        """
+        Encodes a record as a line of the JSON Lines file
+        :param record: The record, whose entity is converted by the serializer of the data access object
+        :return: The encoded line, as bytes
+        """
+        return (self.__encoder.encode(record) + "\n").encode()
+
+    def __copy_tail(self, file, start):
+        """
+        Copies the records appended to the JSON Lines file after a given position to another file
+        :param file: The File object of the other file, open for writing in binary mode
+        :param start: The position in the JSON Lines file
+        :return: The number of copied records, without the commit records
+        """
+        copied_count = 0
+        with open(self.__file_name, "rb") as f:
+            f.seek(start)
+            for line in f:
+                file.write(line)
+                if line != self.COMMIT_LINE:
+                    copied_count += 1
+        return copied_count
+
+    def __load(self):
+        """
+        Replays the complete groups of records of the JSON Lines file, adding the entities that are still stored at the
+        end of the log in bulk; a last group without its commit record, which was not fully written, is cut from the
+        file
+        :return: nothing
+        """
+        if not os.path.exists(self.__file_name):
+            return
+        group = []
+        new_entities = {}
+        position = 0
+        committed_end = 0
+        with open(self.__file_name, "r+b") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                position += len(line)
+                if line == self.COMMIT_LINE:
+                    self.__replay(group, new_entities)
+                    self.__log_length += len(group)
+                    group = []
+                    committed_end = position
+                else:
+                    group.append(json.loads(line))
+            f.truncate(committed_end)
+        self.__loader.load(self.__file_name, new_entities.values(), lambda new_entity: new_entity, super().add_all)
+
+    def __replay(self, group, new_entities):
+        """
+        Applies a complete group of records; the entities that are new to the repository are gathered instead of being
+        added one by one, and applying a group twice has no effect
+        :param group: The list of records
+        :param new_entities: The dictionary that maps the IDs of the gathered new entities to their latest form
+        :return: nothing
+        """
+        for record in group:
+            if record["op"] == "upsert":
+                entity = self.__data_access_class.deserializer(record["entity"])
+                if self.contains(entity.id):
+                    super().update(entity)
+                else:
+                    new_entities[entity.id] = entity
+            elif record["id"] in new_entities:
+                del new_entities[record["id"]]
+            elif self.contains(record["id"]):
+                super().remove(record["id"])
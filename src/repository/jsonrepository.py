@@ -1,14 +1,39 @@
 import json
+from itertools import chain
 
+from repository.compactjson import CompactJSONFormat
 from repository.repo import Repository
+from repository.snapshotwriter import SnapshotWriter
+from repository.streamingloader import StreamingLoader
+from repository.writebehindflusher import WriteBehindFlusher
 
 
 class JSONRepository(Repository):
-    def __init__(self, validator_class, error_class, data_access_class, file_name):
+    def __init__(self, validator_class, error_class, data_access_class, file_name, loader=None, flush_interval=None,
+                 flush_threshold=100, checksum=False, compact=False):
+        """
+        Creates a new JSON repository
+        :param validator_class: The class that is used to validate the repository objects
+        :param error_class: The error class that should be raised if the repository operations are invalid
+        :param data_access_class: The object that converts the entities to and from JSON values
+        :param file_name: The name of the JSON file
+        :param loader: The streaming loader that loads the JSON file in chunks, or None to use a default one
+        :param flush_interval: The number of seconds between two saves of the JSON file by a background flusher, or
+        None to save the file on every change
+        :param flush_threshold: The number of unsaved changes after which the background flusher saves them right away
+        :param checksum: True to save a checksum with every snapshot of the JSON file and verify it on load
+        :param compact: True to save the JSON file in the compact format, False to save it as an indented object; the
+        file is loaded in whichever format it has
+        """
         super().__init__(validator_class, error_class)
         self.__data_access_class = data_access_class
         self.__file_name = file_name
+        self.__loader = loader if loader is not None else StreamingLoader()
+        self.__checksum = checksum
+        self.__compact = compact
+        self.__compact_format = CompactJSONFormat(data_access_class)
         self.__load()
+        self.__flusher = WriteBehindFlusher(self.__save_to_file, flush_interval, flush_threshold)
 
     def add(self, entity):
         """
@@ -16,8 +41,9 @@ class JSONRepository(Repository):
         :param entity: The entity that will be added to the repo
         :return: nothing
         """
-        super().add(entity)
-        self.__save_to_file()
+        with self.__flusher.lock:
+            super().add(entity)
+            self.__save_change()
 
     def update(self, entity):
         """
@@ -25,9 +51,10 @@ class JSONRepository(Repository):
         :param entity: The updated form of the entity
         :return: The old form of the entity
         """
-        old_entity = super().update(entity)
-        self.__save_to_file()
-        return old_entity
+        with self.__flusher.lock:
+            old_entity = super().update(entity)
+            self.__save_change()
+            return old_entity
 
     def remove(self, entity_id):
         """
@@ -35,24 +62,86 @@ class JSONRepository(Repository):
         :param entity_id: The ID of the entity to be removed
         :return: The removed entity
         """
-        removed_entity = super().remove(entity_id)
-        self.__save_to_file()
-        return removed_entity
+        with self.__flusher.lock:
+            removed_entity = super().remove(entity_id)
+            self.__save_change()
+            return removed_entity
+
+    def flush(self):
+        """
+        Saves the changes that the background flusher has not saved yet
+        :return: nothing
+        """
+        self.__flusher.flush()
+
+    def close(self):
+        """
+        Stops the background flusher and saves the changes it has not saved yet
+        :return: nothing
+        """
+        self.__flusher.close()
+
+    def _begin_transaction(self):
+        """
+        Holds the lock of the flusher until the transaction ends, so that no half done transaction is saved
+        :return: nothing
+        """
+        self.__flusher.lock.acquire()
+
+    def _commit_transaction(self):
+        """
+        Saves the changes of a transaction to the JSON file, all at once
+        :return: nothing
+        """
+        self.__flusher.mark_dirty()
+        self.__flusher.lock.release()
+
+    def _rollback_transaction(self):
+        """
+        Releases the lock of the flusher after a failed transaction, whose changes were never saved
+        :return: nothing
+        """
+        self.__flusher.lock.release()
+
+    def __save_change(self):
+        """
+        Marks the JSON file as out of date after a change, unless the change is part of a transaction, which saves its
+        changes when it commits
+        :return: nothing
+        """
+        if not self.in_transaction:
+            self.__flusher.mark_dirty()
 
     def __load(self):
         """
-        Loads the entities located in the associated JSON file into the repository
+        Loads the entities located in the associated JSON file into the repository, parsing one chunk of entities at a
+        time; the file may be in the compact format or an indented object
         :return: nothing
+        Raise ValueError if the JSON file does not match its checksum, or if its compact header does not match the
+        entities
         """
+        if self.__checksum:
+            SnapshotWriter.verify(self.__file_name)
         with open(self.__file_name, "rt") as f:
-            entities = json.load(f)
-            for entity in entities.values():
-                super().add(self.__data_access_class.deserializer(entity))
+            values = StreamingLoader.read_json_values(f)
+            first_value = next(values, None)
+            if first_value is None:
+                return
+            if self.__compact_format.is_header(first_value):
+                entities = self.__compact_format.read_rows(first_value, values)
+            else:
+                entities = map(self.__data_access_class.deserializer, chain([first_value], values))
+            self.__loader.load(self.__file_name, entities, lambda entity: entity, super().add_all)
 
     def __save_to_file(self):
         """
-        Loads the entities located in the current repository to the associated JSON file
+        Loads the entities located in the current repository to a new snapshot of the associated JSON file, one row at
+        a time in the compact format
         :return: nothing
         """
-        with open(self.__file_name, "wt") as file:
-            json.dump(self.entities, file, default=self.__data_access_class.serializer, indent=4)
+        with SnapshotWriter(self.__file_name, checksum=self.__checksum) as file:
+            if self.__compact:
+                self.__compact_format.write(file, self.entities)
+            else:
+                json.dump({entity.id: entity for entity in self.entities}, file,
+                          default=self.__data_access_class.serializer, indent=4)
@@ -0,0 +1,201 @@
+import mmap
+import os
+import struct
+from datetime import date
+
+from domain.rental import Rental
+
+
+class MappedRentalFile:
+    RECORD = struct.Struct("<qqqiii")
+    RETURNED_DATE_OFFSET = struct.calcsize("<qqqii")
+    RETURNED_DATE = struct.Struct("<i")
+    NOT_RETURNED = 0
+    SCAN_CHUNK_SIZE = 4096
+
+    def __init__(self, file_name, initial_capacity=1024):
+        """
+        Opens a memory-mapped file of fixed-width rental records, creating it if it does not exist
+        Every slot of the file holds the ID, the movie ID and the client ID of a rental, followed by its rented, due and
+        returned dates as day ordinals, where a returned date of 0 means that the movie was not returned; a slot whose
+        ID is 0 is free. The slot of every stored rental is kept in an index, so that a rental is read or written in
+        constant time
+        :param file_name: The name of the file
+        :param initial_capacity: The number of slots of a new file; the file doubles its capacity when it is full
+        Raise ValueError if the size of the file is not a multiple of the size of a record
+        """
+        if not os.path.exists(file_name) or os.path.getsize(file_name) == 0:
+            with open(file_name, "wb") as f:
+                f.truncate(initial_capacity * self.RECORD.size)
+        elif os.path.getsize(file_name) % self.RECORD.size != 0:
+            raise ValueError("The file " + file_name + " is not a file of rental records!")
+        self.__file = open(file_name, "r+b")
+        self.__map = mmap.mmap(self.__file.fileno(), 0)
+        self.__capacity = len(self.__map) // self.RECORD.size
+        self.__slots = {}
+        self.__end = 0
+        free_slots = []
+        for slot, record in enumerate(self.RECORD.iter_unpack(self.__map)):
+            if record[0] != 0:
+                self.__slots[record[0]] = slot
+                self.__end = slot + 1
+            else:
+                free_slots.append(slot)
+        self.__free_slots = [slot for slot in reversed(free_slots) if slot < self.__end]
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    def __len__(self):
+        return len(self.__slots)
+
+    def __contains__(self, rental_id):
+        return rental_id in self.__slots
+
+    def slot_of(self, rental_id):
+        """
+        Returns the slot of a stored rental
+        :param rental_id: The ID of the rental
+        :return: The slot
+        Raise KeyError if no rental with the given ID is stored
+        """
+        return self.__slots[rental_id]
+
+    def read(self, slot):
+        """
+        Reads the record in a slot
+        :param slot: The slot
+        :return: The (ID, movie ID, client ID, rented date, due date, returned date) tuple of the record, with the dates
+        as day ordinals
+        """
+        return self.RECORD.unpack_from(self.__map, slot * self.RECORD.size)
+
+    def get(self, rental_id):
+        """
+        Reads a stored rental
+        :param rental_id: The ID of the rental
+        :return: The rental
+        Raise KeyError if no rental with the given ID is stored
+        """
+        return self.to_rental(self.read(self.__slots[rental_id]))
+
+    def put(self, rental):
+        """
+        Writes a rental over its slot, or in a free slot if it is not stored yet
+        :param rental: The rental
+        :return: nothing
+        """
+        slot = self.__slots.get(rental.id)
+        if slot is None:
+            slot = self.__allocate()
+            self.__slots[rental.id] = slot
+        self.RECORD.pack_into(self.__map, slot * self.RECORD.size, *self.to_record(rental))
+
+    def set_returned_date(self, rental_id, returned_date):
+        """
+        Overwrites the returned date of a stored rental in place, leaving the rest of its record untouched
+        :param rental_id: The ID of the rental
+        :param returned_date: The returned date, or None if the movie was not returned
+        :return: nothing
+        Raise KeyError if no rental with the given ID is stored
+        """
+        offset = self.__slots[rental_id] * self.RECORD.size + self.RETURNED_DATE_OFFSET
+        self.RETURNED_DATE.pack_into(self.__map, offset, self.__to_ordinal(returned_date))
+
+    def delete(self, rental_id):
+        """
+        Frees the slot of a stored rental
+        :param rental_id: The ID of the rental
+        :return: nothing
+        Raise KeyError if no rental with the given ID is stored
+        """
+        slot = self.__slots.pop(rental_id)
+        self.RECORD.pack_into(self.__map, slot * self.RECORD.size, 0, 0, 0, 0, 0, 0)
+        self.__free_slots.append(slot)
+
+    def scan(self):
+        """
+        Iterates over the records of the stored rentals, copying them out of the mapped file a chunk of slots at a time,
+        so that the file can be changed, and grow, while the scan is running
+        :return: A generator of the (ID, movie ID, client ID, rented date, due date, returned date) tuples of the
+        records, with the dates as day ordinals
+        """
+        start = 0
+        while start < self.__end:
+            stop = min(start + self.SCAN_CHUNK_SIZE, self.__end)
+            records = self.__map[start * self.RECORD.size:stop * self.RECORD.size]
+            for record in self.RECORD.iter_unpack(records):
+                if record[0] != 0:
+                    yield record
+            start = stop
+
+    def rentals(self):
+        """
+        Reads the stored rentals one at a time
+        :return: A generator of the rentals
+        """
+        return (self.to_rental(record) for record in self.scan())
+
+    def flush(self):
+        """
+        Writes the changed pages of the mapped file to the disk
+        :return: nothing
+        """
+        self.__map.flush()
+
+    def close(self):
+        """
+        Writes the changed pages of the mapped file to the disk and closes it
+        :return: nothing
+        """
+        self.__map.flush()
+        self.__map.close()
+        self.__file.close()
+
+    @classmethod
+    def to_record(cls, rental):
+        """
+        Packs the attributes of a rental into the values of a record
+        :param rental: The rental
+        :return: The (ID, movie ID, client ID, rented date, due date, returned date) tuple of the record
+        """
+        return (rental.id, rental.movie_id, rental.client_id, rental.rented_date.toordinal(),
+                rental.due_date.toordinal(), cls.__to_ordinal(rental.returned_date))
+
+    @classmethod
+    def to_rental(cls, record):
+        """
+        Builds a rental from the values of a record
+        :param record: The (ID, movie ID, client ID, rented date, due date, returned date) tuple of the record
+        :return: The rental
+        """
+        rental_id, movie_id, client_id, rented_date, due_date, returned_date = record
+        returned_date = date.fromordinal(returned_date) if returned_date != cls.NOT_RETURNED else None
+        return Rental(rental_id, movie_id, client_id, date.fromordinal(rented_date), date.fromordinal(due_date),
+                      returned_date)
+
+    @classmethod
+    def __to_ordinal(cls, day):
+        """
+        Converts a date that may be missing to a day ordinal
+        :param day: The date, or None
+        :return: The day ordinal of the date, or NOT_RETURNED if the date is None
+        """
+        return day.toordinal() if day is not None else cls.NOT_RETURNED
+
+    def __allocate(self):
+        """
+        Finds a free slot for a new rental, preferring the slots freed by deleted rentals, and doubles the capacity of
+        the file if it is full
+        :return: The slot
+        """
+        if len(self.__free_slots) > 0:
+            return self.__free_slots.pop()
+        if self.__end == self.__capacity:
+            self.__map.close()
+            self.__capacity *= 2
+            self.__file.truncate(self.__capacity * self.RECORD.size)
+            self.__map = mmap.mmap(self.__file.fileno(), 0)
+        self.__end += 1
+        return self.__end - 1
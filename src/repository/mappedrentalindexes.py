@@ -0,0 +1,77 @@
+from datetime import date
+from heapq import nsmallest
+
+from repository.mappedrentalfile import MappedRentalFile
+
+
+class MappedScanIndex:
+    def __init__(self, rental_file):
+        """
+        Creates a new index whose questions are answered by scanning the records of a memory-mapped rental file
+        :param rental_file: The memory-mapped rental file
+        """
+        self.__rental_file = rental_file
+
+    @property
+    def rental_file(self):
+        return self.__rental_file
+
+    def add(self, rental):
+        """
+        Adds a rental to the index; the answers are read from the rental file, so nothing has to be done
+        :param rental: The rental to be added
+        :return: nothing
+        """
+        pass
+
+    def remove(self, rental):
+        """
+        Removes a rental from the index; the answers are read from the rental file, so nothing has to be done
+        :param rental: The rental to be removed
+        :return: nothing
+        """
+        pass
+
+
+class MappedRentedDaysIndex(MappedScanIndex):
+    MOVIE_ID = 1
+    CLIENT_ID = 2
+
+    def __init__(self, rental_file, key_field):
+        """
+        Creates a new index of the number of days for which rentals were kept, grouped by a field of their records
+        :param rental_file: The memory-mapped rental file
+        :param key_field: The position of the field in the records, MOVIE_ID or CLIENT_ID
+        """
+        super().__init__(rental_file)
+        self.__key_field = key_field
+
+    def get_rented_days(self, today):
+        """
+        Returns the number of days for which the rentals of every group were kept, with the rentals that were not
+        returned yet counted until a given date
+        :param today: The date until which the rentals that were not returned are counted
+        :return: A dictionary that maps every group to its number of days
+        """
+        today = today.toordinal()
+        rented_days = {}
+        for record in self.rental_file.scan():
+            returned_date = record[5] if record[5] != MappedRentalFile.NOT_RETURNED else today
+            key = record[self.__key_field]
+            rented_days[key] = rented_days.get(key, 0) + returned_date - record[3]
+        return rented_days
+
+
+class MappedOpenRentalsIndex(MappedScanIndex):
+    def get_due_before(self, day, limit=None):
+        """
+        Returns the rentals that were not returned yet and are due before a given date
+        :param day: The date
+        :param limit: The maximum number of returned rentals, or None to return all of them
+        :return: The list of (due date, rental ID, movie ID) tuples of the rentals, in increasing order of due dates
+        """
+        day = day.toordinal()
+        late_rentals = ((record[4], record[0], record[1]) for record in self.rental_file.scan()
+                        if record[5] == MappedRentalFile.NOT_RETURNED and record[4] < day)
+        late_rentals = sorted(late_rentals) if limit is None else nsmallest(limit, late_rentals)
+        return [(date.fromordinal(due_date), rental_id, movie_id) for due_date, rental_id, movie_id in late_rentals]
@@ -0,0 +1,149 @@
+from repository.mappedrentalfile import MappedRentalFile
+from repository.mappedrentalindexes import MappedRentedDaysIndex, MappedOpenRentalsIndex
+from repository.repo import Repository
+from repository.streamingloader import StreamingLoader
+from repository.writebehindflusher import WriteBehindFlusher
+
+
+class MappedRentalRepository(Repository):
+    SCAN_INDEXES = {"movie_rented_days": lambda rental_file: MappedRentedDaysIndex(rental_file,
+                                                                                   MappedRentedDaysIndex.MOVIE_ID),
+                    "client_rented_days": lambda rental_file: MappedRentedDaysIndex(rental_file,
+                                                                                    MappedRentedDaysIndex.CLIENT_ID),
+                    "open_rentals": MappedOpenRentalsIndex}
+
+    def __init__(self, validator_class, error_class, file_name, initial_capacity=1024, loader=None, flush_interval=None,
+                 flush_threshold=100):
+        """
+        Creates a new rental repository that keeps every rental in a fixed-width slot of a memory-mapped file, so that
+        a change only writes the slot of the changed rental, and returning a movie or cancelling a return only writes
+        its returned date
+        The indexes of rented days and of open rentals, which the reports use, are answered by scanning the mapped
+        file instead of being kept up to date in memory
+        :param validator_class: The class that is used to validate the rentals
+        :param error_class: The error class that should be raised if the repository operations are invalid
+        :param file_name: The name of the memory-mapped rental file
+        :param initial_capacity: The number of slots of a new rental file
+        :param loader: The streaming loader that loads the rental file in chunks, or None to use a default one
+        :param flush_interval: The number of seconds between two writes of the changed pages of the rental file to the
+        disk by a background flusher, or None to write them on every change
+        :param flush_threshold: The number of unwritten changes after which the background flusher writes them at once
+        Raise ValueError if the file is not a file of rental records
+        """
+        super().__init__(validator_class, error_class)
+        self.__rental_file = MappedRentalFile(file_name, initial_capacity)
+        self.__pending_changes = []
+        loader = loader if loader is not None else StreamingLoader()
+        loader.load(file_name, self.__rental_file.rentals(), lambda rental: rental, super().add_all)
+        self.__flusher = WriteBehindFlusher(self.__rental_file.flush, flush_interval, flush_threshold)
+
+    @property
+    def rental_file(self):
+        return self.__rental_file
+
+    def add(self, entity):
+        """
+        Adds a given rental to the mapped rental repository
+        :param entity: The rental that will be added to the repo
+        :return: nothing
+        """
+        super().add(entity)
+        self.__save_change(self.__rental_file.put, entity)
+
+    def remove(self, entity_id):
+        """
+        Removes the rental with a given ID from the mapped rental repository
+        :param entity_id: The ID of the rental to be removed
+        :return: The removed rental
+        """
+        removed_entity = super().remove(entity_id)
+        if removed_entity is not None:
+            self.__save_change(self.__rental_file.delete, entity_id)
+        return removed_entity
+
+    def update(self, entity):
+        """
+        Updates a rental from the mapped rental repository, overwriting only its returned date in the rental file if
+        nothing else changed
+        :param entity: The updated form of the rental
+        :return: The old form of the rental
+        """
+        old_entity = super().update(entity)
+        if old_entity is None:
+            return old_entity
+        if MappedRentalFile.to_record(old_entity)[:5] == MappedRentalFile.to_record(entity)[:5]:
+            self.__save_change(self.__set_returned_date, entity)
+        else:
+            self.__save_change(self.__rental_file.put, entity)
+        return old_entity
+
+    def register_index(self, index_name, index):
+        """
+        Declares a secondary index over the rentals of the repository; the indexes of rented days and of open rentals
+        are replaced by indexes that scan the rental file
+        :param index_name: The name of the index
+        :param index: The in-memory index, which is not used if it is replaced
+        :return: nothing
+        If an index with the given name already exists, it is kept as it is
+        """
+        if index_name in self.SCAN_INDEXES:
+            index = self.SCAN_INDEXES[index_name](self.__rental_file)
+        super().register_index(index_name, index)
+
+    def flush(self):
+        """
+        Writes the changed pages of the rental file that the background flusher has not written yet to the disk
+        :return: nothing
+        """
+        self.__flusher.flush()
+
+    def close(self):
+        """
+        Stops the background flusher and closes the rental file
+        :return: nothing
+        """
+        self.__flusher.close()
+        self.__rental_file.close()
+
+    def _commit_transaction(self):
+        """
+        Writes the changes of a transaction to the rental file
+        :return: nothing
+        """
+        pending_changes, self.__pending_changes = self.__pending_changes, []
+        if len(pending_changes) == 0:
+            return
+        with self.__flusher.lock:
+            for operation, argument in pending_changes:
+                operation(argument)
+            self.__flusher.mark_dirty()
+
+    def _rollback_transaction(self):
+        """
+        Discards the changes of a transaction that failed, which were never written to the rental file
+        :return: nothing
+        """
+        self.__pending_changes = []
+
+    def __save_change(self, operation, argument):
+        """
+        Writes a change to the rental file and marks its pages as changed, unless it is part of a transaction, which
+        writes its changes when it commits
+        :param operation: The method of the rental file that writes the change, taking the argument
+        :param argument: The rental or the ID of the rental that is changed
+        :return: nothing
+        """
+        if self.in_transaction:
+            self.__pending_changes.append((operation, argument))
+        else:
+            with self.__flusher.lock:
+                operation(argument)
+                self.__flusher.mark_dirty()
+
+    def __set_returned_date(self, rental):
+        """
+        Overwrites the returned date of a rental in the rental file
+        :param rental: The updated rental
+        :return: nothing
+        """
+        self.__rental_file.set_returned_date(rental.id, rental.returned_date)
@@ -1,3 +1,9 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from heapq import merge
+from operator import attrgetter
+
+from repository.indexes import KeyIndex
 from src.repository.iterabledatastructure import IterableStructure
 
 
@@ -9,6 +15,11 @@ class Repository:
         :param error_class: The error class that should be raised if the repository operations are invalid
         """
         self.__entities = IterableStructure()
+        self.__id_index = {}
+        self.__sorted_ids = []
+        self.__secondary_indexes = {}
+        self.__transaction_depth = 0
+        self.__undo_log = []
         self.__validator_class = validator_class
         self.__error_class = error_class
 
@@ -24,10 +35,44 @@ class Repository:
         Raise an error of type __error_class if an entity with the same ID as the given entity already exists
         """
         self.__validator_class.validate(entity)
-        if entity.id in self.get_current_ids():
+        if self.contains(entity.id):
+            raise self.__error_class("The ID already exists!")
+        self.__insert(entity)
+        if self.in_transaction:
+            self.__undo_log.append((self.__delete, entity))
+
+    def add_all(self, entities):
+        """
+        Validates and adds many entities to the repository at once, building the in-memory structures in a single pass
+        :param entities: The entities to be added
+        :return: nothing
+        Raise an error of type __error_class if two of the entities, or one of them and a stored entity, have the same
+        ID, in which case none of the entities is added
+        """
+        entities = list(entities)
+        for entity in entities:
+            self.__validator_class.validate(entity)
+        entity_ids = [entity.id for entity in entities]
+        if len(set(entity_ids)) < len(entity_ids) or not self.__id_index.keys().isdisjoint(entity_ids):
             raise self.__error_class("The ID already exists!")
-        self.entities.append(entity)
-        IterableStructure.sort(self.entities, lambda x, y: x.id < y.id)
+        if len(entities) == 0:
+            return
+        if any(entity_ids[i] > entity_ids[i + 1] for i in range(len(entity_ids) - 1)):
+            IterableStructure.sort(entities, key=attrgetter("id"))
+            entity_ids = [entity.id for entity in entities]
+        if len(self.__sorted_ids) == 0 or self.__sorted_ids[-1] < entity_ids[0]:
+            self.entities.extend(entities)
+            self.__sorted_ids.extend(entity_ids)
+        else:
+            merged_entities = list(merge(self.entities, entities, key=attrgetter("id")))
+            del self.entities[:]
+            self.entities.extend(merged_entities)
+            self.__sorted_ids[:] = [entity.id for entity in merged_entities]
+        self.__id_index.update(zip(entity_ids, entities))
+        for entity in entities:
+            self.__add_to_secondary_indexes(entity)
+        if self.in_transaction:
+            self.__undo_log.extend((self.__delete, entity) for entity in entities)
 
     def remove(self, entity_id):
         """
@@ -37,7 +82,9 @@ class Repository:
         """
         current_entity = self.get_entity_at_id(entity_id)
         if current_entity is not None:
-            del self.entities[self.get_current_ids().index(entity_id)]
+            self.__delete(current_entity)
+            if self.in_transaction:
+                self.__undo_log.append((self.__insert, current_entity))
             return current_entity
 
     def update(self, entity):
@@ -49,15 +96,98 @@ class Repository:
         self.__validator_class.validate(entity)
         old_entity = self.get_entity_at_id(entity.id)
         if old_entity is not None:
-            self.entities[self.get_current_ids().index(entity.id)] = entity
+            self.__replace(entity)
+            if self.in_transaction:
+                self.__undo_log.append((self.__replace, old_entity))
             return old_entity
 
+    @property
+    def in_transaction(self):
+        return self.__transaction_depth > 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups the changes made to the repository inside a with block into a single unit of work, which is committed
+        when the block ends or rolled back if the block raises an exception
+        :return: A context manager that yields the repository
+        Nested transactions join the outermost one, which is the only one that commits or rolls back
+        """
+        if self.__transaction_depth == 0:
+            self._begin_transaction()
+        self.__transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.__transaction_depth -= 1
+            if self.__transaction_depth == 0:
+                self.__rollback()
+            raise
+        else:
+            self.__transaction_depth -= 1
+            if self.__transaction_depth == 0:
+                try:
+                    self._commit_transaction()
+                except BaseException:
+                    self.__rollback()
+                    raise
+                self.__undo_log = []
+
+    def _begin_transaction(self):
+        """
+        Prepares the persistent storage for a new transaction; the in-memory repository has no persistent storage
+        :return: nothing
+        """
+        pass
+
+    def _commit_transaction(self):
+        """
+        Persists the changes of a transaction that ended successfully; the in-memory repository has nothing to persist
+        :return: nothing
+        If the commit raises an exception, the transaction is rolled back as if it had failed, so the persistent storage
+        must be left in a state that _rollback_transaction can discard
+        """
+        pass
+
+    def _rollback_transaction(self):
+        """
+        Discards the persisted changes of a transaction that failed, after the entities in memory were restored; the
+        in-memory repository has nothing to discard
+        :return: nothing
+        """
+        pass
+
+    def flush(self):
+        """
+        Persists the changes that the repository has not persisted yet; the in-memory repository has none
+        :return: nothing
+        """
+        pass
+
+    def close(self):
+        """
+        Releases the resources held by the repository; the in-memory repository holds none
+        :return: nothing
+        """
+        pass
+
     def get_current_ids(self):
         """
         Returns the list of current IDs from the repository
         :return: The list of current IDs from the repository
         """
-        return [x.id for x in self.entities]
+        return list(self.__sorted_ids)
+
+    def contains(self, entity_id):
+        """
+        Checks if an entity with a given ID exists in the repository
+        :param entity_id: The ID of the entity
+        :return: True if the entity exists, otherwise False
+        """
+        try:
+            return entity_id in self.__id_index
+        except TypeError:
+            return False
 
     def get_entity_at_id(self, entity_id):
         """
@@ -66,7 +196,161 @@ class Repository:
         :return: The entity at the specified ID
         Raise an error of type __error_class if an entity with the specified ID does not exist
         """
-        current_ids = self.get_current_ids()
-        if entity_id not in current_ids:
+        if not self.contains(entity_id):
             raise self.__error_class("The ID doesn't exist!")
-        return self.entities[current_ids.index(entity_id)]
+        return self.__id_index[entity_id]
+
+    def add_index(self, index_name, key_function):
+        """
+        Declares a secondary index that groups the entities of the repository by the value of a key function
+        :param index_name: The name of the index
+        :param key_function: The function that takes an entity and returns the value it is indexed by
+        :return: nothing
+        If an index with the given name already exists, it is kept as it is
+        """
+        self.register_index(index_name, KeyIndex(key_function))
+
+    def register_index(self, index_name, index):
+        """
+        Declares a secondary index over the entities of the repository, which is kept up to date on every change
+        :param index_name: The name of the index
+        :param index: An object with an add and a remove method, each taking an entity
+        :return: nothing
+        If an index with the given name already exists, it is kept as it is
+        """
+        if index_name in self.__secondary_indexes:
+            return
+        for entity in self.entities:
+            index.add(entity)
+        self.__secondary_indexes[index_name] = index
+
+    def has_index(self, index_name):
+        """
+        Checks if the repository has a given secondary index
+        :param index_name: The name of the index
+        :return: True if the index exists, otherwise False
+        """
+        return index_name in self.__secondary_indexes
+
+    def get_index(self, index_name):
+        """
+        Returns a secondary index of the repository
+        :param index_name: The name of the index
+        :return: The index with the given name
+        Raise an error of type __error_class if the index does not exist
+        """
+        if index_name not in self.__secondary_indexes:
+            raise self.__error_class("The index doesn't exist!")
+        return self.__secondary_indexes[index_name]
+
+    def get_entities_by_index(self, index_name, value):
+        """
+        Returns the entities that have a given value in a secondary index declared with add_index
+        :param index_name: The name of the index
+        :param value: The indexed value
+        :return: The list of entities with the given value, in increasing order of their IDs
+        Raise an error of type __error_class if the index does not exist
+        """
+        return self.get_index(index_name).find(value)
+
+    def remove_by_index(self, index_name, value):
+        """
+        Removes the entities that have a given value in a secondary index declared with add_index
+        :param index_name: The name of the index
+        :param value: The indexed value
+        :return: The list of removed entities, in increasing order of their IDs
+        Raise an error of type __error_class if the index does not exist
+        """
+        removed_entities = self.get_entities_by_index(index_name, value)
+        for entity in removed_entities:
+            self.remove(entity.id)
+        return removed_entities
+
+    def __add_to_secondary_indexes(self, entity):
+        """
+        Adds an entity to every secondary index of the repository
+        :param entity: The entity
+        :return: nothing
+        """
+        for index in self.__secondary_indexes.values():
+            index.add(entity)
+
+    def __remove_from_secondary_indexes(self, entity):
+        """
+        Removes an entity from every secondary index of the repository
+        :param entity: The entity
+        :return: nothing
+        """
+        for index in self.__secondary_indexes.values():
+            index.remove(entity)
+
+    def __insert(self, entity):
+        """
+        Inserts an entity in the in-memory structures of the repository, at its position in the order of IDs
+        :param entity: The entity
+        :return: nothing
+        """
+        position = bisect_left(self.__sorted_ids, entity.id)
+        self.__sorted_ids.insert(position, entity.id)
+        self.entities.insert(position, entity)
+        self.__id_index[entity.id] = entity
+        self.__add_to_secondary_indexes(entity)
+
+    def __delete(self, entity):
+        """
+        Deletes a stored entity from the in-memory structures of the repository
+        :param entity: The entity
+        :return: nothing
+        """
+        position = self.__position_of(entity.id)
+        del self.__sorted_ids[position]
+        del self.entities[position]
+        del self.__id_index[entity.id]
+        self.__remove_from_secondary_indexes(entity)
+
+    def __replace(self, entity):
+        """
+        Replaces the stored entity with the same ID as a given entity in the in-memory structures of the repository
+        :param entity: The entity
+        :return: nothing
+        """
+        old_entity = self.__id_index[entity.id]
+        self.entities[self.__position_of(entity.id)] = entity
+        self.__id_index[entity.id] = entity
+        self.__remove_from_secondary_indexes(old_entity)
+        self.__add_to_secondary_indexes(entity)
+
+    def __rollback(self):
+        """
+        Restores the entities in memory to their state from before the current transaction and discards its changes
+        :return: nothing
+        """
+        undo_log, self.__undo_log = self.__undo_log, []
+        self.__undo(undo_log)
+        self._rollback_transaction()
+
+    def _detach_undo_log(self):
+        """
+        Takes the undo log away from the current transaction, so that its changes can still be undone in memory after
+        the transaction ended, for example if it was joined to a transaction of other repositories that failed later
+        :return: A function that restores the entities in memory to their state from before the transaction
+        """
+        undo_log, self.__undo_log = self.__undo_log, []
+        return lambda: self.__undo(undo_log)
+
+    def __undo(self, undo_log):
+        """
+        Undoes the changes recorded in an undo log, from the last one to the first one
+        :param undo_log: The list of (undo operation, entity) pairs
+        :return: nothing
+        """
+        for undo_operation, entity in reversed(undo_log):
+            undo_operation(entity)
+
+    def __position_of(self, entity_id):
+        """
+        Returns the position of a stored entity in the list of entities, which is kept sorted by ID
+        :param entity_id: The ID of the stored entity
+        :return: The position of the entity
+        """
+        return bisect_left(self.__sorted_ids, entity_id)
@@ -0,0 +1,140 @@
+import hashlib
+import io
+import os
+
+
+class SnapshotWriter:
+    CHECKSUM_SUFFIX = ".sha256"
+    TEMPORARY_SUFFIX = ".tmp"
+
+    def __init__(self, file_name, binary=False, buffer_size=1048576, checksum=False):
+        """
+        Creates a new writer that replaces a file with a new snapshot atomically: the snapshot is written to a
+        temporary file through a large buffer, synced to the disk and renamed over the file, so that a crash leaves
+        either the old file or the new one, never a truncated one
+        The writer is used as a context manager, which gives the file object of the temporary file; the rename only
+        happens if the with block ends without an exception
+        :param file_name: The name of the file
+        :param binary: True to write bytes, False to write text
+        :param buffer_size: The number of bytes that are buffered before they are written to the temporary file
+        :param checksum: True to save the SHA-256 checksum of the snapshot next to the file, so that verify can detect
+        a damaged file, otherwise False, which removes an older checksum
+        """
+        self.__file_name = file_name
+        self.__binary = binary
+        self.__buffer_size = buffer_size
+        self.__checksum = checksum
+        self.__raw_file = None
+        self.__file = None
+
+    @property
+    def file_name(self):
+        return self.__file_name
+
+    def __enter__(self):
+        self.__raw_file = _HashingFileIO(self.__file_name + self.TEMPORARY_SUFFIX)
+        self.__file = io.BufferedWriter(self.__raw_file, self.__buffer_size)
+        if not self.__binary:
+            self.__file = io.TextIOWrapper(self.__file)
+        return self.__file
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        temporary_file_name = self.__file_name + self.TEMPORARY_SUFFIX
+        if exc_type is not None:
+            self.__file.close()
+            os.remove(temporary_file_name)
+            return False
+        self.__file.flush()
+        os.fsync(self.__raw_file.fileno())
+        self.__file.close()
+        checksum_file_name = self.__file_name + self.CHECKSUM_SUFFIX
+        if self.__checksum:
+            self.__write_file(checksum_file_name + self.TEMPORARY_SUFFIX, self.__raw_file.hexdigest())
+        os.replace(temporary_file_name, self.__file_name)
+        if self.__checksum:
+            os.replace(checksum_file_name + self.TEMPORARY_SUFFIX, checksum_file_name)
+        elif os.path.exists(checksum_file_name):
+            os.remove(checksum_file_name)
+        self.__sync_directory()
+        return False
+
+    @classmethod
+    def verify(cls, file_name):
+        """
+        Checks a file against the checksum saved with its last snapshot; a file without a checksum is not checked
+        If the program stopped after the snapshot was renamed but before its checksum was, the checksum that was
+        waiting to be renamed is accepted and renamed
+        :param file_name: The name of the file
+        :return: nothing
+        Raise ValueError if the file does not match its checksum
+        """
+        checksum_file_name = file_name + cls.CHECKSUM_SUFFIX
+        if not os.path.exists(checksum_file_name):
+            return
+        digest = hashlib.sha256()
+        with open(file_name, "rb") as f:
+            for block in iter(lambda: f.read(1048576), b""):
+                digest.update(block)
+        pending_checksum_file_name = checksum_file_name + cls.TEMPORARY_SUFFIX
+        if os.path.exists(pending_checksum_file_name):
+            if cls.__read_file(pending_checksum_file_name) == digest.hexdigest():
+                os.replace(pending_checksum_file_name, checksum_file_name)
+                return
+            os.remove(pending_checksum_file_name)
+        if cls.__read_file(checksum_file_name) != digest.hexdigest():
+            raise ValueError("The file " + file_name + " does not match its checksum!")
+
+    @staticmethod
+    def __read_file(file_name):
+        """
+        Reads a checksum file
+        :param file_name: The name of the checksum file
+        :return: The checksum, as a hexadecimal string
+        """
+        with open(file_name, "rt") as f:
+            return f.read().strip()
+
+    @staticmethod
+    def __write_file(file_name, checksum):
+        """
+        Writes a checksum file and syncs it to the disk
+        :param file_name: The name of the checksum file
+        :param checksum: The checksum, as a hexadecimal string
+        :return: nothing
+        """
+        with open(file_name, "wt") as f:
+            f.write(checksum + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __sync_directory(self):
+        """
+        Syncs the directory of the file to the disk, so that the rename survives a crash; this is skipped on systems
+        that cannot open directories
+        :return: nothing
+        """
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        directory = os.open(os.path.dirname(os.path.abspath(self.__file_name)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+class _HashingFileIO(io.FileIO):
+    def __init__(self, file_name):
+        """
+        Opens a file for writing, computing the SHA-256 checksum of the bytes written to it
+        :param file_name: The name of the file
+        """
+        super().__init__(file_name, "w")
+        self.__digest = hashlib.sha256()
+
+    def write(self, data):
+        written_count = super().write(data)
+        self.__digest.update(memoryview(data)[:written_count])
+        return written_count
+
+    def hexdigest(self):
+        return self.__digest.hexdigest()
@@ -0,0 +1,130 @@
+import sqlite3
+import threading
+
+
+class SQLConnectionPool:
+    def __init__(self, file_name, pool_size=1, cached_statements=128, pragmas=None):
+        """
+        Creates a new pool of long-lived connections to an SQLite database, every thread using its own connection
+        :param file_name: The name of the database file
+        :param pool_size: The maximum number of connections that can be open at the same time
+        :param cached_statements: The number of prepared statements every connection keeps for reuse
+        :param pragmas: A dictionary that maps the names of SQLite pragmas to the values that are applied to every new
+        connection, in the order of the dictionary
+        """
+        self.__file_name = file_name
+        self.__cached_statements = cached_statements
+        self.__pragmas = dict(pragmas) if pragmas is not None else {}
+        self.__free_slots = threading.BoundedSemaphore(pool_size)
+        self.__lock = threading.Lock()
+        self.__connections = {}
+        self.__closed = False
+        self.__transaction_depth = 0
+        self.__undo_functions = []
+
+    @property
+    def file_name(self):
+        return self.__file_name
+
+    @property
+    def in_transaction(self):
+        return self.__transaction_depth > 0
+
+    @property
+    def transaction_depth(self):
+        return self.__transaction_depth
+
+    def begin_transaction(self):
+        """
+        Marks the start of a transaction of one of the repositories that share the pool
+        :return: nothing
+        """
+        with self.__lock:
+            self.__transaction_depth += 1
+
+    def end_transaction(self, undo_function=None):
+        """
+        Marks the end of a transaction of one of the repositories that share the pool
+        :param undo_function: A function that undoes the changes made in memory by the transaction, which is kept until
+        the last running transaction of the pool ends, in case it fails, or None
+        :return: True if no other transaction of the repositories is still running, otherwise False
+        """
+        with self.__lock:
+            self.__transaction_depth -= 1
+            if undo_function is not None:
+                self.__undo_functions.append(undo_function)
+            return self.__transaction_depth == 0
+
+    def pop_undo_functions(self):
+        """
+        Returns the undo functions of the transactions that ended while other transactions of the pool were running,
+        and forgets them
+        :return: The list of undo functions, in the order in which their transactions ended
+        """
+        with self.__lock:
+            undo_functions, self.__undo_functions = self.__undo_functions, []
+            return undo_functions
+
+    def get_connection(self):
+        """
+        Returns the connection of the current thread, opening it if the thread does not have one yet
+        :return: The connection of the current thread
+        Raise sqlite3.ProgrammingError if the pool was closed
+        If the pool is full, the call blocks until another thread releases its connection
+        """
+        thread_id = threading.get_ident()
+        with self.__lock:
+            if self.__closed:
+                raise sqlite3.ProgrammingError("The connection pool is closed!")
+            connection = self.__connections.get(thread_id)
+        if connection is None:
+            self.__free_slots.acquire()
+            connection = sqlite3.connect(self.__file_name, cached_statements=self.__cached_statements,
+                                         check_same_thread=False)
+            self.__configure(connection)
+            with self.__lock:
+                self.__connections[thread_id] = connection
+        return connection
+
+    def release_connection(self):
+        """
+        Commits and closes the connection of the current thread, if it has one, making room for other threads
+        :return: nothing
+        """
+        with self.__lock:
+            connection = self.__connections.pop(threading.get_ident(), None)
+        if connection is not None:
+            connection.commit()
+            connection.close()
+            self.__free_slots.release()
+
+    def close(self):
+        """
+        Commits and closes every connection of the pool; the pool cannot be used afterwards
+        :return: nothing
+        """
+        with self.__lock:
+            connections = list(self.__connections.values())
+            self.__connections.clear()
+            self.__closed = True
+        for connection in connections:
+            connection.commit()
+            connection.close()
+            self.__free_slots.release()
+
+    def __configure(self, connection):
+        """
+        Applies the pragmas of the pool to a new connection
+        :param connection: The connection
+        :return: nothing
+        A page size that differs from the one of an existing database is applied by rebuilding the database, which is
+        only possible while it is not in WAL mode
+        """
+        for name, value in self.__pragmas.items():
+            if name == "page_size":
+                if connection.execute("PRAGMA page_size").fetchone()[0] != value:
+                    connection.execute("PRAGMA page_size = " + str(int(value)))
+                    if connection.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+                        connection.execute("VACUUM")
+            else:
+                connection.execute("PRAGMA " + name + " = " + str(value))
@@ -1,10 +1,11 @@
 import abc
-import sqlite3
-from datetime import datetime
+from datetime import date
 
 from domain.client import Client
 from domain.movie import Movie
 from domain.rental import Rental
+from repository.sqlqueryindexes import SQLKeyIndex, SQLSubstringIndex, SQLMovieAvailabilityIndex, \
+    SQLClientBlockedIndex, SQLRentedDaysIndex, SQLOpenRentalsIndex, SQLLateRentalsReportIndex, SQLRentedDaysReportIndex
 
 
 class SQLDataAccess(metaclass=abc.ABCMeta):
@@ -13,49 +14,66 @@ class SQLDataAccess(metaclass=abc.ABCMeta):
         pass
 
     @abc.abstractmethod
-    def add(self, entity, file):
+    def add(self, entity, connection):
         pass
 
     @abc.abstractmethod
-    def remove(self, entity_id, file):
+    def remove(self, entity_id, connection):
         pass
 
     @abc.abstractmethod
-    def update(self, entity, file):
+    def update(self, entity, connection):
         pass
 
+    @abc.abstractmethod
+    def get_schema_migrations(self):
+        """
+        Returns the migrations that bring the table of the entities to its latest schema version
+        :return: The list of migrations, in order, each being a list of SQL statements
+        """
+        pass
+
+    def get_query_index(self, index_name, repository):
+        """
+        Returns an index that answers the questions of a secondary index with queries on the table of the entities
+        :param index_name: The name of the secondary index
+        :param repository: The SQL query repository that runs the queries
+        :return: The SQL index, or None if the secondary index cannot be answered by queries
+        """
+        return None
+
 
 class ClientSQLDataAccess(SQLDataAccess):
 
     def read_from_line(self, attribute_tuple):
         return Client(*attribute_tuple)
 
-    def add(self, entity, file):
-        connection = sqlite3.connect(file)
-        cursor = connection.cursor()
-        cursor.execute("INSERT INTO clients VALUES(?, ?)",
-                       (entity.id, entity.name))
-        connection.commit()
-        connection.close()
-
-    def remove(self, entity_id, file):
-        connection = sqlite3.connect(file)
-        cursor = connection.cursor()
-        cursor.execute("DELETE FROM clients "
-                       "WHERE ID=?",
-                       (entity_id, ))
-        connection.commit()
-        connection.close()
-
-    def update(self, entity, file):
-        connection = sqlite3.connect(file)
-        cursor = connection.cursor()
-        cursor.execute("UPDATE clients "
-                       "SET Name = ? "
-                       "WHERE ID = ? ",
-                       (entity.name, entity.id))
-        connection.commit()
-        connection.close()
+    def add(self, entity, connection):
+        connection.execute("INSERT INTO clients VALUES(?, ?)",
+                           (entity.id, entity.name))
+
+    def remove(self, entity_id, connection):
+        connection.execute("DELETE FROM clients "
+                           "WHERE ID=?",
+                           (entity_id, ))
+
+    def update(self, entity, connection):
+        connection.execute("UPDATE clients "
+                           "SET Name = ? "
+                           "WHERE ID = ? ",
+                           (entity.name, entity.id))
+
+    def get_schema_migrations(self):
+        return [["CREATE TABLE IF NOT EXISTS clients (ID int, Name text)"],
+                ["CREATE TABLE clients_migrated (ID integer PRIMARY KEY, Name text NOT NULL)",
+                 "INSERT INTO clients_migrated SELECT ID, Name FROM clients",
+                 "DROP TABLE clients",
+                 "ALTER TABLE clients_migrated RENAME TO clients"]]
+
+    def get_query_index(self, index_name, repository):
+        query_indexes = {"search_id": lambda: SQLSubstringIndex(repository, "ID"),
+                         "search_name": lambda: SQLSubstringIndex(repository, "Name")}
+        return query_indexes[index_name]() if index_name in query_indexes else None
 
 
 class MovieSQLDataAccess(SQLDataAccess):
@@ -63,72 +81,135 @@ class MovieSQLDataAccess(SQLDataAccess):
     def read_from_line(self, attribute_tuple):
         return Movie(*attribute_tuple)
 
-    def add(self, entity, file):
-        connection = sqlite3.connect(file)
-        cursor = connection.cursor()
-        cursor.execute("INSERT INTO movies "
-                       "VALUES(?, ?, ?, ?)",
-                       (entity.id, entity.title, entity.description, entity.genre))
-        connection.commit()
-        connection.close()
-
-    def remove(self, entity_id, file):
-        connection = sqlite3.connect(file)
-        cursor = connection.cursor()
-        cursor.execute("DELETE FROM movies "
-                       "WHERE ID=?",
-                       (entity_id, ))
-        connection.commit()
-        connection.close()
-
-    def update(self, entity, file):
-        connection = sqlite3.connect(file)
-        cursor = connection.cursor()
-        cursor.execute("UPDATE movies "
-                       "SET Title = ?, Description = ?, Genre = ?"
-                       "WHERE ID = ?",
-                       (entity.title, entity.description, entity.genre, entity.id))
-        connection.commit()
-        connection.close()
+    def add(self, entity, connection):
+        connection.execute("INSERT INTO movies "
+                           "VALUES(?, ?, ?, ?)",
+                           (entity.id, entity.title, entity.description, entity.genre))
+
+    def remove(self, entity_id, connection):
+        connection.execute("DELETE FROM movies "
+                           "WHERE ID=?",
+                           (entity_id, ))
+
+    def update(self, entity, connection):
+        connection.execute("UPDATE movies "
+                           "SET Title = ?, Description = ?, Genre = ?"
+                           "WHERE ID = ?",
+                           (entity.title, entity.description, entity.genre, entity.id))
+
+    def get_schema_migrations(self):
+        return [["CREATE TABLE IF NOT EXISTS movies (ID int, Title text, Description text, Genre text)"],
+                ["CREATE TABLE movies_migrated (ID integer PRIMARY KEY, Title text NOT NULL, "
+                 "Description text NOT NULL, Genre text NOT NULL)",
+                 "INSERT INTO movies_migrated SELECT ID, Title, Description, Genre FROM movies",
+                 "DROP TABLE movies",
+                 "ALTER TABLE movies_migrated RENAME TO movies"]]
+
+    def get_query_index(self, index_name, repository):
+        query_indexes = {"search_id": lambda: SQLSubstringIndex(repository, "ID"),
+                         "search_title": lambda: SQLSubstringIndex(repository, "Title"),
+                         "search_description": lambda: SQLSubstringIndex(repository, "Description"),
+                         "search_genre": lambda: SQLSubstringIndex(repository, "Genre")}
+        return query_indexes[index_name]() if index_name in query_indexes else None
 
 
 class RentalSQLDataAccess(SQLDataAccess):
+    def __init__(self, single_database=False):
+        """
+        Creates a new data access object for the rentals table
+        :param single_database: True if the clients and movies tables are in the same database as the rentals table,
+        which lets the rentals reference them with foreign keys and the reports join them, otherwise False
+        """
+        self.__single_database = single_database
 
     def read_from_line(self, attribute_tuple):
-        rented_date = datetime.strptime(attribute_tuple[3], "%Y-%m-%d").date()
-        due_date = datetime.strptime(attribute_tuple[4], "%Y-%m-%d").date()
-        if attribute_tuple[5] != "None":
-            returned_date = datetime.strptime(attribute_tuple[5], "%Y-%m-%d").date()
-        else:
-            returned_date = None
-        return Rental(attribute_tuple[0], attribute_tuple[1], attribute_tuple[2], rented_date, due_date, returned_date)
-
-    def add(self, entity, file):
-        connection = sqlite3.connect(file)
-        cursor = connection.cursor()
-        cursor.execute("INSERT INTO rentals "
-                       "VALUES(?, ?, ?, ?, ?, ?)",
-                       (entity.id, entity.movie_id, entity.client_id, str(entity.rented_date),
-                        str(entity.due_date), str(entity.returned_date)))
-        connection.commit()
-        connection.close()
-
-    def remove(self, entity_id, file):
-        connection = sqlite3.connect(file)
-        cursor = connection.cursor()
-        cursor.execute("DELETE FROM rentals "
-                       "WHERE ID=?",
-                       (entity_id, ))
-        connection.commit()
-        connection.close()
-
-    def update(self, entity, file):
-        connection = sqlite3.connect(file)
-        cursor = connection.cursor()
-        cursor.execute("UPDATE rentals "
-                       "SET MovieID = ?, ClientID = ?, RentedDate = ?, DueDate = ?, ReturnedDate = ?"
-                       "WHERE ID = ?",
-                       (entity.movie_id, entity.client_id, str(entity.rented_date), str(entity.due_date),
-                        str(entity.returned_date), entity.id))
-        connection.commit()
-        connection.close()
+        returned_date = date.fromordinal(attribute_tuple[5]) if attribute_tuple[5] is not None else None
+        return Rental(attribute_tuple[0], attribute_tuple[1], attribute_tuple[2], date.fromordinal(attribute_tuple[3]),
+                      date.fromordinal(attribute_tuple[4]), returned_date)
+
+    def add(self, entity, connection):
+        connection.execute("INSERT INTO rentals "
+                           "VALUES(?, ?, ?, ?, ?, ?)",
+                           (entity.id, entity.movie_id, entity.client_id) + self.__to_ordinals(entity))
+
+    def remove(self, entity_id, connection):
+        connection.execute("DELETE FROM rentals "
+                           "WHERE ID=?",
+                           (entity_id, ))
+
+    def update(self, entity, connection):
+        connection.execute("UPDATE rentals "
+                           "SET MovieID = ?, ClientID = ?, RentedDate = ?, DueDate = ?, ReturnedDate = ?"
+                           "WHERE ID = ?",
+                           (entity.movie_id, entity.client_id) + self.__to_ordinals(entity) + (entity.id,))
+
+    def get_schema_migrations(self):
+        migrations = [["CREATE TABLE IF NOT EXISTS rentals (ID int, MovieID int, ClientID int, RentedDate text, "
+                       "DueDate text, ReturnedDate text)"],
+                      ["CREATE TABLE rentals_migrated (ID integer PRIMARY KEY, MovieID integer NOT NULL, "
+                       "ClientID integer NOT NULL, RentedDate integer NOT NULL, DueDate integer NOT NULL, "
+                       "ReturnedDate integer)",
+                       "INSERT INTO rentals_migrated SELECT ID, MovieID, ClientID, " +
+                       self.__text_to_ordinal("RentedDate") + ", " + self.__text_to_ordinal("DueDate") +
+                       ", CASE ReturnedDate WHEN 'None' THEN NULL ELSE " + self.__text_to_ordinal("ReturnedDate") +
+                       " END FROM rentals",
+                       "DROP TABLE rentals",
+                       "ALTER TABLE rentals_migrated RENAME TO rentals"],
+                      self.__create_indexes()]
+        if self.__single_database:
+            migrations.append(["CREATE TABLE rentals_migrated (ID integer PRIMARY KEY, "
+                               "MovieID integer NOT NULL REFERENCES movies(ID) DEFERRABLE INITIALLY DEFERRED, "
+                               "ClientID integer NOT NULL REFERENCES clients(ID) DEFERRABLE INITIALLY DEFERRED, "
+                               "RentedDate integer NOT NULL, DueDate integer NOT NULL, ReturnedDate integer)",
+                               "INSERT INTO rentals_migrated SELECT * FROM rentals",
+                               "DROP TABLE rentals",
+                               "ALTER TABLE rentals_migrated RENAME TO rentals"] + self.__create_indexes())
+        return migrations
+
+    def get_query_index(self, index_name, repository):
+        query_indexes = {"client_id": lambda: SQLKeyIndex(repository, "ClientID"),
+                         "movie_id": lambda: SQLKeyIndex(repository, "MovieID"),
+                         "availability": lambda: SQLMovieAvailabilityIndex(repository),
+                         "blocked_clients": lambda: SQLClientBlockedIndex(repository),
+                         "movie_rented_days": lambda: SQLRentedDaysIndex(repository, "MovieID"),
+                         "client_rented_days": lambda: SQLRentedDaysIndex(repository, "ClientID"),
+                         "open_rentals": lambda: SQLOpenRentalsIndex(repository)}
+        if self.__single_database:
+            query_indexes.update({"late_rentals_report": lambda: SQLLateRentalsReportIndex(repository),
+                                  "movie_rented_days_report":
+                                      lambda: SQLRentedDaysReportIndex(repository, "MovieID", "movies", "Title"),
+                                  "client_rented_days_report":
+                                      lambda: SQLRentedDaysReportIndex(repository, "ClientID", "clients", "Name")})
+        return query_indexes[index_name]() if index_name in query_indexes else None
+
+    @staticmethod
+    def __to_ordinals(entity):
+        """
+        Converts the dates of a rental to the day ordinals they are stored as
+        :param entity: The rental
+        :return: A tuple with the ordinals of the rented date, the due date and the returned date, which is None if the
+        rental was not returned
+        """
+        returned_date = entity.returned_date.toordinal() if entity.returned_date is not None else None
+        return entity.rented_date.toordinal(), entity.due_date.toordinal(), returned_date
+
+    @staticmethod
+    def __text_to_ordinal(column):
+        """
+        Returns the SQL expression that converts a column of YYYY-MM-DD dates to day ordinals, the first of January of
+        year 1 being day 1
+        :param column: The name of the column
+        :return: The SQL expression
+        """
+        return "CAST(julianday(" + column + ") - 1721424.5 AS INTEGER)"
+
+    @staticmethod
+    def __create_indexes():
+        """
+        Returns the statements that create the indexes of the rentals table
+        :return: The list of SQL statements
+        """
+        return ["CREATE INDEX IF NOT EXISTS rentals_MovieID ON rentals(MovieID)",
+                "CREATE INDEX IF NOT EXISTS rentals_ClientID ON rentals(ClientID)",
+                "CREATE INDEX IF NOT EXISTS rentals_DueDate ON rentals(DueDate)",
+                "CREATE INDEX IF NOT EXISTS rentals_ReturnedDate ON rentals(ReturnedDate)"]
@@ -0,0 +1,232 @@
+from datetime import date
+
+
+class SQLQueryIndex:
+    def __init__(self, repository, columns=()):
+        """
+        Creates a new index whose questions are answered by queries on the table of an SQL query repository
+        :param repository: The SQL query repository
+        :param columns: The columns of the table that the queries of the index filter or order by, which the repository
+        keeps a database index on
+        """
+        self.__repository = repository
+        self.__columns = tuple(columns)
+
+    @property
+    def repository(self):
+        return self.__repository
+
+    @property
+    def columns(self):
+        return self.__columns
+
+    def add(self, entity):
+        """
+        Adds an entity to the index; the database keeps its own indexes up to date, so nothing has to be done
+        :param entity: The entity to be added
+        :return: nothing
+        """
+        pass
+
+    def remove(self, entity):
+        """
+        Removes an entity from the index; the database keeps its own indexes up to date, so nothing has to be done
+        :param entity: The entity to be removed
+        :return: nothing
+        """
+        pass
+
+
+class SQLKeyIndex(SQLQueryIndex):
+    def __init__(self, repository, column):
+        """
+        Creates a new index that finds the entities with a given value in a column
+        :param repository: The SQL query repository
+        :param column: The column
+        """
+        super().__init__(repository, (column,))
+        self.__column = column
+
+    def find(self, value):
+        """
+        Returns the entities with a given value in the column of the index
+        :param value: The value
+        :return: The list of entities with the given value, in increasing order of their IDs
+        """
+        return self.repository.select_entities(self.__column + " = ?", (value,))
+
+    def delete(self, value, connection):
+        """
+        Deletes the entities with a given value in the column of the index
+        :param value: The value
+        :param connection: The connection the statement is run through
+        :return: nothing
+        """
+        connection.execute("DELETE FROM " + self.repository.table_name + " WHERE " + self.__column + " = ?", (value,))
+
+
+class SQLSubstringIndex(SQLQueryIndex):
+    def __init__(self, repository, column):
+        """
+        Creates a new index that finds the entities whose value in a column contains a given string
+        :param repository: The SQL query repository
+        :param column: The column
+        """
+        super().__init__(repository)
+        self.__column = column
+
+    def find(self, substring):
+        """
+        Returns the entities whose lowercase value in the column of the index contains a given string
+        :param substring: The searched string
+        :return: The list of entities whose value contains the string, in increasing order of their IDs
+        """
+        return self.repository.select_entities("instr(lower(CAST(" + self.__column + " AS TEXT)), ?) > 0",
+                                               (substring,))
+
+
+class SQLMovieAvailabilityIndex(SQLQueryIndex):
+    def __init__(self, repository):
+        """
+        Creates a new index that checks the periods in which every movie is rented with queries on the rentals table
+        :param repository: The SQL query repository of the rentals
+        """
+        super().__init__(repository, ("MovieID", "RentedDate"))
+
+    def is_available(self, movie_id, rental_date, due_date):
+        """
+        Checks if a movie is available at every date in a given interval of time
+        :param movie_id: The movie's ID
+        :param rental_date: The date of the rental
+        :param due_date: The due date of the rental
+        :return: False if the movie is not available, otherwise True
+        """
+        rows = self.repository.query("SELECT 1 FROM " + self.repository.table_name + " "
+                                     "WHERE MovieID = ? AND (ReturnedDate IS NULL AND RentedDate < ? OR "
+                                     "RentedDate < ? AND ReturnedDate > ?) "
+                                     "LIMIT 1",
+                                     (movie_id, rental_date.toordinal(), due_date.toordinal(),
+                                      rental_date.toordinal()))
+        return len(rows) == 0
+
+
+class SQLClientBlockedIndex(SQLQueryIndex):
+    def __init__(self, repository):
+        """
+        Creates a new index that finds the date from which every client is blocked with queries on the rentals table
+        :param repository: The SQL query repository of the rentals
+        """
+        super().__init__(repository, ("ClientID", "DueDate"))
+
+    def blocked_since(self, client_id):
+        """
+        Returns the date from which a client is blocked from renting movies
+        :param client_id: The client's ID
+        :return: The earliest due date of a blocking rental of the client, or None if the client is not blocked
+        """
+        rows = self.repository.query("SELECT MIN(DueDate) FROM " + self.repository.table_name + " "
+                                     "WHERE ClientID = ? AND (ReturnedDate IS NULL OR DueDate < ReturnedDate)",
+                                     (client_id,))
+        return date.fromordinal(rows[0][0]) if rows[0][0] is not None else None
+
+
+class SQLRentedDaysIndex(SQLQueryIndex):
+    def __init__(self, repository, column):
+        """
+        Creates a new index that sums up the days for which rentals were kept, grouped by a column of the rentals table
+        :param repository: The SQL query repository of the rentals
+        :param column: The column the rentals are grouped by
+        """
+        super().__init__(repository, (column,))
+        self.__column = column
+
+    def get_rented_days(self, today):
+        """
+        Returns the number of days for which the rentals of every group were kept, with the rentals that were not
+        returned yet counted until a given date
+        :param today: The date until which the rentals that were not returned are counted
+        :return: A dictionary that maps every group to its number of days
+        """
+        rows = self.repository.query("SELECT " + self.__column + ", SUM(COALESCE(ReturnedDate, ?) - RentedDate) "
+                                     "FROM " + self.repository.table_name + " GROUP BY " + self.__column,
+                                     (today.toordinal(),))
+        return dict(rows)
+
+
+class SQLOpenRentalsIndex(SQLQueryIndex):
+    def __init__(self, repository):
+        """
+        Creates a new index that finds the rentals that were not returned yet with queries on the rentals table
+        :param repository: The SQL query repository of the rentals
+        """
+        super().__init__(repository, ("ReturnedDate", "DueDate"))
+
+    def get_due_before(self, day, limit=None):
+        """
+        Returns the rentals that were not returned yet and are due before a given date
+        :param day: The date
+        :param limit: The maximum number of returned rentals, or None to return all of them
+        :return: The list of (due date, rental ID, movie ID) tuples of the rentals, in increasing order of due dates
+        """
+        rows = self.repository.query("SELECT DueDate, ID, MovieID FROM " + self.repository.table_name + " "
+                                     "WHERE ReturnedDate IS NULL AND DueDate < ? "
+                                     "ORDER BY DueDate, ID LIMIT ?",
+                                     (day.toordinal(), limit if limit is not None else -1))
+        return [(date.fromordinal(due_date), rental_id, movie_id) for due_date, rental_id, movie_id in rows]
+
+
+class SQLLateRentalsReportIndex(SQLQueryIndex):
+    def __init__(self, repository):
+        """
+        Creates a new index that lists the overdue rentals together with the titles of their movies, joining the rentals
+        table with the movies table of the same database
+        :param repository: The SQL query repository of the rentals
+        """
+        super().__init__(repository, ("ReturnedDate", "DueDate"))
+
+    def get_due_before(self, day, limit=None):
+        """
+        Returns the rentals that were not returned yet and are due before a given date
+        :param day: The date
+        :param limit: The maximum number of returned rentals, or None to return all of them
+        :return: The list of (due date, rental ID, movie title) tuples of the rentals, in increasing order of due dates
+        """
+        rows = self.repository.query("SELECT rentals.DueDate, rentals.ID, movies.Title "
+                                     "FROM " + self.repository.table_name + " AS rentals "
+                                     "JOIN movies ON movies.ID = rentals.MovieID "
+                                     "WHERE rentals.ReturnedDate IS NULL AND rentals.DueDate < ? "
+                                     "ORDER BY rentals.DueDate, rentals.ID LIMIT ?",
+                                     (day.toordinal(), limit if limit is not None else -1))
+        return [(date.fromordinal(due_date), rental_id, title) for due_date, rental_id, title in rows]
+
+
+class SQLRentedDaysReportIndex(SQLQueryIndex):
+    def __init__(self, repository, column, table_name, name_column):
+        """
+        Creates a new index that ranks the entities of another table of the same database by the days for which their
+        rentals were kept, joining the rentals table with that table
+        :param repository: The SQL query repository of the rentals
+        :param column: The column of the rentals table that references the other table
+        :param table_name: The name of the other table
+        :param name_column: The column of the other table that is listed next to the IDs
+        """
+        super().__init__(repository, (column,))
+        self.__column = column
+        self.__table_name = table_name
+        self.__name_column = name_column
+
+    def get_most_days(self, today, limit=None):
+        """
+        Returns the entities in decreasing order of the days for which their rentals were kept, with the rentals that
+        were not returned yet counted until a given date
+        :param today: The date until which the rentals that were not returned are counted
+        :param limit: The maximum number of returned entities, or None to return all of them
+        :return: The list of (ID, name, number of days) tuples of the entities that have rentals
+        """
+        return self.repository.query("SELECT entities.ID, entities." + self.__name_column + ", "
+                                     "SUM(COALESCE(rentals.ReturnedDate, ?) - rentals.RentedDate) AS Days "
+                                     "FROM " + self.repository.table_name + " AS rentals "
+                                     "JOIN " + self.__table_name + " AS entities "
+                                     "ON entities.ID = rentals." + self.__column + " "
+                                     "GROUP BY entities.ID ORDER BY Days DESC, entities.ID LIMIT ?",
+                                     (today.toordinal(), limit if limit is not None else -1))
@@ -0,0 +1,230 @@
+import sqlite3
+
+from repository.iterabledatastructure import IterableStructure
+from repository.sqlrepository import SQLRepository
+
+
+class SQLQueryRepository(SQLRepository):
+    def __init__(self, validator_class, error_class, data_transfer_class, file_name, table_name, pool_size=1,
+                 group_commit_window=None, pragmas=None, connection_pool=None):
+        """
+        Creates a new SQL repository that keeps no entities in memory, answering every lookup, filter, search and
+        aggregation with a query on the database
+        :param validator_class: The class that is used to validate the repository objects
+        :param error_class: The error class that should be raised if the repository operations are invalid
+        :param data_transfer_class: The object that reads and writes the entities in the database and provides the SQL
+        indexes that replace the secondary indexes
+        :param file_name: The name of the database file
+        :param table_name: The name of the table holding the entities
+        :param pool_size: The maximum number of connections that can be open at the same time
+        :param group_commit_window: The number of seconds for which changes made outside of transactions are gathered
+        before being committed together, or None to commit every change right away
+        :param pragmas: A dictionary that maps the names of SQLite pragmas to the values that are applied to every
+        connection
+        :param connection_pool: A pool shared with the repositories of the other tables of the same database, or None
+        """
+        self.__validator_class = validator_class
+        self.__error_class = error_class
+        self.__query_indexes = {}
+        super().__init__(validator_class, error_class, data_transfer_class, file_name, table_name, pool_size,
+                         group_commit_window, pragmas, connection_pool)
+
+    @property
+    def entities(self):
+        """
+        Reads every entity of the table, in increasing order of their IDs
+        :return: The structure holding the entities
+        """
+        entities = IterableStructure()
+        for entity in self.select_entities():
+            entities.append(entity)
+        return entities
+
+    def add(self, entity):
+        """
+        Validates and adds a new entity to the table
+        :param entity: The entity to be added
+        :return: nothing
+        Raise an error of type __error_class if an entity with the same ID as the given entity already exists
+        """
+        self.__validator_class.validate(entity)
+        if self.contains(entity.id):
+            raise self.__error_class("The ID already exists!")
+        self._write(self.data_transfer_class.add, entity)
+
+    def add_all(self, entities):
+        """
+        Validates and adds many entities to the table at once
+        :param entities: The entities to be added
+        :return: nothing
+        Raise an error of type __error_class if two of the entities, or one of them and a stored entity, have the same
+        ID, in which case none of the entities is added
+        """
+        entities = list(entities)
+        entity_ids = set()
+        for entity in entities:
+            self.__validator_class.validate(entity)
+            if entity.id in entity_ids or self.contains(entity.id):
+                raise self.__error_class("The ID already exists!")
+            entity_ids.add(entity.id)
+        self._write(self.__add_rows, entities)
+
+    def remove(self, entity_id):
+        """
+        Removes the entity with a given ID from the table
+        :param entity_id: The ID of the entity
+        :return: The removed entity
+        Raise an error of type __error_class if an entity with the given ID does not exist
+        """
+        removed_entity = self.get_entity_at_id(entity_id)
+        self._write(self.data_transfer_class.remove, entity_id)
+        return removed_entity
+
+    def update(self, entity):
+        """
+        Validates and updates an entity from the table
+        :param entity: The updated form of the entity
+        :return: The old form of the entity
+        Raise an error of type __error_class if an entity with the same ID as the given entity does not exist
+        """
+        self.__validator_class.validate(entity)
+        old_entity = self.get_entity_at_id(entity.id)
+        self._write(self.data_transfer_class.update, entity)
+        return old_entity
+
+    def get_current_ids(self):
+        """
+        Returns the list of current IDs from the table
+        :return: The list of current IDs, in increasing order
+        """
+        return [row[0] for row in self.query("SELECT ID FROM " + self.table_name + " ORDER BY ID")]
+
+    def contains(self, entity_id):
+        """
+        Checks if an entity with a given ID exists in the table
+        :param entity_id: The ID of the entity
+        :return: True if the entity exists, otherwise False
+        """
+        try:
+            return len(self.query("SELECT 1 FROM " + self.table_name + " WHERE ID = ?", (entity_id,))) > 0
+        except (sqlite3.InterfaceError, sqlite3.ProgrammingError):
+            return False
+
+    def get_entity_at_id(self, entity_id):
+        """
+        Reads the entity with a specific ID from the table
+        :param entity_id: The ID of the entity
+        :return: The entity at the specified ID
+        Raise an error of type __error_class if an entity with the specified ID does not exist
+        """
+        try:
+            entities = self.select_entities("ID = ?", (entity_id,))
+        except (sqlite3.InterfaceError, sqlite3.ProgrammingError):
+            entities = []
+        if len(entities) == 0:
+            raise self.__error_class("The ID doesn't exist!")
+        return entities[0]
+
+    def register_index(self, index_name, index):
+        """
+        Declares a secondary index over the entities of the repository, which is replaced by the SQL index that the
+        data transfer class provides under the same name; the table gets a database index on the columns it queries
+        :param index_name: The name of the index
+        :param index: The in-memory index, which is not used
+        :return: nothing
+        Raise an error of type __error_class if the index cannot be answered by queries
+        If an index with the given name already exists, it is kept as it is
+        """
+        if not self.__add_query_index(index_name):
+            raise self.__error_class("The index cannot be answered by SQL queries!")
+
+    def has_index(self, index_name):
+        """
+        Checks if the repository has a given secondary index, declaring it if the data transfer class provides an SQL
+        index with the given name
+        :param index_name: The name of the index
+        :return: True if the index exists, otherwise False
+        """
+        return self.__add_query_index(index_name)
+
+    def get_index(self, index_name):
+        """
+        Returns a secondary index of the repository
+        :param index_name: The name of the index
+        :return: The SQL index with the given name
+        Raise an error of type __error_class if the index does not exist
+        """
+        if index_name not in self.__query_indexes:
+            raise self.__error_class("The index doesn't exist!")
+        return self.__query_indexes[index_name]
+
+    def remove_by_index(self, index_name, value):
+        """
+        Removes the entities that have a given value in a key index, with a single statement
+        :param index_name: The name of the index
+        :param value: The indexed value
+        :return: The list of removed entities, in increasing order of their IDs
+        Raise an error of type __error_class if the index does not exist
+        """
+        index = self.get_index(index_name)
+        removed_entities = index.find(value)
+        if len(removed_entities) > 0:
+            self._write(index.delete, value)
+        return removed_entities
+
+    def query(self, statement, parameters=()):
+        """
+        Runs a query through the connection of the current thread, which also sees the uncommitted changes of the thread
+        :param statement: The SQL statement
+        :param parameters: The values of the parameters of the statement
+        :return: The list of rows returned by the query
+        """
+        return self.connection_pool.get_connection().execute(statement, parameters).fetchall()
+
+    def select_entities(self, condition=None, parameters=()):
+        """
+        Reads the entities of the table that satisfy a condition
+        :param condition: The SQL condition of the WHERE clause, or None to read every entity
+        :param parameters: The values of the parameters of the condition
+        :return: The list of entities, in increasing order of their IDs
+        """
+        statement = "SELECT * FROM " + self.table_name
+        if condition is not None:
+            statement += " WHERE " + condition
+        return [self.data_transfer_class.read_from_line(row) for row in self.query(statement + " ORDER BY ID",
+                                                                                      parameters)]
+
+    def _load(self):
+        """
+        Keeps the entities in the database; nothing is loaded into memory
+        :return: nothing
+        """
+        pass
+
+    def __add_rows(self, entities, connection):
+        """
+        Inserts the rows of many entities through a connection
+        :param entities: The entities
+        :param connection: The connection
+        :return: nothing
+        """
+        for entity in entities:
+            self.data_transfer_class.add(entity, connection)
+
+    def __add_query_index(self, index_name):
+        """
+        Declares the SQL index that the data transfer class provides under a given name, creating a database index on
+        the columns it queries
+        :param index_name: The name of the index
+        :return: True if the index exists, otherwise False
+        """
+        if index_name in self.__query_indexes:
+            return True
+        query_index = self.data_transfer_class.get_query_index(index_name, self)
+        if query_index is None:
+            return False
+        if len(query_index.columns) > 0:
+            self.query("CREATE INDEX IF NOT EXISTS " + "_".join((self.table_name,) + query_index.columns) + " ON " +
+                       self.table_name + "(" + ", ".join(query_index.columns) + ")")
+        self.__query_indexes[index_name] = query_index
+        return True
@@ -1,15 +1,58 @@
 import sqlite3
+import threading
 
 from repository.repo import Repository
+from repository.sqlconnectionpool import SQLConnectionPool
+from repository.sqlschemamigrator import SQLSchemaMigrator
 
 
 class SQLRepository(Repository):
-    def __init__(self, validator_class, error_class, data_transfer_class, file_name, table_name):
+    LOAD_BATCH_SIZE = 10000
+
+    def __init__(self, validator_class, error_class, data_transfer_class, file_name, table_name, pool_size=1,
+                 group_commit_window=None, pragmas=None, connection_pool=None):
+        """
+        Creates a new SQL repository
+        :param validator_class: The class that is used to validate the repository objects
+        :param error_class: The error class that should be raised if the repository operations are invalid
+        :param data_transfer_class: The object that reads and writes the entities in the database
+        :param file_name: The name of the database file
+        :param table_name: The name of the table holding the entities
+        :param pool_size: The maximum number of connections that can be open at the same time
+        :param group_commit_window: The number of seconds for which changes made outside of transactions are gathered
+        before being committed together, or None to commit every change right away
+        :param pragmas: A dictionary that maps the names of SQLite pragmas to the values that are applied to every
+        connection, such as journal_mode, synchronous, mmap_size, cache_size and page_size
+        :param connection_pool: A pool shared with the repositories of the other tables of the same database, which is
+        used instead of opening a new pool for the file and is not closed by the repository, or None
+        The table is created, or migrated to the latest schema version of the data transfer class, before being loaded
+        """
         super().__init__(validator_class, error_class)
-        self.__file_name = file_name
+        self.__owns_connection_pool = connection_pool is None
+        if connection_pool is None:
+            connection_pool = SQLConnectionPool(file_name, pool_size, pragmas=pragmas)
+        self.__connection_pool = connection_pool
         self.__data_transfer_class = data_transfer_class
         self.__table_name = table_name
-        self.__load()
+        self.__group_commit_window = group_commit_window
+        self.__commit_lock = threading.RLock()
+        self.__pending_connections = set()
+        self.__group_commit_timer = None
+        SQLSchemaMigrator(self.__connection_pool.get_connection()).migrate(table_name,
+                                                                           data_transfer_class.get_schema_migrations())
+        self._load()
+
+    @property
+    def connection_pool(self):
+        return self.__connection_pool
+
+    @property
+    def data_transfer_class(self):
+        return self.__data_transfer_class
+
+    @property
+    def table_name(self):
+        return self.__table_name
 
     def add(self, entity):
         """
@@ -18,7 +61,17 @@ class SQLRepository(Repository):
         :return: nothing
         """
         super().add(entity)
-        self.__data_transfer_class.add(entity, self.__file_name)
+        self._write(self.__data_transfer_class.add, entity)
+
+    def add_all(self, entities):
+        """
+        Adds many entities to the SQL repository at once
+        :param entities: The entities that will be added to the repo
+        :return: nothing
+        """
+        entities = list(entities)
+        super().add_all(entities)
+        self._write(self.__add_rows, entities)
 
     def remove(self, entity_id):
         """
@@ -27,7 +80,7 @@ class SQLRepository(Repository):
         :return: The removed entity
         """
         removed_entity = super().remove(entity_id)
-        self.__data_transfer_class.remove(entity_id, self.__file_name)
+        self._write(self.__data_transfer_class.remove, entity_id)
         return removed_entity
 
     def update(self, entity):
@@ -37,16 +90,130 @@ class SQLRepository(Repository):
         :return: The old form of the entity
         """
         updated_entity = super().update(entity)
-        self.__data_transfer_class.update(entity, self.__file_name)
+        self._write(self.__data_transfer_class.update, entity)
         return updated_entity
 
-    def __load(self):
+    def flush(self):
+        """
+        Commits the changes that are waiting for a group commit
+        :return: nothing
+        """
+        with self.__commit_lock:
+            if self.__group_commit_timer is not None:
+                self.__group_commit_timer.cancel()
+                self.__group_commit_timer = None
+            for connection in self.__pending_connections:
+                connection.commit()
+            self.__pending_connections.clear()
+
+    def close(self):
+        """
+        Commits the pending changes and closes the connections of the SQL repository, unless they are shared with other
+        repositories
+        :return: nothing
+        """
+        self.flush()
+        if self.__owns_connection_pool:
+            self.__connection_pool.close()
+
+    def _begin_transaction(self):
+        """
+        Commits the changes waiting for a group commit, so that they are not part of the new transaction
+        :return: nothing
+        """
+        self.flush()
+        self.__connection_pool.begin_transaction()
+
+    def _commit_transaction(self):
+        """
+        Commits the changes of a transaction to the database, in a single database transaction; transactions of
+        repositories that share the connection pool are committed together, when the last of them ends, and the changes
+        of the others are undone in memory if that commit fails
+        :return: nothing
+        Raise sqlite3.Error if the commit fails, for example because of a deferred foreign key, after rolling the
+        database transaction back
+        """
+        with self.__commit_lock:
+            if self.__connection_pool.transaction_depth > 1:
+                self.__connection_pool.end_transaction(self._detach_undo_log())
+                return
+            connection = self.__connection_pool.get_connection()
+            try:
+                connection.commit()
+            except sqlite3.Error:
+                connection.rollback()
+                raise
+            self.__connection_pool.end_transaction()
+            self.__connection_pool.pop_undo_functions()
+
+    def _rollback_transaction(self):
+        """
+        Rolls back the changes of a failed transaction from the database; if no other transaction of the repositories
+        that share the connection pool is still running, the changes of the transactions that joined it are undone in
+        memory as well
+        :return: nothing
+        """
+        with self.__commit_lock:
+            last_transaction = self.__connection_pool.end_transaction()
+            self.__connection_pool.get_connection().rollback()
+            if last_transaction:
+                for undo_function in reversed(self.__connection_pool.pop_undo_functions()):
+                    undo_function()
+
+    def _write(self, operation, argument):
+        """
+        Writes a change to the database through the connection of the current thread and commits it, unless it is part
+        of a transaction or of a group commit
+        :param operation: The data access method that writes the change, taking the argument and a connection
+        :param argument: The entity or the ID of the entity that is changed
+        :return: nothing
+        """
+        with self.__commit_lock:
+            connection = self.__connection_pool.get_connection()
+            operation(argument, connection)
+            self.__commit_change(connection)
+
+    def __add_rows(self, entities, connection):
+        """
+        Inserts the rows of many entities through a connection
+        :param entities: The entities
+        :param connection: The connection
+        :return: nothing
+        """
+        for entity in entities:
+            self.__data_transfer_class.add(entity, connection)
+
+    def __commit_change(self, connection):
+        """
+        Commits a change made through a connection, unless it is part of a transaction or of a group commit
+        :param connection: The connection
+        :return: nothing
+        Raise sqlite3.Error if the commit fails, for example because of a foreign key, after rolling the change back
+        """
+        if self.__connection_pool.in_transaction:
+            return
+        if self.__group_commit_window is None:
+            try:
+                connection.commit()
+            except sqlite3.Error:
+                connection.rollback()
+                raise
+            return
+        self.__pending_connections.add(connection)
+        if self.__group_commit_timer is None:
+            self.__group_commit_timer = threading.Timer(self.__group_commit_window, self.flush)
+            self.__group_commit_timer.daemon = True
+            self.__group_commit_timer.start()
+
+    def _load(self):
         """
-        Loads the entities located in the associated SQL file into the repository
+        Loads the entities located in the associated SQL file into the repository, reading the rows in batches and
+        adding all of the entities at once
         :return: nothing
         """
-        connection = sqlite3.connect(self.__file_name)
-        cursor = connection.cursor()
-        for elem in cursor.execute("SELECT * from " + self.__table_name):
-            super().add(self.__data_transfer_class.read_from_line(elem))
-        connection.close()
+        cursor = self.__connection_pool.get_connection().execute("SELECT * FROM " + self.__table_name + " ORDER BY ID")
+        read_from_line = self.__data_transfer_class.read_from_line
+        entities = []
+        for rows in iter(lambda: cursor.fetchmany(self.LOAD_BATCH_SIZE), []):
+            entities.extend(map(read_from_line, rows))
+        super().add_all(entities)
@@ -0,0 +1,41 @@
+class SQLSchemaMigrator:
+    def __init__(self, connection):
+        """
+        Creates a new migrator that brings the tables of an SQLite database to their latest schema version, keeping the
+        version of every table in the schema_versions table
+        :param connection: The connection to the database
+        """
+        self.__connection = connection
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS schema_versions "
+                                  "(TableName text PRIMARY KEY, Version integer NOT NULL)")
+        self.__connection.commit()
+
+    def get_version(self, table_name):
+        """
+        Returns the schema version of a table
+        :param table_name: The name of the table
+        :return: The number of migrations applied to the table, 0 if none were applied
+        """
+        row = self.__connection.execute("SELECT Version FROM schema_versions WHERE TableName = ?",
+                                        (table_name,)).fetchone()
+        return row[0] if row is not None else 0
+
+    def migrate(self, table_name, migrations):
+        """
+        Applies to a table the migrations that were not applied yet, every migration in its own transaction
+        :param table_name: The name of the table
+        :param migrations: The list of migrations of the table, in order, each being a list of SQL statements; the
+        schema version of the table is the number of migrations applied to it
+        :return: nothing
+        Raise sqlite3.Error if a migration fails, in which case the table is left at the version before it
+        """
+        for version in range(self.get_version(table_name) + 1, len(migrations) + 1):
+            try:
+                self.__connection.execute("BEGIN")
+                for statement in migrations[version - 1]:
+                    self.__connection.execute(statement)
+                self.__connection.execute("INSERT OR REPLACE INTO schema_versions VALUES(?, ?)", (table_name, version))
+                self.__connection.commit()
+            except BaseException:
+                self.__connection.rollback()
+                raise
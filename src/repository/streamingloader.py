@@ -0,0 +1,128 @@
+import json
+import pickle
+from itertools import islice
+
+
+class StreamingLoader:
+    def __init__(self, chunk_size=10000, progress_callback=None):
+        """
+        Creates a new loader that adds the records of a file to a repository in chunks, so that only one chunk of
+        records is parsed at a time
+        :param chunk_size: The number of records in a chunk
+        :param progress_callback: A function that takes the name of the loaded file and the number of entities loaded
+        so far, called after every chunk, or None
+        """
+        self.__chunk_size = chunk_size
+        self.__progress_callback = progress_callback
+
+    @property
+    def chunk_size(self):
+        return self.__chunk_size
+
+    def load(self, file_name, records, read_record, add_all):
+        """
+        Builds the entities of a stream of records and adds them to a repository, one chunk at a time
+        :param file_name: The name of the file the records are read from, which is reported with the progress
+        :param records: An iterable of records
+        :param read_record: The function that takes a record and returns its entity
+        :param add_all: The function that takes a list of entities and adds them to the repository
+        :return: The number of loaded entities
+        """
+        loaded_count = 0
+        for chunk in self.chunks(records, self.__chunk_size):
+            add_all([read_record(record) for record in chunk])
+            loaded_count += len(chunk)
+            if self.__progress_callback is not None:
+                self.__progress_callback(file_name, loaded_count)
+        return loaded_count
+
+    @staticmethod
+    def chunks(records, chunk_size):
+        """
+        Splits a stream of records into lists of consecutive records
+        :param records: An iterable of records
+        :param chunk_size: The maximum number of records in a list
+        :return: A generator of non-empty lists of records
+        """
+        records = iter(records)
+        chunk = list(islice(records, chunk_size))
+        while len(chunk) > 0:
+            yield chunk
+            chunk = list(islice(records, chunk_size))
+
+    @staticmethod
+    def read_json_values(file, buffer_size=65536):
+        """
+        Parses the values of the top-level object or array of a JSON file one at a time, reading the file in pieces
+        :param file: The File object of the JSON file, open for reading in text mode
+        :param buffer_size: The number of characters read at a time
+        :return: A generator of the values of the object, or of the elements of the array
+        Raise ValueError if the file is not a JSON object or array
+        """
+        decoder = json.JSONDecoder()
+        buffer = ""
+        position = 0
+        end_of_file = False
+
+        def next_character():
+            nonlocal buffer, position, end_of_file
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer) or end_of_file:
+                    return buffer[position] if position < len(buffer) else ""
+                buffer, position = file.read(buffer_size), 0
+                end_of_file = buffer == ""
+
+        def decode_value():
+            nonlocal buffer, position, end_of_file
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                    if end < len(buffer) or end_of_file:
+                        position = end
+                        return value
+                except ValueError:
+                    if end_of_file:
+                        raise
+                piece = file.read(buffer_size)
+                end_of_file = piece == ""
+                buffer, position = buffer[position:] + piece, 0
+
+        opening = next_character()
+        if opening not in ("{", "["):
+            raise ValueError("The file does not hold a JSON object or array!")
+        closing = "}" if opening == "{" else "]"
+        position += 1
+        while True:
+            character = next_character()
+            if character == closing:
+                return
+            if character == ",":
+                position += 1
+                continue
+            if character == "":
+                raise ValueError("The JSON file ends too early!")
+            if opening == "{":
+                decode_value()
+                if next_character() != ":":
+                    raise ValueError("Expected a colon after a key of the JSON object!")
+                position += 1
+                next_character()
+            yield decode_value()
+            buffer, position = buffer[position:], 0
+
+    @staticmethod
+    def read_pickle_records(file):
+        """
+        Unpickles the entities of a binary file written as consecutive pickled lists of entities; a file holding a
+        single pickled dictionary or list of entities is read as one chunk
+        :param file: The File object of the binary file, open for reading
+        :return: A generator of the entities
+        """
+        while True:
+            try:
+                chunk = pickle.load(file)
+            except EOFError:
+                return
+            yield from chunk.values() if isinstance(chunk, dict) else chunk
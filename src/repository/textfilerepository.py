@@ -1,12 +1,50 @@
+import io
+import os
+
 from repository.repo import Repository
+from repository.snapshotwriter import SnapshotWriter
+from repository.streamingloader import StreamingLoader
+from repository.writebehindflusher import WriteBehindFlusher
 
 
 class TextFileRepository(Repository):
-    def __init__(self, validator_class, error_class, data_access_class, file_name):
+    def __init__(self, validator_class, error_class, data_access_class, file_name, journaled=False,
+                 compaction_threshold=1000, loader=None, flush_interval=None, flush_threshold=100, checksum=False):
+        """
+        Creates a new text file repository
+        :param validator_class: The class that is used to validate the repository objects
+        :param error_class: The error class that should be raised if the repository operations are invalid
+        :param data_access_class: The object that reads and writes the entities in the text file
+        :param file_name: The name of the text file
+        :param journaled: True if every change should be appended to a journal next to the text file, which is
+        compacted into the text file from time to time, otherwise False to rewrite the text file on every change
+        :param compaction_threshold: The number of journal records after which the journal is compacted
+        :param loader: The streaming loader that loads the text file in chunks, or None to use a default one
+        :param flush_interval: The number of seconds between two rewrites of the text file by a background flusher, or
+        None to rewrite the file on every change; a journaled repository appends every change to its journal at once
+        :param flush_threshold: The number of unsaved changes after which the background flusher saves them right away
+        :param checksum: True to save a checksum with every snapshot of the text file and verify it on load
+        """
         super().__init__(validator_class, error_class)
         self.__data_access_class = data_access_class
         self.__file_name = file_name
+        self.__journal_file_name = file_name + ".journal"
+        self.__journaled = journaled
+        self.__compaction_threshold = compaction_threshold
+        self.__journal = None
+        self.__journal_length = 0
+        self.__pending_records = []
+        self.__loader = loader if loader is not None else StreamingLoader()
+        self.__checksum = checksum
         self.__load()
+        self.__flusher = WriteBehindFlusher(self.__save_all_to_file, None if journaled else flush_interval,
+                                            flush_threshold)
+        if self.__journaled:
+            self.__journal = open(self.__journal_file_name, "at")
+
+    @property
+    def journal_file_name(self):
+        return self.__journal_file_name
 
     def add(self, entity):
         """
@@ -14,10 +52,9 @@ class TextFileRepository(Repository):
         :param entity: The entity that will be added to the repo
         :return: nothing
         """
-        super().add(entity)
-        with open(self.__file_name, "wt") as f:
-            for entity in self.entities:
-                self.__save_to_file(f, self.entities[entity])
+        with self.__flusher.lock:
+            super().add(entity)
+            self.__save_change("P", entity)
 
     def remove(self, entity_id):
         """
@@ -25,11 +62,11 @@ class TextFileRepository(Repository):
         :param entity_id: The ID of the entity to be removed
         :return: The removed entity
         """
-        removed_entity = super().remove(entity_id)
-        with open(self.__file_name, "wt") as f:
-            for entity in self.entities:
-                self.__save_to_file(f, self.entities[entity])
-        return removed_entity
+        with self.__flusher.lock:
+            removed_entity = super().remove(entity_id)
+            if removed_entity is not None:
+                self.__save_change("D", entity_id)
+            return removed_entity
 
     def update(self, entity):
         """
@@ -37,21 +74,166 @@ class TextFileRepository(Repository):
         :param entity: The updated form of the entity
         :return: The old form of the entity
         """
-        old_entity = super().update(entity)
-        with open(self.__file_name, "wt") as f:
-            for entity in self.entities:
-                self.__save_to_file(f, self.entities[entity])
-        return old_entity
+        with self.__flusher.lock:
+            old_entity = super().update(entity)
+            if old_entity is not None:
+                self.__save_change("P", entity)
+            return old_entity
+
+    def flush(self):
+        """
+        Rewrites the text file with the changes that the background flusher has not saved yet, and writes the
+        buffered journal records to the operating system
+        :return: nothing
+        """
+        self.__flusher.flush()
+        if self.__journal is not None:
+            self.__journal.flush()
+
+    def close(self):
+        """
+        Stops the background flusher and saves the changes it has not saved yet, or compacts the journal into the text
+        file and closes it
+        :return: nothing
+        """
+        self.__flusher.close()
+        if self.__journal is not None:
+            if self.__journal_length > 0:
+                self.compact()
+            self.__journal.close()
+            self.__journal = None
+
+    def compact(self):
+        """
+        Writes the entities of the repository to a new snapshot of the text file, which atomically replaces the old
+        one, and empties the journal
+        :return: nothing
+        If the program stops before the journal is emptied, replaying it over the new text file gives the same entities
+        """
+        self.__save_all_to_file()
+        self.__journal.truncate(0)
+        self.__journal_length = 0
+
+    def _begin_transaction(self):
+        """
+        Holds the lock of the flusher until the transaction ends, so that no half done transaction is saved
+        :return: nothing
+        """
+        self.__flusher.lock.acquire()
+
+    def _commit_transaction(self):
+        """
+        Saves the changes of a transaction to the text file all at once, or appends them to the journal as one group
+        :return: nothing
+        """
+        if self.__journaled:
+            self.__append_to_journal(self.__pending_records)
+            self.__pending_records = []
+        else:
+            self.__flusher.mark_dirty()
+        self.__flusher.lock.release()
+
+    def _rollback_transaction(self):
+        """
+        Discards the journal records of a transaction that failed and releases the lock of the flusher
+        :return: nothing
+        """
+        self.__pending_records = []
+        self.__flusher.lock.release()
+
+    def __save_change(self, operation, value):
+        """
+        Saves a change of the repository, unless it is part of a transaction, which saves its changes when it commits
+        :param operation: "P" if an entity was added or updated, "D" if it was removed
+        :param value: The added or updated entity, or the ID of the removed entity
+        :return: nothing
+        """
+        if self.__journaled and self.in_transaction:
+            self.__pending_records.append((operation, value))
+        elif self.__journaled:
+            self.__append_to_journal([(operation, value)])
+        elif not self.in_transaction:
+            self.__flusher.mark_dirty()
+
+    def __append_to_journal(self, records):
+        """
+        Appends a group of records to the journal, followed by the line that marks the group as complete, and compacts
+        the journal if it grew too long
+        :param records: The list of (operation, value) records
+        :return: nothing
+        """
+        if len(records) == 0:
+            return
+        group = io.StringIO()
+        for operation, value in records:
+            if operation == "P":
+                group.write("P;")
+                self.__save_to_file(group, value)
+            else:
+                group.write("D;" + str(value) + "\n")
+        group.write("C\n")
+        self.__journal.write(group.getvalue())
+        self.__journal.flush()
+        self.__journal_length += len(records)
+        if self.__journal_length >= self.__compaction_threshold:
+            self.compact()
 
     def __load(self):
         """
-        Loads the entities located in the associated text file into the repository
+        Loads the entities located in the associated text file into the repository, one chunk of lines at a time, then
+        replays the complete groups of records of the journal, if the repository is journaled; a last group without its
+        commit line, which was not fully written, is cut from the journal
         :return: nothing
+        Raise ValueError if the text file does not match its checksum
         """
+        if self.__checksum:
+            SnapshotWriter.verify(self.__file_name)
         with open(self.__file_name, "rt") as f:
+            self.__loader.load(self.__file_name, f, self.__data_access_class.read_from, super().add_all)
+        if not self.__journaled or not os.path.exists(self.__journal_file_name):
+            return
+        group = []
+        position = 0
+        committed_end = 0
+        with open(self.__journal_file_name, "r+b") as f:
             for line in f:
-                new_entity = self.__data_access_class.read_from(line)
-                super().add(new_entity)
+                if not line.endswith(b"\n"):
+                    break
+                position += len(line)
+                line = line.decode()
+                if line == "C\n":
+                    self.__replay(group)
+                    self.__journal_length += len(group)
+                    group = []
+                    committed_end = position
+                else:
+                    group.append(line)
+            f.truncate(committed_end)
+
+    def __replay(self, group):
+        """
+        Applies a complete group of journal records to the entities in memory; applying a group twice has no effect
+        :param group: The lines of the records
+        :return: nothing
+        """
+        for line in group:
+            if line.startswith("P;"):
+                entity = self.__data_access_class.read_from(line[2:])
+                if self.contains(entity.id):
+                    super().update(entity)
+                else:
+                    super().add(entity)
+            elif self.contains(int(line[2:])):
+                super().remove(int(line[2:]))
+
+    def __save_all_to_file(self):
+        """
+        Writes the entities located in the current repository to a new snapshot of the associated text file
+        :return: nothing
+        """
+        with SnapshotWriter(self.__file_name, checksum=self.__checksum) as f:
+            for entity in self.entities:
+                self.__save_to_file(f, entity)
 
     def __save_to_file(self, file, entity):
         """
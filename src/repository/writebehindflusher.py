@@ -0,0 +1,86 @@
+import threading
+
+
+class WriteBehindFlusher:
+    def __init__(self, save_function, flush_interval=None, flush_threshold=100):
+        """
+        Creates a new flusher that persists the state of a repository after it changes
+        Without a flush interval, the state is saved as soon as it changes. Otherwise, the changes only mark the state
+        as dirty, and a background thread saves it once per flush interval, or as soon as the number of unsaved
+        changes reaches the flush threshold, so that many changes are persisted by a single save
+        The repository has to change its state while holding the lock of the flusher, so that the background thread
+        never saves a state that is half changed
+        :param save_function: The function that saves the whole state of the repository
+        :param flush_interval: The number of seconds between two background saves, or None to save every change at once
+        :param flush_threshold: The number of unsaved changes after which the background thread saves them right away
+        """
+        self.__save_function = save_function
+        self.__flush_interval = flush_interval
+        self.__flush_threshold = flush_threshold
+        self.__lock = threading.RLock()
+        self.__condition = threading.Condition(self.__lock)
+        self.__dirty_count = 0
+        self.__closed = False
+        self.__thread = None
+        if flush_interval is not None:
+            self.__thread = threading.Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+
+    @property
+    def lock(self):
+        return self.__lock
+
+    @property
+    def dirty_count(self):
+        return self.__dirty_count
+
+    def mark_dirty(self):
+        """
+        Records a change of the state, saving it at once if the flusher has no flush interval
+        :return: nothing
+        """
+        with self.__lock:
+            self.__dirty_count += 1
+            if self.__thread is None:
+                self.flush()
+            elif self.__dirty_count >= self.__flush_threshold:
+                self.__condition.notify()
+
+    def flush(self):
+        """
+        Saves the state if it has unsaved changes
+        :return: nothing
+        """
+        with self.__lock:
+            if self.__dirty_count > 0:
+                self.__save_function()
+                self.__dirty_count = 0
+
+    def close(self):
+        """
+        Stops the background thread and saves the unsaved changes
+        :return: nothing
+        """
+        with self.__lock:
+            self.__closed = True
+            self.__condition.notify()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.flush()
+
+    def __run(self):
+        """
+        Saves the unsaved changes once per flush interval, or when their number reaches the flush threshold, until the
+        flusher is closed; the changes of a failed save stay unsaved, so the save is retried by the next interval, or by
+        the next flush, which raises its error
+        :return: nothing
+        """
+        with self.__lock:
+            while not self.__closed:
+                self.__condition.wait(self.__flush_interval)
+                if not self.__closed:
+                    try:
+                        self.flush()
+                    except Exception:
+                        pass
@@ -1,6 +1,7 @@
 from random import choice
 
 from domain.validators import ClientException
+from repository.indexes import IDSubstringIndex, SubstringIndex
 from repository.iterabledatastructure import IterableStructure
 from src.domain.client import Client
 
@@ -13,7 +14,11 @@ class ClientService:
         :param rental_repository: The rental repository
         """
         self.__client_repository = client_repository
+        self.__client_repository.register_index("search_id", IDSubstringIndex(client_repository))
+        self.__client_repository.register_index("search_name",
+                                                SubstringIndex(client_repository, lambda client: client.name))
         self.__rental_repository = rental_repository
+        self.__rental_repository.add_index("client_id", lambda rental: rental.client_id)
 
     @property
     def client_repository(self):
@@ -29,7 +34,7 @@ class ClientService:
         :param client_id: The client's id
         :return: The list of all of the client's rentals
         """
-        return IterableStructure.filter(self.rental_repository.entities, lambda x: x.client_id == client_id)
+        return self.rental_repository.get_entities_by_index("client_id", client_id)
 
     def add(self, client_id, name):
         """
@@ -42,26 +47,26 @@ class ClientService:
 
     def add_client_and_rentals(self, client_id, name, rentals):
         """
-        Adds a client and some of his rentals to the repositories
+        Adds a client and some of his rentals to the repositories, in a single transaction
         :param client_id: The client's ID
         :param name: The client's name
         :param rentals: The client's rentals
         :return: nothing
         """
-        self.add(client_id, name)
-        for rental in rentals:
-            self.rental_repository.add(rental)
+        with self.client_repository.transaction(), self.rental_repository.transaction():
+            self.add(client_id, name)
+            for rental in rentals:
+                self.rental_repository.add(rental)
 
     def remove(self, client_id):
         """
-        Removes a client from the repository and all the client's rentals
+        Removes a client from the repository and all the client's rentals, in a single transaction
         :param client_id: The ID of the client to be removed
         :return: A tuple containing the removed client's attributes and a list of the removed rentals
         """
-        removed_client = self.client_repository.remove(client_id)
-        removed_rentals = self.get_all_rentals_for_client(client_id)
-        for rental in removed_rentals:
-            self.rental_repository.remove(rental.id)
+        with self.client_repository.transaction(), self.rental_repository.transaction():
+            removed_client = self.client_repository.remove(client_id)
+            removed_rentals = self.rental_repository.remove_by_index("client_id", client_id)
         return removed_client.id, removed_client.name, removed_rentals
 
     def update(self, client_id, new_name):
@@ -89,12 +94,12 @@ class ClientService:
         :return: The list of clients with attributes contain the given string
         """
         attribute_list = ["id", "name"]
-        found_clients_list = []
+        found_clients = {}
         for attribute in attribute_list:
-            clients_with_attribute = self.search_for_clients_by_attribute(searching_string, attribute)
-            found_clients_list += IterableStructure.filter(clients_with_attribute,
-                                                           lambda x: x not in found_clients_list)
-        IterableStructure.sort(found_clients_list, lambda x, y: x.id < y.id)
+            for client in self.search_for_clients_by_attribute(searching_string, attribute):
+                found_clients[client.id] = client
+        found_clients_list = list(found_clients.values())
+        IterableStructure.sort(found_clients_list, key=lambda x: x.id)
         return found_clients_list
 
     def search_for_clients_by_attribute(self, searching_string, attribute):
@@ -107,8 +112,7 @@ class ClientService:
         """
         if attribute not in ["id", "name"]:
             raise ClientException("Invalid attribute!")
-        return IterableStructure.filter(self.get_current_list(),
-                                        lambda x: searching_string in str(eval("x."+attribute)).lower())
+        return self.client_repository.get_entities_by_index("search_" + attribute, searching_string)
 
     def generate_starting_clients(self):
         """
@@ -1,6 +1,7 @@
 from random import choice
 
 from domain.validators import MovieException
+from repository.indexes import IDSubstringIndex, SubstringIndex
 from repository.iterabledatastructure import IterableStructure
 from src.domain.movie import Movie
 
@@ -13,7 +14,15 @@ class MovieService:
         :param rental_repository: The rental repository
         """
         self.__movie_repository = movie_repository
+        self.__movie_repository.register_index("search_id", IDSubstringIndex(movie_repository))
+        self.__movie_repository.register_index("search_title",
+                                               SubstringIndex(movie_repository, lambda movie: movie.title))
+        self.__movie_repository.register_index("search_description",
+                                               SubstringIndex(movie_repository, lambda movie: movie.description))
+        self.__movie_repository.register_index("search_genre",
+                                               SubstringIndex(movie_repository, lambda movie: movie.genre))
         self.__rental_repository = rental_repository
+        self.__rental_repository.add_index("movie_id", lambda rental: rental.movie_id)
 
     @property
     def movie_repository(self):
@@ -36,7 +45,7 @@ class MovieService:
 
     def add_movie_and_rentals(self, movie_id, title, description, genre, rentals):
         """
-        Adds a movie and some of its rentals to the repositories
+        Adds a movie and some of its rentals to the repositories, in a single transaction
         :param movie_id: The movie's ID
         :param title: The movie's title
         :param description: The movie's description
@@ -44,9 +53,10 @@ class MovieService:
         :param rentals: The movie's rentals
         :return: nothing
         """
-        self.add(movie_id, title, description, genre)
-        for rental in rentals:
-            self.rental_repository.add(rental)
+        with self.movie_repository.transaction(), self.rental_repository.transaction():
+            self.add(movie_id, title, description, genre)
+            for rental in rentals:
+                self.rental_repository.add(rental)
 
     def get_all_rentals_for_movie(self, movie_id):
         """
@@ -54,18 +64,17 @@ class MovieService:
         :param movie_id: The movie's id
         :return: The list of all of the movie's rentals
         """
-        return IterableStructure.filter(self.rental_repository.entities, lambda x: x.movie_id == movie_id)
+        return self.rental_repository.get_entities_by_index("movie_id", movie_id)
 
     def remove(self, movie_id):
         """
-        Removes a movie from the repository and all it's rentals
+        Removes a movie from the repository and all it's rentals, in a single transaction
         :param movie_id: The ID of the movie to be removed
         :return: A tuple containing the removed movie's attributes and the list of removed rentals
         """
-        removed_movie = self.movie_repository.remove(movie_id)
-        removed_rentals = self.get_all_rentals_for_movie(movie_id)
-        for rental in removed_rentals:
-            self.rental_repository.remove(rental.id)
+        with self.movie_repository.transaction(), self.rental_repository.transaction():
+            removed_movie = self.movie_repository.remove(movie_id)
+            removed_rentals = self.rental_repository.remove_by_index("movie_id", movie_id)
         return removed_movie.id, removed_movie.title, removed_movie.description, removed_movie.genre, removed_rentals
 
     def update(self, movie_id, new_title, new_description, new_genre):
@@ -95,12 +104,12 @@ class MovieService:
         :return: The list of movies with attributes containing a given string
         """
         attribute_list = ["id", "title", "description", "genre"]
-        found_movies_list = []
+        found_movies = {}
         for attribute in attribute_list:
-            movies_with_attribute = self.search_for_movies_by_attribute(searching_string, attribute)
-            found_movies_list += IterableStructure.filter(movies_with_attribute,
-                                                          lambda x: x not in found_movies_list)
-        IterableStructure.sort(found_movies_list, lambda x, y: x.id < y.id)
+            for movie in self.search_for_movies_by_attribute(searching_string, attribute):
+                found_movies[movie.id] = movie
+        found_movies_list = list(found_movies.values())
+        IterableStructure.sort(found_movies_list, key=lambda x: x.id)
         return found_movies_list
 
     def search_for_movies_by_attribute(self, searching_string, attribute):
@@ -113,8 +122,7 @@ class MovieService:
         """
         if attribute not in ["id", "title", "description", "genre"]:
             raise MovieException("Invalid attribute!")
-        return IterableStructure.filter(self.get_current_list(),
-                                        lambda x: searching_string in str(eval("x."+attribute)).lower())
+        return self.movie_repository.get_entities_by_index("search_" + attribute, searching_string)
 
     def generate_starting_movies(self):
         """
@@ -0,0 +1,215 @@
+from bisect import insort, bisect_left
+
+from repository.indexes import IntervalList
+
+
+class MovieAvailabilityIndex:
+    def __init__(self):
+        """
+        Creates a new index of the periods in which every movie is rented
+        """
+        self.__open_rentals = {}
+        self.__closed_rentals = {}
+
+    def add(self, rental):
+        """
+        Adds a rental to the index
+        :param rental: The rental to be added
+        :return: nothing
+        """
+        if rental.returned_date is None:
+            insort(self.__open_rentals.setdefault(rental.movie_id, []), (rental.rented_date, rental.id))
+        else:
+            closed_rentals = self.__closed_rentals.setdefault(rental.movie_id, IntervalList())
+            closed_rentals.add(rental.rented_date, rental.returned_date, rental.id)
+
+    def remove(self, rental):
+        """
+        Removes a rental from the index
+        :param rental: The rental to be removed
+        :return: nothing
+        """
+        if rental.returned_date is None:
+            open_rentals = self.__open_rentals[rental.movie_id]
+            del open_rentals[bisect_left(open_rentals, (rental.rented_date, rental.id))]
+            if len(open_rentals) == 0:
+                del self.__open_rentals[rental.movie_id]
+        else:
+            closed_rentals = self.__closed_rentals[rental.movie_id]
+            closed_rentals.remove(rental.rented_date, rental.id)
+            if len(closed_rentals) == 0:
+                del self.__closed_rentals[rental.movie_id]
+
+    def is_available(self, movie_id, rental_date, due_date):
+        """
+        Checks if a movie is available at every date in a given interval of time
+        :param movie_id: The movie's ID
+        :param rental_date: The date of the rental
+        :param due_date: The due date of the rental
+        :return: False if the movie is not available, otherwise True
+        """
+        open_rentals = self.__open_rentals.get(movie_id)
+        if open_rentals is not None and open_rentals[0][0] < rental_date:
+            return False
+        closed_rentals = self.__closed_rentals.get(movie_id)
+        return closed_rentals is None or not closed_rentals.overlaps(rental_date, due_date)
+
+
+class ClientBlockedIndex:
+    def __init__(self):
+        """
+        Creates a new index of the dates from which every client is blocked from renting movies
+        """
+        self.__blocking_due_dates = {}
+
+    @staticmethod
+    def is_blocking(rental):
+        """
+        Checks if a rental blocks its client from renting movies after its due date
+        :param rental: The rental
+        :return: True if the rental was returned late or was not returned yet, otherwise False
+        """
+        return rental.returned_date is None or rental.due_date < rental.returned_date
+
+    @staticmethod
+    def compute_blocked_since(rentals):
+        """
+        Computes from scratch the date from which a client is blocked from renting movies
+        :param rentals: All of the client's rentals
+        :return: The earliest due date of a blocking rental, or None if none of the rentals is blocking
+        """
+        blocking_due_dates = [rental.due_date for rental in rentals if ClientBlockedIndex.is_blocking(rental)]
+        return min(blocking_due_dates) if len(blocking_due_dates) > 0 else None
+
+    def add(self, rental):
+        """
+        Adds a rental to the index
+        :param rental: The rental to be added
+        :return: nothing
+        """
+        if self.is_blocking(rental):
+            insort(self.__blocking_due_dates.setdefault(rental.client_id, []), (rental.due_date, rental.id))
+
+    def remove(self, rental):
+        """
+        Removes a rental from the index
+        :param rental: The rental to be removed
+        :return: nothing
+        """
+        if self.is_blocking(rental):
+            blocking_due_dates = self.__blocking_due_dates[rental.client_id]
+            del blocking_due_dates[bisect_left(blocking_due_dates, (rental.due_date, rental.id))]
+            if len(blocking_due_dates) == 0:
+                del self.__blocking_due_dates[rental.client_id]
+
+    def blocked_since(self, client_id):
+        """
+        Returns the date from which a client is blocked from renting movies
+        :param client_id: The client's ID
+        :return: The earliest due date of a blocking rental of the client, or None if the client is not blocked
+        """
+        blocking_due_dates = self.__blocking_due_dates.get(client_id)
+        return blocking_due_dates[0][0] if blocking_due_dates is not None else None
+
+
+class RentedDaysIndex:
+    def __init__(self, key_function):
+        """
+        Creates a new index of the number of days for which rentals were kept, grouped by a key function
+        :param key_function: The function that takes a rental and returns the value it is grouped by
+        """
+        self.__key_function = key_function
+        self.__rental_counts = {}
+        self.__returned_days = {}
+        self.__open_counts = {}
+        self.__open_ordinal_sums = {}
+
+    def add(self, rental):
+        """
+        Adds a rental to the index
+        :param rental: The rental to be added
+        :return: nothing
+        """
+        self.__change(rental, 1)
+
+    def remove(self, rental):
+        """
+        Removes a rental from the index
+        :param rental: The rental to be removed
+        :return: nothing
+        """
+        self.__change(rental, -1)
+
+    def get_rented_days(self, today):
+        """
+        Returns the number of days for which the rentals of every group were kept, with the rentals that were not
+        returned yet counted until a given date
+        :param today: The date until which the rentals that were not returned are counted
+        :return: A dictionary that maps every group to its number of days
+        """
+        today = today.toordinal()
+        return {key: self.__returned_days[key] + self.__open_counts[key] * today - self.__open_ordinal_sums[key]
+                for key in self.__rental_counts}
+
+    def __change(self, rental, sign):
+        """
+        Adds or subtracts the contribution of a rental to the totals of its group
+        :param rental: The rental
+        :param sign: 1 if the rental is added, -1 if it is removed
+        :return: nothing
+        """
+        key = self.__key_function(rental)
+        if key not in self.__rental_counts:
+            self.__rental_counts[key] = 0
+            self.__returned_days[key] = 0
+            self.__open_counts[key] = 0
+            self.__open_ordinal_sums[key] = 0
+        self.__rental_counts[key] += sign
+        if rental.returned_date is None:
+            self.__open_counts[key] += sign
+            self.__open_ordinal_sums[key] += sign * rental.rented_date.toordinal()
+        else:
+            self.__returned_days[key] += sign * (rental.returned_date - rental.rented_date).days
+        if self.__rental_counts[key] == 0:
+            del self.__rental_counts[key]
+            del self.__returned_days[key]
+            del self.__open_counts[key]
+            del self.__open_ordinal_sums[key]
+
+
+class OpenRentalsIndex:
+    def __init__(self):
+        """
+        Creates a new index of the rentals that were not returned yet, ordered by their due dates
+        """
+        self.__open_rentals = []
+
+    def add(self, rental):
+        """
+        Adds a rental to the index
+        :param rental: The rental to be added
+        :return: nothing
+        """
+        if rental.returned_date is None:
+            insort(self.__open_rentals, (rental.due_date, rental.id, rental.movie_id))
+
+    def remove(self, rental):
+        """
+        Removes a rental from the index
+        :param rental: The rental to be removed
+        :return: nothing
+        """
+        if rental.returned_date is None:
+            del self.__open_rentals[bisect_left(self.__open_rentals, (rental.due_date, rental.id, rental.movie_id))]
+
+    def get_due_before(self, day, limit=None):
+        """
+        Returns the rentals that were not returned yet and are due before a given date
+        :param day: The date
+        :param limit: The maximum number of returned rentals, or None to return all of them
+        :return: The list of (due date, rental ID, movie ID) tuples of the rentals, in increasing order of due dates
+        """
+        position = bisect_left(self.__open_rentals, (day,))
+        if limit is not None:
+            position = min(position, limit)
+        return self.__open_rentals[:position]
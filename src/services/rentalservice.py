@@ -1,4 +1,5 @@
 from datetime import date, timedelta
+from operator import itemgetter
 from random import choice, randint
 
 from domain.rental import Rental
@@ -6,19 +7,31 @@ from domain.validators import LateClientException, RentedMovieException, ClientE
     RentalException
 from repository.iterabledatastructure import IterableStructure
 from services.rentaldto import MoviesRentedDays, ClientRentedDays, RentalRentedDays
+from services.rentalindexes import MovieAvailabilityIndex, ClientBlockedIndex, RentedDaysIndex, \
+    OpenRentalsIndex
 
 
 class RentalService:
-    def __init__(self, client_repo, movie_repo, rental_repo):
+    def __init__(self, client_repo, movie_repo, rental_repo, verify_indexes=False):
         """
         Generates a new rental service
         :param client_repo: The client repository
         :param movie_repo: The movie repository
         :param rental_repo: The rental repository
+        :param verify_indexes: True if the answers of the rental indexes should be checked against a recomputation from
+        the rentals themselves, otherwise False
         """
         self.__client_repo = client_repo
         self.__movie_repo = movie_repo
         self.__rental_repo = rental_repo
+        self.__rental_repo.add_index("client_id", lambda rental: rental.client_id)
+        self.__rental_repo.add_index("movie_id", lambda rental: rental.movie_id)
+        self.__rental_repo.register_index("availability", MovieAvailabilityIndex())
+        self.__rental_repo.register_index("blocked_clients", ClientBlockedIndex())
+        self.__rental_repo.register_index("movie_rented_days", RentedDaysIndex(lambda rental: rental.movie_id))
+        self.__rental_repo.register_index("client_rented_days", RentedDaysIndex(lambda rental: rental.client_id))
+        self.__rental_repo.register_index("open_rentals", OpenRentalsIndex())
+        self.__verify_indexes = verify_indexes
 
     @property
     def client_repo(self):
@@ -54,9 +67,9 @@ class RentalService:
         :return: A list of the given client's rentals
         Raise ClientException if the client does not exist
         """
-        if client_id not in self.client_repo.get_current_ids():
+        if not self.client_repo.contains(client_id):
             raise ClientException("The client does not exist!")
-        return IterableStructure.filter(self.rental_repo.entities, lambda x: x.client_id == client_id)
+        return self.rental_repo.get_entities_by_index("client_id", client_id)
 
     def check_if_client_has_late_returns_at_date(self, client_id, rental_date):
         """
@@ -64,15 +77,16 @@ class RentalService:
         :param client_id: The client's ID
         :param rental_date: The date of the rental
         :return: True if the client has late returns, otherwise False
+        Raise ClientException if the client does not exist
+        Raise RentalException if indexes are verified and the index of blocked clients is out of sync with the rentals
         """
-        rentals_from_client = self.get_rentals_from_client(client_id)
-        for rental in rentals_from_client:
-            if rental.returned_date is not None:
-                if rental.due_date < rental.returned_date and rental.due_date < rental_date:
-                    return True
-            elif rental.due_date < rental_date:
-                return True
-        return False
+        if not self.client_repo.contains(client_id):
+            raise ClientException("The client does not exist!")
+        blocked_since = self.rental_repo.get_index("blocked_clients").blocked_since(client_id)
+        if self.__verify_indexes:
+            if blocked_since != ClientBlockedIndex.compute_blocked_since(self.get_rentals_from_client(client_id)):
+                raise RentalException("The index of blocked clients is out of sync with the rentals!")
+        return blocked_since is not None and blocked_since < rental_date
 
     def get_movie_title(self, movie_id):
         """
@@ -97,9 +111,9 @@ class RentalService:
         :return: A list of the rentals for the movie with the given ID
         Raise MovieException if the movie does not exist
         """
-        if movie_id not in self.movie_repo.get_current_ids():
+        if not self.movie_repo.contains(movie_id):
             raise MovieException("The movie does not exist!")
-        return IterableStructure.filter(self.rental_repo.entities, lambda x: x.movie_id == movie_id)
+        return self.rental_repo.get_entities_by_index("movie_id", movie_id)
 
     def check_if_movie_is_available_between_dates(self, movie_id, rental_date, due_date):
         """
@@ -108,15 +122,11 @@ class RentalService:
         :param rental_date: The date of the rental
         :param due_date: The due date of the rental
         :return: False if the movie is not available, otherwise True
+        Raise MovieException if the movie does not exist
         """
-        rentals_for_movie = self.get_rentals_for_movie(movie_id)
-        for rental in rentals_for_movie:
-            if rental.returned_date is None:
-                if rental.rented_date < rental_date:
-                    return False
-            elif rental.returned_date > rental_date and rental.rented_date < due_date:
-                return False
-        return True
+        if not self.movie_repo.contains(movie_id):
+            raise MovieException("The movie does not exist!")
+        return self.rental_repo.get_index("availability").is_available(movie_id, rental_date, due_date)
 
     def add_rental(self, rental_id, movie_id, client_id, rented_date, due_date):
         """
@@ -152,7 +162,7 @@ class RentalService:
         :return: nothing
         Raise RentalException if the given rental does not exist or if it has already been returned
         """
-        if rental_id not in self.rental_repo.get_current_ids():
+        if not self.rental_repo.contains(rental_id):
             raise RentalException("The rental does not exist!")
         old_rental = self.rental_repo.get_entity_at_id(rental_id)
         if old_rental.returned_date is not None:
@@ -168,12 +178,11 @@ class RentalService:
         :return: nothing
         Raise RentalException if the given rental does not exist or if it has not been returned already
         """
-        if rental_id not in self.rental_repo.get_current_ids():
+        if not self.rental_repo.contains(rental_id):
             raise RentalException("The rental does not exist!")
         old_rental = self.rental_repo.get_entity_at_id(rental_id)
         if old_rental.returned_date is None:
             raise RentalException("The rental hasn't been returned!")
-        old_rental = self.rental_repo.get_entity_at_id(rental_id)
         updated_rental = Rental(rental_id, old_rental.movie_id, old_rental.client_id, old_rental.rented_date,
                                 old_rental.due_date, None)
         self.rental_repo.update(updated_rental)
@@ -215,56 +224,120 @@ class RentalService:
         # to test late rentals visually
         # self.rental_repo.add(Rental(11, 1, 1, date(2020, 11, 24), date(2020, 11, 25)))
 
-    def generate_most_rented_movies(self):
+    def get_rented_days(self, index_name, key_function):
+        """
+        Returns the number of days for which the rentals of every group were kept, with the rentals that were not
+        returned yet counted until today
+        :param index_name: The name of the rented days index of the groups
+        :param key_function: The function that takes a rental and returns the value it is grouped by
+        :return: A dictionary that maps every group to its number of days
+        Raise RentalException if indexes are verified and the rented days index is out of sync with the rentals
+        """
+        rented_days = self.rental_repo.get_index(index_name).get_rented_days(date.today())
+        if self.__verify_indexes and rented_days != self.compute_rented_days(self.get_current_list(), key_function):
+            raise RentalException("The index of rented days is out of sync with the rentals!")
+        return rented_days
+
+    @staticmethod
+    def compute_rented_days(rentals, key_function):
+        """
+        Computes from scratch the number of days for which the rentals of every group were kept, with the rentals that
+        were not returned yet counted until today
+        :param rentals: The rentals
+        :param key_function: The function that takes a rental and returns the value it is grouped by
+        :return: A dictionary that maps every group to its number of days
+        """
+        rented_days = {}
+        for rental in rentals:
+            key = key_function(rental)
+            if key not in rented_days:
+                rented_days[key] = 0
+            if rental.returned_date is None:
+                rented_days[key] += (date.today() - rental.rented_date).days
+            else:
+                rented_days[key] += (rental.returned_date - rental.rented_date).days
+        return rented_days
+
+    @staticmethod
+    def select_most_days(days_dict, limit=None):
+        """
+        Orders the entries of a dictionary in decreasing order of their number of days
+        :param days_dict: A dictionary that maps IDs to numbers of days
+        :param limit: The maximum number of entries to be selected, or None to select all of them
+        :return: The list of selected (ID, number of days) pairs, in decreasing order of the number of days
+        """
+        entries = list(days_dict.items())
+        if limit is not None:
+            return IterableStructure.largest(entries, limit, key=itemgetter(1))
+        IterableStructure.sort(entries, key=itemgetter(1), reverse=True)
+        return entries
+
+    def get_rented_days_report(self, index_name, key_function, limit=None):
+        """
+        Returns the groups of rentals in decreasing order of the days for which their rentals were kept, together with
+        their names, from a report index that joins the rentals with the table of the groups
+        :param index_name: The name of the report index
+        :param key_function: The function that takes a rental and returns the value it is grouped by
+        :param limit: The maximum number of groups, or None to return all of them
+        :return: The list of (ID, name, number of days) tuples of the groups
+        Raise RentalException if indexes are verified and the report index is out of sync with the rentals
+        """
+        report = self.rental_repo.get_index(index_name).get_most_days(date.today(), limit)
+        if self.__verify_indexes:
+            computed_days = self.compute_rented_days(self.get_current_list(), key_function)
+            computed_days = self.select_most_days(computed_days, limit)
+            if [days for _, _, days in report] != [days for _, days in computed_days]:
+                raise RentalException("The report of rented days is out of sync with the rentals!")
+        return report
+
+    def generate_most_rented_movies(self, limit=None):
         """
         Generates a list containing the most rented movies in decreasing order of the days they were rented
+        :param limit: The maximum number of movies in the list, or None to list all of them
         :return: The list of the most rented movies and the number of days they were rented
-        """
-        sorted_movies = []
-        movies_dict = {}
-        for rental in self.get_current_list():
-            if rental.movie_id not in movies_dict:
-                movies_dict[rental.movie_id] = 0
-            if rental.returned_date is None:
-                movies_dict[rental.movie_id] += (date.today() - rental.rented_date).days
-            else:
-                movies_dict[rental.movie_id] += (rental.returned_date - rental.rented_date).days
-        for entry in movies_dict:
-            sorted_movies.append(MoviesRentedDays(entry, self.get_movie_title(entry), movies_dict[entry]))
-        IterableStructure.sort(sorted_movies, lambda x, y: x.days > y.days)
-        return sorted_movies
+        If the rental repository has a rented days report index, the days are summed up and ranked by it
+        """
+        if self.rental_repo.has_index("movie_rented_days_report"):
+            return [MoviesRentedDays(movie_id, title, days) for movie_id, title, days in
+                    self.get_rented_days_report("movie_rented_days_report", lambda rental: rental.movie_id, limit)]
+        movies_dict = self.get_rented_days("movie_rented_days", lambda rental: rental.movie_id)
+        return [MoviesRentedDays(movie_id, self.get_movie_title(movie_id), days)
+                for movie_id, days in self.select_most_days(movies_dict, limit)]
 
-    def generate_most_active_clients(self):
+    def generate_most_active_clients(self, limit=None):
         """
         Generates a list containing the most active clients in decreasing order of the days they rented a movie
+        :param limit: The maximum number of clients in the list, or None to list all of them
         :return: The list of the most active clients and the number of days they rented something
-        """
-        sorted_clients = []
-        clients_dict = {}
-        for rental in self.get_current_list():
-            if rental.client_id not in clients_dict:
-                clients_dict[rental.client_id] = 0
-            if rental.returned_date is None:
-                clients_dict[rental.client_id] += (date.today() - rental.rented_date).days
-            else:
-                clients_dict[rental.client_id] += (rental.returned_date - rental.rented_date).days
-        for entry in clients_dict:
-            sorted_clients.append(ClientRentedDays(entry, self.get_client_name(entry), clients_dict[entry]))
-        IterableStructure.sort(sorted_clients, lambda x, y: x.days > y.days)
-        return sorted_clients
+        If the rental repository has a rented days report index, the days are summed up and ranked by it
+        """
+        if self.rental_repo.has_index("client_rented_days_report"):
+            return [ClientRentedDays(client_id, name, days) for client_id, name, days in
+                    self.get_rented_days_report("client_rented_days_report", lambda rental: rental.client_id, limit)]
+        clients_dict = self.get_rented_days("client_rented_days", lambda rental: rental.client_id)
+        return [ClientRentedDays(client_id, self.get_client_name(client_id), days)
+                for client_id, days in self.select_most_days(clients_dict, limit)]
 
-    def generate_late_rentals(self):
+    def generate_late_rentals(self, limit=None):
         """
         Generates a list containing the overdue movies in decreasing order of overdue days
+        :param limit: The maximum number of rentals in the list, or None to list all of them
         :return: The list of overdue movies and the number of days they are overdue
-        """
-        sorted_rentals = []
-        rental_dict = {}
-        for rental in self.get_current_list():
-            if rental.returned_date is None:
-                rental_dict[rental.id] = (date.today() - rental.due_date).days
-        for entry in rental_dict:
-            movie_title = self.get_movie_title_from_rental_with_id(entry)
-            sorted_rentals.append(RentalRentedDays(entry, movie_title, rental_dict[entry]))
-        IterableStructure.sort(sorted_rentals, lambda x, y: x.days > y.days)
-        return sorted_rentals
+        Raise RentalException if indexes are verified and the open rentals index is out of sync with the rentals
+        If the rental repository has a late rentals report index, the titles are joined in by it
+        """
+        today = date.today()
+        if self.rental_repo.has_index("late_rentals_report"):
+            late_rentals = self.rental_repo.get_index("late_rentals_report").get_due_before(today, limit)
+        else:
+            late_rentals = [(due_date, rental_id, self.get_movie_title(movie_id)) for due_date, rental_id, movie_id
+                            in self.rental_repo.get_index("open_rentals").get_due_before(today, limit)]
+        if self.__verify_indexes:
+            computed_late_rentals = [(rental.due_date, rental.id, self.get_movie_title(rental.movie_id))
+                                     for rental in self.get_current_list()
+                                     if rental.returned_date is None and rental.due_date < today]
+            IterableStructure.sort(computed_late_rentals, key=itemgetter(0, 1))
+            if late_rentals != computed_late_rentals[:limit]:
+                raise RentalException("The index of open rentals is out of sync with the rentals!")
+        return [RentalRentedDays(rental_id, title, (today - due_date).days)
+                for due_date, rental_id, title in late_rentals]
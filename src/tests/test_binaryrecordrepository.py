@@ -0,0 +1,84 @@
+import os
+import pickle
+from unittest import TestCase
+
+from domain.client import Client
+from domain.validators import ClientValidator, ClientException
+from repository.binaryrecordfile import BinaryRecordFile
+from repository.binaryrecordrepository import BinaryRecordRepository
+
+
+class TestBinaryRecordRepository(TestCase):
+    def setUp(self):
+        self.file_name = "../../TestFiles/test_binary_record_repository.records"
+        self.repo = self.open_repository()
+        self.repo.add(Client(1, "name"))
+
+    def tearDown(self):
+        self.repo.close()
+        os.remove(self.file_name)
+
+    def open_repository(self, compaction_threshold=1000):
+        return BinaryRecordRepository(ClientValidator, ClientException, self.file_name, compaction_threshold)
+
+    def reopen(self, compaction_threshold=1000):
+        self.repo.close()
+        self.repo = self.open_repository(compaction_threshold)
+        return [(client.id, client.name) for client in self.repo.entities]
+
+    def record_size(self, entity):
+        return BinaryRecordFile.HEADER.size + len(pickle.dumps(entity))
+
+    def test_changes_append_records(self):
+        size = os.path.getsize(self.file_name)
+        self.repo.update(Client(1, "new name"))
+        self.assertEqual(os.path.getsize(self.file_name),
+                         size + self.record_size(Client(1, "new name")) + BinaryRecordFile.HEADER.size)
+        self.repo.add(Client(2, "another name"))
+        self.repo.remove(2)
+        self.assertRaises(ClientException, self.repo.remove, 2)
+        self.assertEqual(self.repo.record_file.dead_count, 3)
+        self.assertEqual(self.reopen(), [(1, "new name")])
+        self.assertEqual(self.repo.record_file.read(1).name, "new name")
+        self.assertRaises(KeyError, self.repo.record_file.read, 2)
+
+    def test_transaction(self):
+        with self.repo.transaction():
+            self.repo.add(Client(2, "another name"))
+            self.repo.update(Client(1, "new name"))
+        with self.assertRaises(ClientException):
+            with self.repo.transaction():
+                self.repo.remove(2)
+                self.repo.add(Client(1, "name"))
+        self.assertEqual(self.reopen(), [(1, "new name"), (2, "another name")])
+
+    def test_incomplete_group(self):
+        self.repo.add(Client(2, "another name"))
+        size = os.path.getsize(self.file_name)
+        with open(self.file_name, "r+b") as f:
+            f.truncate(size - 1)
+        self.assertEqual(self.reopen(), [(1, "name")])
+        self.assertEqual(os.path.getsize(self.file_name), self.record_size(Client(1, "name")) +
+                         BinaryRecordFile.HEADER.size)
+        self.repo.add(Client(3, "third name"))
+        self.assertEqual(self.reopen(), [(1, "name"), (3, "third name")])
+
+    def test_compact(self):
+        self.reopen(2)
+        self.repo.add_all([Client(2, "another name"), Client(3, "third name")])
+        self.repo.update(Client(2, "new name"))
+        self.assertEqual(self.repo.record_file.dead_count, 1)
+        self.repo.remove(3)
+        self.assertEqual(self.repo.record_file.dead_count, 0)
+        self.assertFalse(os.path.exists(self.file_name + ".tmp"))
+        self.assertEqual(os.path.getsize(self.file_name), self.record_size(Client(1, "name")) +
+                         self.record_size(Client(2, "new name")) + BinaryRecordFile.HEADER.size)
+        self.assertEqual(self.reopen(), [(1, "name"), (2, "new name")])
+
+    def test_invalid_file(self):
+        other_file_name = "../../TestFiles/test_binary_record_repository.pickle"
+        with open(other_file_name, "wb") as f:
+            pickle.dump({1: Client(1, "name")}, f)
+        self.assertRaises(ValueError, BinaryRecordFile, other_file_name)
+        self.assertGreater(os.path.getsize(other_file_name), 0)
+        os.remove(other_file_name)
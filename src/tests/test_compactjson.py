@@ -0,0 +1,70 @@
+import io
+import json
+import os
+from datetime import date
+from unittest import TestCase
+
+from domain.rental import Rental
+from domain.validators import RentalValidator, RentalException
+from repository.compactjson import CompactJSONFormat
+from repository.jsondataaccessentity import RentalJSONDataAccess
+from repository.jsonrepository import JSONRepository
+
+
+class TestCompactJSONFormat(TestCase):
+    def setUp(self):
+        self.file_name = "../../TestFiles/test_compact_json.json"
+        with open(self.file_name, "wt") as f:
+            f.write("{}")
+        self.compact_format = CompactJSONFormat(RentalJSONDataAccess())
+        self.rentals = [Rental(1, 2, 3, date(2020, 5, 23), date(2020, 7, 23)),
+                        Rental(2, 2, 3, date(2020, 4, 23), date(2020, 5, 22), date(2020, 4, 27))]
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def open_repository(self, compact):
+        return JSONRepository(RentalValidator, RentalException, RentalJSONDataAccess(), self.file_name,
+                              compact=compact)
+
+    def read_rentals(self, repo):
+        return [(rental.id, rental.rented_date, rental.returned_date) for rental in repo.entities]
+
+    def test_write(self):
+        file = io.StringIO()
+        self.assertEqual(self.compact_format.write(file, self.rentals), 2)
+        self.assertEqual(file.getvalue().splitlines(),
+                         ['[{"format":"compact","columns":["id","movie_id","client_id","rented_date","due_date",'
+                          '"returned_date"]},',
+                          "[1,2,3,737568,737629,null],",
+                          "[2,2,3,737538,737567,737542]]"])
+
+    def test_read_rows(self):
+        file = io.StringIO()
+        self.compact_format.write(file, self.rentals)
+        header, *rows = json.loads(file.getvalue())
+        self.assertTrue(self.compact_format.is_header(header))
+        self.assertEqual([(rental.id, rental.due_date, rental.returned_date)
+                          for rental in self.compact_format.read_rows(header, rows)],
+                         [(1, date(2020, 7, 23), None), (2, date(2020, 5, 22), date(2020, 4, 27))])
+        header["columns"] = ["id"]
+        self.assertRaises(ValueError, self.compact_format.read_rows, header, rows)
+
+    def test_repository(self):
+        repo = self.open_repository(True)
+        for rental in self.rentals:
+            repo.add(rental)
+        repo.remove(2)
+        with open(self.file_name, "rt") as f:
+            self.assertEqual(f.read().count("\n"), 2)
+        self.assertEqual(self.read_rentals(self.open_repository(False)), [(1, date(2020, 5, 23), None)])
+
+    def test_convert(self):
+        repo = self.open_repository(False)
+        for rental in self.rentals:
+            repo.add(rental)
+        indented_size = os.path.getsize(self.file_name)
+        self.assertEqual(self.compact_format.convert(self.file_name), 2)
+        self.assertLess(os.path.getsize(self.file_name) * 2, indented_size)
+        self.assertEqual(self.read_rentals(self.open_repository(True)), self.read_rentals(repo))
+        self.assertEqual(self.compact_format.convert(self.file_name), 0)
@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+from domain.client import Client
+from domain.validators import ClientValidator, ClientException
+from repository.indexes import KeyIndex, IntervalList, IDSubstringIndex, SubstringIndex
+from repository.repo import Repository
+
+
+class TestKeyIndex(TestCase):
+    def setUp(self):
+        self.index = KeyIndex(lambda client: client.name)
+        self.index.add(Client(2, "name"))
+        self.index.add(Client(1, "name"))
+        self.index.add(Client(3, "another name"))
+
+    def test_add(self):
+        self.assertEqual([client.id for client in self.index.find("name")], [1, 2])
+        self.assertEqual([client.id for client in self.index.find("another name")], [3])
+
+    def test_remove(self):
+        self.index.remove(Client(1, "name"))
+        self.assertEqual([client.id for client in self.index.find("name")], [2])
+        self.index.remove(Client(3, "another name"))
+        self.assertEqual(self.index.find("another name"), [])
+
+    def test_find(self):
+        self.assertEqual(self.index.find("idk"), [])
+        self.assertEqual(self.index.find([]), [])
+
+
+class TestIntervalList(TestCase):
+    def setUp(self):
+        self.intervals = IntervalList()
+        self.intervals.add(10, 20, 1)
+        self.intervals.add(1, 5, 2)
+        self.intervals.add(3, 30, 3)
+
+    def test_len(self):
+        self.assertEqual(len(self.intervals), 3)
+
+    def test_overlaps(self):
+        self.assertTrue(self.intervals.overlaps(25, 40))
+        self.assertTrue(self.intervals.overlaps(0, 2))
+        self.assertFalse(self.intervals.overlaps(30, 40))
+        self.assertFalse(self.intervals.overlaps(-5, 1))
+
+    def test_remove(self):
+        self.intervals.remove(3, 3)
+        self.assertEqual(len(self.intervals), 2)
+        self.assertFalse(self.intervals.overlaps(25, 40))
+        self.assertFalse(self.intervals.overlaps(6, 9))
+        self.assertTrue(self.intervals.overlaps(6, 11))
+
+
+class TestSubstringIndex(TestCase):
+    def setUp(self):
+        self.repo = Repository(ClientValidator, ClientException)
+        self.repo.register_index("search_name", SubstringIndex(self.repo, lambda client: client.name))
+        self.repo.register_index("search_id", IDSubstringIndex(self.repo))
+        self.repo.add(Client(2, "Marie Curie"))
+        self.repo.add(Client(1, "Marilyn Monroe"))
+        self.repo.add(Client(13, "Axl Rose"))
+
+    def find(self, substring, index_name="search_name"):
+        return [client.id for client in self.repo.get_entities_by_index(index_name, substring)]
+
+    def test_find(self):
+        self.assertEqual(self.find("mari"), [1, 2])
+        self.assertEqual(self.find("ro"), [1, 13])
+        self.assertEqual(self.find("e"), [1, 2, 13])
+        self.assertEqual(self.find(""), [1, 2, 13])
+        self.assertEqual(self.find("Marie"), [])
+        self.assertEqual(self.find("rie rose"), [])
+        self.assertEqual(self.find("1", "search_id"), [1, 13])
+        self.assertEqual(self.find("3", "search_id"), [13])
+        self.assertEqual(self.find("ma", "search_id"), [])
+        self.assertEqual(self.find("", "search_id"), [1, 2, 13])
+
+    def test_remove(self):
+        self.assertEqual(self.find("mari"), [1, 2])
+        self.repo.remove(2)
+        self.assertEqual(self.find("mari"), [1])
+        self.assertEqual(self.find("curie"), [])
+        self.repo.update(Client(1, "Norma Jeane"))
+        self.assertEqual(self.find("mari"), [])
+        self.assertEqual(self.find("jean"), [1])
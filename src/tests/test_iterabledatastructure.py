@@ -46,12 +46,39 @@ class TestIterableStructure(TestCase):
         self.iterable1.append("B")
         self.assertEqual(self.iterable1.data, [2, 5, 4, 3, 1, "B"])
 
+    def test_insert(self):
+        self.iterable1.insert(0, 7)
+        self.assertEqual(self.iterable1.data, [7, 2, 5, 4, 3, 1])
+        self.iterable2.insert(5, "z")
+        self.assertEqual(self.iterable2.data, ["q", "b", "w", "a", "r", "z"])
+
+    def test_extend(self):
+        self.iterable2.extend(["z", "y"])
+        self.assertEqual(self.iterable2.data, ["q", "b", "w", "a", "r", "z", "y"])
+
     def test_sort(self):
         IterableStructure.sort(self.iterable1, lambda x, y: x < y)
         self.assertEqual(self.iterable1.data, [1, 2, 3, 4, 5])
         IterableStructure.sort(self.iterable2, lambda x, y: x < y)
         self.assertEqual(self.iterable2.data, ["a", "b", "q", "r", "w"])
 
+    def test_sort_with_key(self):
+        IterableStructure.sort(self.iterable1, key=lambda x: x)
+        self.assertEqual(self.iterable1.data, [1, 2, 3, 4, 5])
+        IterableStructure.sort(self.iterable2, key=lambda x: x, reverse=True)
+        self.assertEqual(self.iterable2.data, ["w", "r", "q", "b", "a"])
+        pairs = [(1, "b"), (2, "a"), (1, "a"), (2, "b")]
+        IterableStructure.sort(pairs, key=(lambda x: x[0], lambda x: x[1]))
+        self.assertEqual(pairs, [(1, "a"), (1, "b"), (2, "a"), (2, "b")])
+        IterableStructure.sort(pairs, key=lambda x: x[1])
+        self.assertEqual(pairs, [(1, "a"), (2, "a"), (1, "b"), (2, "b")])
+
+    def test_largest(self):
+        self.assertEqual(IterableStructure.largest(self.iterable1, 2, key=lambda x: x), [5, 4])
+        self.assertEqual(IterableStructure.largest(self.iterable2, 10, key=lambda x: x), ["w", "r", "q", "b", "a"])
+        pairs = [(1, "a"), (2, "b"), (2, "c"), (1, "d")]
+        self.assertEqual(IterableStructure.largest(pairs, 3, key=lambda x: x[0]), [(2, "b"), (2, "c"), (1, "a")])
+
     def test_filter(self):
         filtered_iterable1 = IterableStructure.filter(self.iterable1, lambda x: x < 3)
         self.assertEqual(filtered_iterable1, [2, 1])
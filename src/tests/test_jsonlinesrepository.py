@@ -0,0 +1,92 @@
+import os
+from unittest import TestCase
+
+from domain.client import Client
+from domain.validators import ClientValidator, ClientException
+from repository.jsondataaccessentity import ClientJSONDataAccess
+from repository.jsonlinesrepository import JSONLinesRepository
+from repository.streamingloader import StreamingLoader
+
+
+class TestJSONLinesRepository(TestCase):
+    def setUp(self):
+        self.file_name = "../../TestFiles/test_json_lines_repository.jsonl"
+        self.repo = self.open_repository()
+        self.repo.add(Client(1, "name"))
+
+    def tearDown(self):
+        self.repo.close()
+        os.remove(self.file_name)
+
+    def open_repository(self, compaction_min_records=1000):
+        return JSONLinesRepository(ClientValidator, ClientException, ClientJSONDataAccess(), self.file_name,
+                                   compaction_min_records=compaction_min_records)
+
+    def reopen(self, compaction_min_records=1000):
+        self.repo.close()
+        self.repo = self.open_repository(compaction_min_records)
+        return [(client.id, client.name) for client in self.repo.entities]
+
+    def read_lines(self):
+        with open(self.file_name, "rt") as f:
+            return f.read().splitlines()
+
+    def test_append(self):
+        self.repo.add(Client(2, "another name"))
+        self.repo.update(Client(1, "new name"))
+        self.repo.remove(2)
+        self.assertEqual(self.read_lines(), ['{"op":"upsert","entity":{"id":1,"name":"name"}}', '{"op":"commit"}',
+                                             '{"op":"upsert","entity":{"id":2,"name":"another name"}}',
+                                             '{"op":"commit"}',
+                                             '{"op":"upsert","entity":{"id":1,"name":"new name"}}', '{"op":"commit"}',
+                                             '{"op":"delete","id":2}', '{"op":"commit"}'])
+        self.assertEqual(self.reopen(), [(1, "new name")])
+        self.assertEqual(self.repo.log_length, 4)
+
+    def test_transaction(self):
+        with self.repo.transaction():
+            self.repo.add(Client(2, "another name"))
+            self.repo.remove(1)
+        with self.assertRaises(ClientException):
+            with self.repo.transaction():
+                self.repo.add(Client(3, "third name"))
+                self.repo.add(Client(3, "third name"))
+        self.assertEqual(self.read_lines()[2:], ['{"op":"upsert","entity":{"id":2,"name":"another name"}}',
+                                                 '{"op":"delete","id":1}', '{"op":"commit"}'])
+        self.assertEqual(self.reopen(), [(2, "another name")])
+
+    def test_incomplete_group(self):
+        with open(self.file_name, "at") as f:
+            f.write('{"op":"upsert","entity":{"id":2,"name":"another name"}}\n{"op":"comm')
+        self.assertEqual(self.reopen(), [(1, "name")])
+        self.repo.add(Client(3, "third name"))
+        self.assertEqual(self.reopen(), [(1, "name"), (3, "third name")])
+
+    def test_compact(self):
+        self.repo.add(Client(2, "another name"))
+        self.repo.update(Client(2, "new name"))
+        self.repo.compact()
+        self.assertEqual(self.read_lines(), ['{"op":"upsert","entity":{"id":1,"name":"name"}}',
+                                             '{"op":"upsert","entity":{"id":2,"name":"new name"}}',
+                                             '{"op":"commit"}'])
+        self.assertEqual(self.repo.log_length, 2)
+        self.repo.remove(1)
+        self.assertEqual(self.reopen(), [(2, "new name")])
+
+    def test_background_compaction(self):
+        self.reopen(3)
+        for client_id in range(2, 6):
+            self.repo.update(Client(1, "name" + str(client_id)))
+        self.assertEqual(self.reopen(), [(1, "name5")])
+        self.assertLessEqual(self.repo.log_length, 3)
+
+    def test_load_progress(self):
+        for client_id in range(2, 6):
+            self.repo.add(Client(client_id, "name"))
+        self.repo.remove(3)
+        self.repo.close()
+        progress = []
+        self.repo = JSONLinesRepository(ClientValidator, ClientException, ClientJSONDataAccess(), self.file_name,
+                                        loader=StreamingLoader(2, lambda file_name, count: progress.append(count)))
+        self.assertEqual(self.repo.get_current_ids(), [1, 2, 4, 5])
+        self.assertEqual(progress, [2, 4])
@@ -0,0 +1,116 @@
+import os
+from datetime import date
+from unittest import TestCase
+
+from domain.client import Client
+from domain.movie import Movie
+from domain.rental import Rental
+from domain.validators import ClientValidator, ClientException, MovieValidator, MovieException, RentalValidator, \
+    RentalException
+from repository.mappedrentalfile import MappedRentalFile
+from repository.mappedrentalrepository import MappedRentalRepository
+from repository.repo import Repository
+from services.rentalservice import RentalService
+
+
+class TestMappedRentalRepository(TestCase):
+    def setUp(self):
+        self.file_name = "../../TestFiles/test_mapped_rentals.bin"
+        self.repo = self.open_repository()
+        self.repo.add(Rental(1, 1, 1, date(2020, 5, 23), date(2020, 7, 23)))
+        self.repo.add(Rental(2, 2, 2, date(2020, 5, 23), date(2020, 7, 23), date(2020, 8, 23)))
+        self.repo.add(Rental(3, 1, 2, date(2020, 4, 23), date(2020, 5, 22), date(2020, 4, 27)))
+
+    def tearDown(self):
+        self.repo.close()
+        os.remove(self.file_name)
+
+    def open_repository(self):
+        return MappedRentalRepository(RentalValidator, RentalException, self.file_name, 2)
+
+    def reopen(self):
+        self.repo.close()
+        self.repo = self.open_repository()
+        return [(rental.id, rental.movie_id, rental.client_id, rental.rented_date, rental.due_date,
+                 rental.returned_date) for rental in self.repo.entities]
+
+    def read_file(self):
+        with open(self.file_name, "rb") as f:
+            return f.read()
+
+    def test_slots(self):
+        rental_file = self.repo.rental_file
+        self.assertEqual(rental_file.capacity, 4)
+        self.assertEqual(os.path.getsize(self.file_name), 4 * MappedRentalFile.RECORD.size)
+        self.assertEqual([rental_file.slot_of(rental_id) for rental_id in (1, 2, 3)], [0, 1, 2])
+        self.assertEqual(rental_file.read(2), (3, 1, 2, date(2020, 4, 23).toordinal(), date(2020, 5, 22).toordinal(),
+                                               date(2020, 4, 27).toordinal()))
+        self.assertEqual(rental_file.get(1).returned_date, None)
+        self.repo.remove(2)
+        self.repo.add(Rental(4, 2, 1, date(2020, 9, 1), date(2020, 9, 5)))
+        self.assertEqual(rental_file.slot_of(4), 1)
+        self.assertEqual([record[0] for record in rental_file.scan()], [1, 4, 3])
+        self.assertEqual(self.reopen(), [(1, 1, 1, date(2020, 5, 23), date(2020, 7, 23), None),
+                                         (3, 1, 2, date(2020, 4, 23), date(2020, 5, 22), date(2020, 4, 27)),
+                                         (4, 2, 1, date(2020, 9, 1), date(2020, 9, 5), None)])
+
+    def test_scan_while_growing(self):
+        rental_file = self.repo.rental_file
+        scanned_ids = []
+        for record in rental_file.scan():
+            scanned_ids.append(record[0])
+            if record[0] == 1:
+                for rental_id in (4, 5, 6):
+                    self.repo.add(Rental(rental_id, 2, 1, date(2020, 9, 1), date(2020, 9, 5)))
+        self.assertEqual(rental_file.capacity, 8)
+        self.assertEqual(scanned_ids, [1, 2, 3, 4, 5, 6])
+        self.assertEqual([rental[0] for rental in self.reopen()], [1, 2, 3, 4, 5, 6])
+
+    def test_write_behind(self):
+        self.repo.close()
+        self.repo = MappedRentalRepository(RentalValidator, RentalException, self.file_name, 2, flush_interval=60,
+                                           flush_threshold=1000)
+        self.repo.add(Rental(4, 2, 1, date(2020, 9, 1), date(2020, 9, 5)))
+        self.repo.flush()
+        self.assertEqual([rental[0] for rental in self.reopen()], [1, 2, 3, 4])
+
+    def test_in_place_update(self):
+        rental_service = RentalService(Repository(ClientValidator, ClientException),
+                                       Repository(MovieValidator, MovieException), self.repo)
+        old_contents = self.read_file()
+        rental_service.return_movie(1, date(2020, 6, 1))
+        new_contents = self.read_file()
+        changed_bytes = [position for position in range(len(old_contents))
+                         if old_contents[position] != new_contents[position]]
+        self.assertTrue(all(MappedRentalFile.RETURNED_DATE_OFFSET <= position < MappedRentalFile.RECORD.size
+                            for position in changed_bytes))
+        rental_service.cancel_return(3)
+        self.assertEqual([rental[5] for rental in self.reopen()], [date(2020, 6, 1), date(2020, 8, 23), None])
+
+    def test_transaction(self):
+        with self.assertRaises(RentalException):
+            with self.repo.transaction():
+                self.repo.remove(1)
+                self.repo.add(Rental(2, 2, 2, date(2020, 5, 23), date(2020, 7, 23)))
+        self.assertEqual([rental[0] for rental in self.reopen()], [1, 2, 3])
+
+    def test_reports(self):
+        client_repo = Repository(ClientValidator, ClientException)
+        movie_repo = Repository(MovieValidator, MovieException)
+        for client_id in (1, 2):
+            client_repo.add(Client(client_id, "name" + str(client_id)))
+            movie_repo.add(Movie(client_id, "t" + str(client_id), "d", "g"))
+        rental_service = RentalService(client_repo, movie_repo, self.repo, True)
+        self.assertEqual([(movie.movie_id, movie.days) for movie in rental_service.generate_most_rented_movies()],
+                         [(1, (date.today() - date(2020, 5, 23)).days + 4), (2, 92)])
+        self.assertEqual([client.client_id for client in rental_service.generate_most_active_clients(1)], [1])
+        self.assertEqual([rental.rental_id for rental in rental_service.generate_late_rentals()], [1])
+        rental_service.return_movie(1, date(2020, 6, 1))
+        self.assertEqual(rental_service.generate_late_rentals(), [])
+
+    def test_invalid_file(self):
+        other_file_name = "../../TestFiles/test_mapped_rentals.txt"
+        with open(other_file_name, "wt") as f:
+            f.write("1;1;1")
+        self.assertRaises(ValueError, MappedRentalFile, other_file_name)
+        os.remove(other_file_name)
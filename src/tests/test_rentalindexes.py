@@ -0,0 +1,102 @@
+from datetime import date
+from unittest import TestCase
+
+from domain.rental import Rental
+from services.rentalindexes import MovieAvailabilityIndex, ClientBlockedIndex, RentedDaysIndex, OpenRentalsIndex
+
+
+class TestMovieAvailabilityIndex(TestCase):
+    def setUp(self):
+        self.index = MovieAvailabilityIndex()
+        self.open_rental = Rental(1, 1, 1, date(2020, 5, 23), date(2020, 7, 23))
+        self.closed_rental = Rental(2, 2, 2, date(2020, 5, 23), date(2020, 7, 23), date(2020, 8, 23))
+        self.index.add(self.open_rental)
+        self.index.add(self.closed_rental)
+
+    def test_is_available(self):
+        self.assertFalse(self.index.is_available(1, date(2020, 8, 23), date(2020, 8, 24)))
+        self.assertTrue(self.index.is_available(1, date(2020, 4, 23), date(2020, 5, 23)))
+        self.assertFalse(self.index.is_available(2, date(2020, 7, 23), date(2020, 8, 24)))
+        self.assertTrue(self.index.is_available(2, date(2020, 8, 23), date(2020, 8, 24)))
+        self.assertTrue(self.index.is_available(3, date(2020, 7, 23), date(2020, 8, 24)))
+
+    def test_remove(self):
+        self.index.remove(self.open_rental)
+        self.index.remove(self.closed_rental)
+        self.assertTrue(self.index.is_available(1, date(2020, 8, 23), date(2020, 8, 24)))
+        self.assertTrue(self.index.is_available(2, date(2020, 7, 23), date(2020, 8, 24)))
+
+
+class TestClientBlockedIndex(TestCase):
+    def setUp(self):
+        self.index = ClientBlockedIndex()
+        self.open_rental = Rental(1, 1, 1, date(2020, 5, 23), date(2020, 7, 23))
+        self.late_rental = Rental(2, 2, 2, date(2020, 5, 23), date(2020, 7, 23), date(2020, 8, 23))
+        self.returned_rental = Rental(3, 1, 2, date(2020, 4, 23), date(2020, 5, 22), date(2020, 4, 27))
+        self.index.add(self.open_rental)
+        self.index.add(self.late_rental)
+        self.index.add(self.returned_rental)
+
+    def test_is_blocking(self):
+        self.assertTrue(ClientBlockedIndex.is_blocking(self.open_rental))
+        self.assertTrue(ClientBlockedIndex.is_blocking(self.late_rental))
+        self.assertFalse(ClientBlockedIndex.is_blocking(self.returned_rental))
+
+    def test_compute_blocked_since(self):
+        self.assertEqual(ClientBlockedIndex.compute_blocked_since([self.late_rental, self.returned_rental]),
+                         date(2020, 7, 23))
+        self.assertIsNone(ClientBlockedIndex.compute_blocked_since([self.returned_rental]))
+
+    def test_blocked_since(self):
+        self.assertEqual(self.index.blocked_since(1), date(2020, 7, 23))
+        self.assertEqual(self.index.blocked_since(2), date(2020, 7, 23))
+        self.assertIsNone(self.index.blocked_since(3))
+
+    def test_remove(self):
+        self.index.remove(self.late_rental)
+        self.index.remove(self.returned_rental)
+        self.assertIsNone(self.index.blocked_since(2))
+
+
+class TestRentedDaysIndex(TestCase):
+    def setUp(self):
+        self.index = RentedDaysIndex(lambda rental: rental.movie_id)
+        self.open_rental = Rental(1, 1, 1, date(2020, 5, 23), date(2020, 7, 23))
+        self.returned_rental = Rental(2, 1, 2, date(2020, 4, 23), date(2020, 5, 22), date(2020, 4, 27))
+        self.other_rental = Rental(3, 2, 2, date(2020, 5, 23), date(2020, 7, 23), date(2020, 8, 23))
+        self.index.add(self.open_rental)
+        self.index.add(self.returned_rental)
+        self.index.add(self.other_rental)
+
+    def test_get_rented_days(self):
+        self.assertEqual(self.index.get_rented_days(date(2020, 6, 2)), {1: 14, 2: 92})
+        self.assertEqual(self.index.get_rented_days(date(2020, 6, 3)), {1: 15, 2: 92})
+
+    def test_remove(self):
+        self.index.remove(self.open_rental)
+        self.assertEqual(self.index.get_rented_days(date(2020, 6, 2)), {1: 4, 2: 92})
+        self.index.remove(self.other_rental)
+        self.assertEqual(self.index.get_rented_days(date(2020, 6, 2)), {1: 4})
+
+
+class TestOpenRentalsIndex(TestCase):
+    def setUp(self):
+        self.index = OpenRentalsIndex()
+        self.open_rental = Rental(1, 1, 1, date(2020, 5, 23), date(2020, 7, 23))
+        self.other_open_rental = Rental(2, 2, 2, date(2020, 5, 23), date(2020, 6, 23))
+        self.returned_rental = Rental(3, 1, 2, date(2020, 4, 23), date(2020, 5, 22), date(2020, 4, 27))
+        self.index.add(self.open_rental)
+        self.index.add(self.other_open_rental)
+        self.index.add(self.returned_rental)
+
+    def test_get_due_before(self):
+        self.assertEqual(self.index.get_due_before(date(2020, 8, 1)),
+                         [(date(2020, 6, 23), 2, 2), (date(2020, 7, 23), 1, 1)])
+        self.assertEqual(self.index.get_due_before(date(2020, 8, 1), 1), [(date(2020, 6, 23), 2, 2)])
+        self.assertEqual(self.index.get_due_before(date(2020, 7, 23)), [(date(2020, 6, 23), 2, 2)])
+        self.assertEqual(self.index.get_due_before(date(2020, 6, 23)), [])
+
+    def test_remove(self):
+        self.index.remove(self.other_open_rental)
+        self.index.remove(self.returned_rental)
+        self.assertEqual(self.index.get_due_before(date(2020, 8, 1)), [(date(2020, 7, 23), 1, 1)])
@@ -15,7 +15,7 @@ class TestRentalService(TestCase):
         self.client_repo = Repository(ClientValidator, ClientException)
         self.movie_repo = Repository(MovieValidator, MovieException)
         self.rental_repo = Repository(RentalValidator, RentalException)
-        self.rental_service = RentalService(self.client_repo, self.movie_repo, self.rental_repo)
+        self.rental_service = RentalService(self.client_repo, self.movie_repo, self.rental_repo, True)
         self.client_repo.add(Client(1, "n1"))
         self.client_repo.add(Client(2, "n2"))
         self.client_repo.add(Client(3, "n3"))
@@ -62,6 +62,13 @@ class TestRentalService(TestCase):
         self.assertFalse(self.rental_service.check_if_client_has_late_returns_at_date(3, date(2020, 11, 24)))
         self.assertFalse(self.rental_service.check_if_client_has_late_returns_at_date(2, date(2020, 6, 24)))
 
+    def test_check_if_client_has_late_returns_at_date_verifies_index(self):
+        self.assertRaises(ClientException, self.rental_service.check_if_client_has_late_returns_at_date, 4,
+                          date(2020, 11, 24))
+        self.test_rental1.returned_date = date(2020, 6, 23)
+        self.assertRaises(RentalException, self.rental_service.check_if_client_has_late_returns_at_date, 1,
+                          date(2020, 11, 24))
+
     def test_get_movie_title(self):
         self.assertEqual(self.rental_service.get_movie_title(1), "t1")
         self.assertRaises(MovieException, self.rental_service.get_movie_title, "a")
@@ -131,6 +138,11 @@ class TestRentalService(TestCase):
         self.assertEqual(most_rented_movies[1].movie_title, "t2")
         self.assertEqual(most_rented_movies[1].days, 92)
 
+    def test_generate_most_rented_movies_with_limit(self):
+        most_rented_movies = self.rental_service.generate_most_rented_movies(1)
+        self.assertEqual(len(most_rented_movies), 1)
+        self.assertEqual(most_rented_movies[0].movie_title, "t1")
+
     def test_generate_most_active_clients(self):
         most_active_clients = self.rental_service.generate_most_active_clients()
         self.assertEqual(len(most_active_clients), 2)
@@ -138,7 +150,18 @@ class TestRentalService(TestCase):
         self.assertEqual(most_active_clients[1].client_name, "n2")
         self.assertEqual(most_active_clients[1].days, 96)
 
+    def test_generate_most_active_clients_with_limit(self):
+        most_active_clients = self.rental_service.generate_most_active_clients(5)
+        self.assertEqual(len(most_active_clients), 2)
+        self.assertEqual(most_active_clients[1].days, 96)
+
     def test_generate_late_rentals(self):
         late_rentals = self.rental_service.generate_late_rentals()
         self.assertEqual(len(late_rentals), 1)
         self.assertEqual(late_rentals[0].movie_title, "t1")
+
+    def test_generate_late_rentals_with_limit(self):
+        self.rental_repo.add(Rental(4, 3, 3, date(2020, 5, 23), date(2020, 6, 23)))
+        late_rentals = self.rental_service.generate_late_rentals(1)
+        self.assertEqual(len(late_rentals), 1)
+        self.assertEqual(late_rentals[0].movie_title, "t3")
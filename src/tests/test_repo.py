@@ -20,6 +20,12 @@ class TestRepository(TestCase):
         self.repo.add(Client(2, "another name"))
         self.assertEqual(len(self.repo.entities), 2)
 
+    def test_add_keeps_entities_sorted(self):
+        self.repo.add(Client(5, "name"))
+        self.repo.add(Client(3, "name"))
+        self.repo.add(Client(4, "name"))
+        self.assertEqual([client.id for client in self.repo.entities], [1, 3, 4, 5])
+
     def test_remove(self):
         self.assertRaises(ClientException, self.repo.remove, 2)
         self.repo.remove(1)
@@ -39,3 +45,64 @@ class TestRepository(TestCase):
     def test_get_entity_at_id(self):
         self.assertRaises(ClientException, self.repo.get_entity_at_id, 2)
         self.assertEqual(self.test_client, self.repo.get_entity_at_id(1))
+
+    def test_contains(self):
+        self.assertTrue(self.repo.contains(1))
+        self.assertFalse(self.repo.contains(2))
+        self.repo.add(Client(2, "name"))
+        self.assertTrue(self.repo.contains(2))
+        self.repo.remove(1)
+        self.assertFalse(self.repo.contains(1))
+
+    def test_get_entities_by_index(self):
+        self.assertRaises(ClientException, self.repo.get_entities_by_index, "name", "name")
+        self.repo.add(Client(3, "name"))
+        self.repo.add_index("name", lambda client: client.name)
+        self.repo.add(Client(2, "another name"))
+        self.assertEqual([client.id for client in self.repo.get_entities_by_index("name", "name")], [1, 3])
+        self.repo.update(Client(3, "another name"))
+        self.assertEqual([client.id for client in self.repo.get_entities_by_index("name", "another name")], [2, 3])
+        self.repo.remove(1)
+        self.assertEqual(self.repo.get_entities_by_index("name", "name"), [])
+
+    def test_add_all(self):
+        self.repo.add_index("name", lambda client: client.name)
+        self.repo.add_all([Client(5, "name"), Client(3, "another name")])
+        self.assertEqual(self.repo.get_current_ids(), [1, 3, 5])
+        self.repo.add_all([Client(4, "name"), Client(2, "name")])
+        self.assertEqual([client.id for client in self.repo.entities], [1, 2, 3, 4, 5])
+        self.assertEqual([client.id for client in self.repo.get_entities_by_index("name", "name")], [1, 2, 4, 5])
+        self.assertRaises(ClientException, self.repo.add_all, [Client(6, "name"), Client(6, "name")])
+        self.assertRaises(ClientException, self.repo.add_all, [Client(6, "name"), Client(1, "name")])
+        self.assertEqual(self.repo.get_current_ids(), [1, 2, 3, 4, 5])
+        with self.assertRaises(ClientException):
+            with self.repo.transaction():
+                self.repo.add_all([Client(7, "name")])
+                self.repo.remove(8)
+        self.assertFalse(self.repo.contains(7))
+
+    def test_remove_by_index(self):
+        self.assertFalse(self.repo.has_index("name"))
+        self.repo.add_index("name", lambda client: client.name)
+        self.assertTrue(self.repo.has_index("name"))
+        self.repo.add(Client(2, "another name"))
+        self.repo.add(Client(3, "name"))
+        self.assertEqual([client.id for client in self.repo.remove_by_index("name", "name")], [1, 3])
+        self.assertEqual(self.repo.get_current_ids(), [2])
+
+    def test_transaction(self):
+        self.repo.add_index("name", lambda client: client.name)
+        with self.repo.transaction():
+            self.assertTrue(self.repo.in_transaction)
+            self.repo.add(Client(2, "another name"))
+        self.assertFalse(self.repo.in_transaction)
+        self.assertEqual(self.repo.get_current_ids(), [1, 2])
+        with self.assertRaises(ClientException):
+            with self.repo.transaction():
+                self.repo.add(Client(3, "name"))
+                self.repo.update(Client(1, "new name"))
+                self.repo.remove(2)
+                self.repo.remove(4)
+        self.assertEqual(self.repo.get_current_ids(), [1, 2])
+        self.assertEqual(self.repo.get_entity_at_id(1).name, "name")
+        self.assertEqual([client.id for client in self.repo.get_entities_by_index("name", "name")], [1])
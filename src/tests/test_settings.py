@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 from domain.settings import Settings
+from domain.validators import SettingsException
 
 
 class TestSettings(TestCase):
@@ -19,5 +20,33 @@ class TestSettings(TestCase):
     def test_rental_repo(self):
         self.assertEqual(self.settings.rental_repo, "repository3.txt")
 
+    def test_database(self):
+        self.assertEqual(self.settings.database, "repository.db")
+
     def test_ui_type(self):
         self.assertEqual(self.settings.ui_type, "GUI")
+
+    def test_storage_settings(self):
+        self.assertEqual(self.settings.journal_mode, "WAL")
+        self.assertEqual(self.settings.synchronous, "NORMAL")
+        self.assertEqual(self.settings.mmap_size, 268435456)
+        self.assertEqual(self.settings.cache_size, -16384)
+        self.assertEqual(self.settings.page_size, 4096)
+        self.assertEqual(self.settings.pool_size, 2)
+        self.assertEqual(self.settings.group_commit_window, 0.5)
+        self.assertEqual(list(self.settings.sql_pragmas), ["page_size", "journal_mode", "synchronous", "mmap_size",
+                                                           "cache_size"])
+
+    def test_durability_settings(self):
+        self.assertEqual(self.settings.durability, "write_behind")
+        self.assertEqual(self.settings.flush_interval, 2.0)
+        self.assertEqual(self.settings.flush_threshold, 50)
+        self.assertTrue(self.settings.checksum)
+        self.assertEqual(self.settings.json_format, "compact")
+        self.assertEqual(self.settings.file_storage_options, {"flush_interval": 2.0, "flush_threshold": 50,
+                                                              "checksum": True})
+        self.assertEqual(self.settings.get_file_storage_options(("flush_interval", "flush_threshold", "checksum")),
+                         {"flush_interval": 2.0, "flush_threshold": 50, "checksum": True})
+        self.assertRaises(SettingsException, self.settings.get_file_storage_options, ("checksum",))
+        self.assertRaises(SettingsException, self.settings.get_file_storage_options,
+                          ("flush_interval", "flush_threshold"))
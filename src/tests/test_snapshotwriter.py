@@ -0,0 +1,75 @@
+import os
+import pickle
+from unittest import TestCase
+
+from domain.client import Client
+from domain.validators import ClientValidator, ClientException
+from repository.binaryrepository import BinaryRepository
+from repository.snapshotwriter import SnapshotWriter
+
+
+class TestSnapshotWriter(TestCase):
+    def setUp(self):
+        self.file_name = "../../TestFiles/test_snapshot_writer.txt"
+        self.checksum_file_name = self.file_name + SnapshotWriter.CHECKSUM_SUFFIX
+        with open(self.file_name, "wt") as f:
+            f.write("old\n")
+
+    def tearDown(self):
+        for file_name in (self.file_name, self.checksum_file_name, self.checksum_file_name + ".tmp"):
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
+    def read_file(self):
+        with open(self.file_name, "rt") as f:
+            return f.read()
+
+    def test_write(self):
+        with SnapshotWriter(self.file_name, buffer_size=4) as f:
+            f.write("new\n")
+            self.assertEqual(self.read_file(), "old\n")
+        self.assertEqual(self.read_file(), "new\n")
+        self.assertFalse(os.path.exists(self.file_name + ".tmp"))
+        self.assertFalse(os.path.exists(self.checksum_file_name))
+
+    def test_failed_write(self):
+        with self.assertRaises(ValueError):
+            with SnapshotWriter(self.file_name) as f:
+                f.write("new\n")
+                raise ValueError()
+        self.assertEqual(self.read_file(), "old\n")
+        self.assertFalse(os.path.exists(self.file_name + ".tmp"))
+
+    def test_checksum(self):
+        with SnapshotWriter(self.file_name, checksum=True) as f:
+            f.write("new\n" * 1000)
+        SnapshotWriter.verify(self.file_name)
+        with open(self.file_name, "at") as f:
+            f.write("damaged")
+        self.assertRaises(ValueError, SnapshotWriter.verify, self.file_name)
+        with SnapshotWriter(self.file_name) as f:
+            f.write("new\n")
+        self.assertFalse(os.path.exists(self.checksum_file_name))
+        SnapshotWriter.verify(self.file_name)
+
+    def test_pending_checksum(self):
+        with SnapshotWriter(self.file_name, checksum=True) as f:
+            f.write("old\n")
+        os.replace(self.checksum_file_name, self.checksum_file_name + ".tmp")
+        with open(self.checksum_file_name, "wt") as f:
+            f.write("0" * 64 + "\n")
+        SnapshotWriter.verify(self.file_name)
+        self.assertFalse(os.path.exists(self.checksum_file_name + ".tmp"))
+        SnapshotWriter.verify(self.file_name)
+
+    def test_binary_repository(self):
+        file_name = "../../TestFiles/test_snapshot_writer.pickle"
+        with open(file_name, "wb") as f:
+            pickle.dump({}, f)
+        repo = BinaryRepository(ClientValidator, ClientException, file_name, checksum=True)
+        repo.add(Client(1, "name"))
+        with open(file_name, "r+b") as f:
+            f.truncate(os.path.getsize(file_name) - 1)
+        self.assertRaises(ValueError, BinaryRepository, ClientValidator, ClientException, file_name, checksum=True)
+        os.remove(file_name)
+        os.remove(file_name + SnapshotWriter.CHECKSUM_SUFFIX)
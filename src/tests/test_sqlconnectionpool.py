@@ -0,0 +1,54 @@
+import os
+import sqlite3
+import threading
+from unittest import TestCase
+
+from repository.sqlconnectionpool import SQLConnectionPool
+
+
+class TestSQLConnectionPool(TestCase):
+    def setUp(self):
+        self.pool = SQLConnectionPool(":memory:", 2)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_file_name(self):
+        self.assertEqual(self.pool.file_name, ":memory:")
+
+    def test_get_connection(self):
+        connection = self.pool.get_connection()
+        self.assertIs(connection, self.pool.get_connection())
+        other_connections = []
+        thread = threading.Thread(target=lambda: other_connections.append(self.pool.get_connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(connection, other_connections[0])
+
+    def test_release_connection(self):
+        connection = self.pool.get_connection()
+        self.pool.release_connection()
+        self.assertRaises(sqlite3.ProgrammingError, connection.execute, "SELECT 1")
+        self.assertIsNot(connection, self.pool.get_connection())
+
+    def test_close(self):
+        connection = self.pool.get_connection()
+        self.pool.close()
+        self.assertRaises(sqlite3.ProgrammingError, connection.execute, "SELECT 1")
+        self.assertRaises(sqlite3.ProgrammingError, self.pool.get_connection)
+
+    def test_pragmas(self):
+        file_name = "../../TestFiles/test_connection_pool.db"
+        pool = SQLConnectionPool(file_name, pragmas={"page_size": 8192, "journal_mode": "WAL",
+                                                     "synchronous": "NORMAL", "cache_size": -1024})
+        try:
+            connection = pool.get_connection()
+            self.assertEqual(connection.execute("PRAGMA page_size").fetchone()[0], 8192)
+            self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(connection.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual(connection.execute("PRAGMA cache_size").fetchone()[0], -1024)
+        finally:
+            pool.close()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(file_name + suffix):
+                    os.remove(file_name + suffix)
@@ -0,0 +1,190 @@
+import os
+import sqlite3
+from datetime import date
+from unittest import TestCase
+
+from domain.client import Client
+from domain.rental import Rental
+from domain.validators import ClientValidator, ClientException, MovieValidator, MovieException, RentalValidator, \
+    RentalException
+from repository.sqlconnectionpool import SQLConnectionPool
+from repository.sqldataaccessentity import ClientSQLDataAccess, MovieSQLDataAccess, RentalSQLDataAccess
+from repository.sqlqueryrepository import SQLQueryRepository
+from repository.sqlrepository import SQLRepository
+from services.clientservice import ClientService
+from services.movieservice import MovieService
+from services.rentalservice import RentalService
+
+
+class TestSQLQueryRepository(TestCase):
+    def setUp(self):
+        self.file_names = {table: "../../TestFiles/test_sql_query_" + table + ".db"
+                           for table in ("clients", "movies", "rentals")}
+        schemas = {"clients": ("ID int, Name text", [(1, "Ann"), (2, "Bob"), (3, "Dan")]),
+                   "movies": ("ID int, Title text, Description text, Genre text",
+                              [(1, "t1", "d1", "g1"), (2, "t2", "d2", "g2")]),
+                   "rentals": ("ID int, MovieID int, ClientID int, RentedDate text, DueDate text, ReturnedDate text",
+                               [(1, 1, 1, "2020-05-23", "2020-07-23", "None"),
+                                (2, 2, 2, "2020-05-23", "2020-07-23", "2020-08-23"),
+                                (3, 1, 2, "2020-04-23", "2020-05-22", "2020-04-27")])}
+        for table, (columns, rows) in schemas.items():
+            connection = sqlite3.connect(self.file_names[table])
+            connection.execute("CREATE TABLE " + table + " (" + columns + ")")
+            connection.executemany("INSERT INTO " + table + " VALUES(" + ", ".join("?" * len(rows[0])) + ")", rows)
+            connection.commit()
+            connection.close()
+        self.client_repo = SQLQueryRepository(ClientValidator, ClientException, ClientSQLDataAccess(),
+                                              self.file_names["clients"], "clients")
+        self.movie_repo = SQLQueryRepository(MovieValidator, MovieException, MovieSQLDataAccess(),
+                                             self.file_names["movies"], "movies")
+        self.rental_repo = SQLQueryRepository(RentalValidator, RentalException, RentalSQLDataAccess(),
+                                              self.file_names["rentals"], "rentals")
+        self.client_service = ClientService(self.client_repo, self.rental_repo)
+        self.rental_service = RentalService(self.client_repo, self.movie_repo, self.rental_repo, True)
+
+    def tearDown(self):
+        for repo in (self.client_repo, self.movie_repo, self.rental_repo):
+            repo.close()
+        for file_name in self.file_names.values():
+            os.remove(file_name)
+
+    def test_lookups(self):
+        self.assertEqual(self.client_repo.get_current_ids(), [1, 2, 3])
+        self.assertTrue(self.client_repo.contains(2))
+        self.assertFalse(self.client_repo.contains(4))
+        self.assertFalse(self.client_repo.contains([]))
+        self.assertEqual(self.client_repo.get_entity_at_id(2).name, "Bob")
+        self.assertRaises(ClientException, self.client_repo.get_entity_at_id, 4)
+        self.assertEqual([client.id for client in self.client_repo.entities], [1, 2, 3])
+
+    def test_add_remove_update(self):
+        self.client_repo.add(Client(4, "Eve"))
+        self.assertRaises(ClientException, self.client_repo.add, Client(4, "Eve"))
+        self.assertEqual(self.client_repo.update(Client(4, "Eva")).name, "Eve")
+        self.assertEqual(self.client_repo.get_entity_at_id(4).name, "Eva")
+        self.assertEqual(self.client_repo.remove(4).name, "Eva")
+        self.assertEqual(self.client_repo.get_current_ids(), [1, 2, 3])
+
+    def test_missing_id(self):
+        self.assertRaises(ClientException, self.client_repo.remove, 4)
+        self.assertRaises(ClientException, self.client_repo.update, Client(4, "Eve"))
+        self.assertRaises(ClientException, self.client_service.remove, 999)
+        self.assertRaises(RentalException, self.rental_service.delete_rental, 999)
+        self.assertEqual(self.client_repo.get_current_ids(), [1, 2, 3])
+
+    def test_transaction(self):
+        with self.assertRaises(ClientException):
+            with self.client_repo.transaction():
+                self.client_repo.add(Client(4, "Eve"))
+                self.client_repo.add(Client(4, "Eve"))
+        self.assertEqual(self.client_repo.get_current_ids(), [1, 2, 3])
+
+    def test_register_index(self):
+        self.assertRaises(ClientException, self.client_repo.add_index, "name", lambda client: client.name)
+        self.assertRaises(ClientException, self.client_repo.get_index, "name")
+
+    def test_search(self):
+        self.assertEqual([client.id for client in self.client_service.search_for_clients_by_attribute("n", "name")],
+                         [1, 3])
+        self.assertEqual([client.id for client in self.client_service.search_for_clients_by_attribute("2", "id")],
+                         [2])
+
+    def test_filters(self):
+        self.assertEqual([rental.id for rental in self.rental_service.get_rentals_from_client(2)], [2, 3])
+        self.assertEqual([rental.id for rental in self.rental_service.get_rentals_for_movie(1)], [1, 3])
+        self.client_service.remove(2)
+        self.assertEqual(self.rental_repo.get_current_ids(), [1])
+
+    def test_availability_and_blocking(self):
+        self.assertTrue(self.rental_service.check_if_client_has_late_returns_at_date(1, date(2020, 7, 24)))
+        self.assertFalse(self.rental_service.check_if_client_has_late_returns_at_date(3, date(2020, 7, 24)))
+        self.assertFalse(self.rental_service.check_if_movie_is_available_between_dates(1, date(2020, 6, 1),
+                                                                                        date(2020, 6, 2)))
+        self.assertFalse(self.rental_service.check_if_movie_is_available_between_dates(2, date(2020, 6, 1),
+                                                                                        date(2020, 6, 2)))
+        self.assertTrue(self.rental_service.check_if_movie_is_available_between_dates(2, date(2020, 9, 1),
+                                                                                       date(2020, 9, 2)))
+
+    def test_reports(self):
+        self.rental_repo.add(Rental(4, 2, 3, date(2020, 9, 1), date(2020, 9, 5), date(2020, 9, 3)))
+        self.assertEqual([(movie.movie_id, movie.days) for movie in self.rental_service.generate_most_rented_movies()],
+                         [(1, (date.today() - date(2020, 5, 23)).days + 4), (2, 94)])
+        self.assertEqual([client.client_id for client in self.rental_service.generate_most_active_clients(2)], [1, 2])
+        self.assertEqual([rental.rental_id for rental in self.rental_service.generate_late_rentals()], [1])
+
+
+class TestSingleDatabaseSQLQueryRepository(TestCase):
+    def setUp(self):
+        self.file_name = "../../TestFiles/test_sql_single_database.db"
+        self.connection_pool = SQLConnectionPool(self.file_name, pragmas={"foreign_keys": "ON"})
+        self.client_repo = SQLQueryRepository(ClientValidator, ClientException, ClientSQLDataAccess(), None,
+                                              "clients", connection_pool=self.connection_pool)
+        self.movie_repo = SQLQueryRepository(MovieValidator, MovieException, MovieSQLDataAccess(), None, "movies",
+                                             connection_pool=self.connection_pool)
+        self.rental_repo = SQLQueryRepository(RentalValidator, RentalException, RentalSQLDataAccess(True), None,
+                                              "rentals", connection_pool=self.connection_pool)
+        self.client_service = ClientService(self.client_repo, self.rental_repo)
+        self.movie_service = MovieService(self.movie_repo, self.rental_repo)
+        self.rental_service = RentalService(self.client_repo, self.movie_repo, self.rental_repo, True)
+        self.client_service.add(1, "Ann")
+        self.client_service.add(2, "Bob")
+        self.movie_service.add(1, "t1", "d1", "g1")
+        self.movie_service.add(2, "t2", "d2", "g2")
+        self.rental_repo.add(Rental(1, 1, 1, date(2020, 5, 23), date(2020, 7, 23)))
+        self.rental_repo.add(Rental(2, 2, 2, date(2020, 5, 23), date(2020, 7, 23), date(2020, 8, 23)))
+        self.rental_repo.add(Rental(3, 1, 2, date(2020, 4, 23), date(2020, 5, 22), date(2020, 4, 27)))
+
+    def tearDown(self):
+        for repo in (self.client_repo, self.movie_repo, self.rental_repo):
+            repo.close()
+        self.connection_pool.close()
+        os.remove(self.file_name)
+
+    def test_foreign_keys(self):
+        self.assertRaises(sqlite3.IntegrityError, self.rental_repo.add,
+                          Rental(4, 1, 3, date(2020, 9, 1), date(2020, 9, 5)))
+        self.assertEqual(self.rental_repo.get_current_ids(), [1, 2, 3])
+
+    def test_deferred_foreign_key(self):
+        with self.assertRaises(sqlite3.IntegrityError):
+            with self.rental_repo.transaction():
+                self.rental_repo.add(Rental(4, 3, 1, date(2020, 9, 1), date(2020, 9, 5)))
+        self.assertEqual(self.rental_repo.get_current_ids(), [1, 2, 3])
+        self.assertFalse(self.connection_pool.in_transaction)
+        self.client_service.add(3, "Dan")
+        connection = sqlite3.connect(self.file_name)
+        self.assertEqual([connection.execute("SELECT COUNT(*) FROM " + table).fetchone()
+                          for table in ("clients", "rentals")], [(3,), (3,)])
+        connection.close()
+
+    def test_joined_transaction(self):
+        client_repo = SQLRepository(ClientValidator, ClientException, ClientSQLDataAccess(), None, "clients",
+                                    connection_pool=self.connection_pool)
+        rental_repo = SQLRepository(RentalValidator, RentalException, RentalSQLDataAccess(True), None, "rentals",
+                                    connection_pool=self.connection_pool)
+        with self.assertRaises(sqlite3.IntegrityError):
+            with client_repo.transaction(), rental_repo.transaction():
+                client_repo.add(Client(3, "Dan"))
+                rental_repo.add(Rental(4, 3, 3, date(2020, 9, 1), date(2020, 9, 5)))
+        self.assertEqual(client_repo.get_current_ids(), [1, 2])
+        self.assertEqual(rental_repo.get_current_ids(), [1, 2, 3])
+        self.assertEqual(self.client_repo.get_current_ids(), [1, 2])
+        client_repo.close()
+        rental_repo.close()
+
+    def test_cascade_remove(self):
+        removed_client = self.client_service.remove(2)
+        self.assertEqual([rental.id for rental in removed_client[2]], [2, 3])
+        self.assertEqual(self.rental_repo.get_current_ids(), [1])
+        self.movie_service.remove(1)
+        self.assertEqual(self.rental_repo.get_current_ids(), [])
+        self.assertEqual(self.movie_repo.get_current_ids(), [2])
+
+    def test_reports(self):
+        self.assertEqual([(movie.movie_id, movie.movie_title, movie.days)
+                          for movie in self.rental_service.generate_most_rented_movies()],
+                         [(1, "t1", (date.today() - date(2020, 5, 23)).days + 4), (2, "t2", 92)])
+        self.assertEqual([(client.client_id, client.client_name)
+                          for client in self.rental_service.generate_most_active_clients(1)], [(1, "Ann")])
+        self.assertEqual([(rental.rental_id, rental.movie_title)
+                          for rental in self.rental_service.generate_late_rentals()], [(1, "t1")])
@@ -0,0 +1,88 @@
+import os
+import sqlite3
+from unittest import TestCase
+
+from domain.client import Client
+from domain.validators import ClientValidator, ClientException
+from repository.sqldataaccessentity import ClientSQLDataAccess
+from repository.sqlrepository import SQLRepository
+
+
+class TestSQLRepository(TestCase):
+    def setUp(self):
+        self.file_name = "../../TestFiles/test_sql_repository.db"
+        connection = sqlite3.connect(self.file_name)
+        connection.execute("CREATE TABLE clients (ID int, Name text)")
+        connection.execute("INSERT INTO clients VALUES(1, 'name')")
+        connection.commit()
+        connection.close()
+        self.repo = SQLRepository(ClientValidator, ClientException, ClientSQLDataAccess(), self.file_name, "clients")
+
+    def tearDown(self):
+        self.repo.close()
+        os.remove(self.file_name)
+
+    def read_clients(self):
+        connection = sqlite3.connect(self.file_name)
+        clients = connection.execute("SELECT * FROM clients ORDER BY ID").fetchall()
+        connection.close()
+        return clients
+
+    def test_load(self):
+        self.assertEqual(self.repo.get_entity_at_id(1).name, "name")
+
+    def test_add(self):
+        self.repo.add(Client(2, "another name"))
+        self.assertEqual(self.read_clients(), [(1, "name"), (2, "another name")])
+
+    def test_add_all(self):
+        self.repo.add_all([Client(3, "name"), Client(2, "another name")])
+        self.assertEqual(self.read_clients(), [(1, "name"), (2, "another name"), (3, "name")])
+
+    def test_remove(self):
+        self.repo.remove(1)
+        self.assertEqual(self.read_clients(), [])
+
+    def test_update(self):
+        self.repo.update(Client(1, "another name"))
+        self.assertEqual(self.read_clients(), [(1, "another name")])
+
+    def test_transaction(self):
+        with self.repo.transaction():
+            self.repo.add(Client(2, "another name"))
+            self.repo.remove(1)
+        self.assertEqual(self.read_clients(), [(2, "another name")])
+        with self.assertRaises(ClientException):
+            with self.repo.transaction():
+                self.repo.add(Client(3, "name"))
+                self.repo.remove(1)
+        self.assertEqual(self.read_clients(), [(2, "another name")])
+        self.assertEqual(self.repo.get_current_ids(), [2])
+
+    def test_group_commit(self):
+        self.repo.close()
+        self.repo = SQLRepository(ClientValidator, ClientException, ClientSQLDataAccess(), self.file_name, "clients",
+                                  group_commit_window=60)
+        self.repo.add(Client(2, "another name"))
+        self.assertEqual(self.read_clients(), [(1, "name")])
+        self.repo.flush()
+        self.assertEqual(self.read_clients(), [(1, "name"), (2, "another name")])
+
+    def test_failed_commit(self):
+        self.repo.close()
+        self.repo = SQLRepository(ClientValidator, ClientException, ClientSQLDataAccess(), self.file_name, "clients",
+                                  pragmas={"busy_timeout": 0})
+        reader = sqlite3.connect(self.file_name)
+        reader.execute("BEGIN")
+        reader.execute("SELECT * FROM clients").fetchall()
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.repo.transaction():
+                self.repo.add(Client(2, "another name"))
+                self.repo.remove(1)
+        reader.rollback()
+        reader.close()
+        self.assertEqual(self.read_clients(), [(1, "name")])
+        self.assertEqual(self.repo.get_current_ids(), [1])
+        self.assertFalse(self.repo.connection_pool.in_transaction)
+        self.repo.add(Client(3, "name"))
+        self.assertEqual(self.read_clients(), [(1, "name"), (3, "name")])
@@ -0,0 +1,53 @@
+import sqlite3
+from datetime import date
+from unittest import TestCase
+
+from repository.sqldataaccessentity import RentalSQLDataAccess
+from repository.sqlschemamigrator import SQLSchemaMigrator
+
+
+class TestSQLSchemaMigrator(TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.migrator = SQLSchemaMigrator(self.connection)
+        self.migrations = RentalSQLDataAccess().get_schema_migrations()
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_migrate_new_table(self):
+        self.assertEqual(self.migrator.get_version("rentals"), 0)
+        self.migrator.migrate("rentals", self.migrations)
+        self.assertEqual(self.migrator.get_version("rentals"), len(self.migrations))
+        columns = self.connection.execute("PRAGMA table_info(rentals)").fetchall()
+        self.assertEqual([(column[1], column[2], column[5]) for column in columns],
+                         [("ID", "INTEGER", 1), ("MovieID", "INTEGER", 0), ("ClientID", "INTEGER", 0),
+                          ("RentedDate", "INTEGER", 0), ("DueDate", "INTEGER", 0), ("ReturnedDate", "INTEGER", 0)])
+        indexes = [row[1] for row in self.connection.execute("PRAGMA index_list(rentals)")]
+        self.assertEqual(sorted(indexes), ["rentals_ClientID", "rentals_DueDate", "rentals_MovieID",
+                                           "rentals_ReturnedDate"])
+        self.migrator.migrate("rentals", self.migrations)
+        self.assertEqual(self.migrator.get_version("rentals"), len(self.migrations))
+
+    def test_migrate_text_dates(self):
+        self.connection.execute("CREATE TABLE rentals (ID int, MovieID int, ClientID int, RentedDate text, "
+                                "DueDate text, ReturnedDate text)")
+        self.connection.execute("INSERT INTO rentals VALUES(1, 2, 3, '2020-05-23', '2020-07-23', 'None')")
+        self.connection.execute("INSERT INTO rentals VALUES(2, 2, 3, '2020-04-23', '2020-05-22', '2020-04-27')")
+        self.connection.commit()
+        self.migrator.migrate("rentals", self.migrations)
+        rentals = [RentalSQLDataAccess().read_from_line(row)
+                   for row in self.connection.execute("SELECT * FROM rentals ORDER BY ID")]
+        self.assertEqual([(rental.rented_date, rental.due_date, rental.returned_date) for rental in rentals],
+                         [(date(2020, 5, 23), date(2020, 7, 23), None),
+                          (date(2020, 4, 23), date(2020, 5, 22), date(2020, 4, 27))])
+
+    def test_failed_migration(self):
+        self.connection.execute("CREATE TABLE rentals (ID int, MovieID int, ClientID int, RentedDate text, "
+                                "DueDate text, ReturnedDate text)")
+        self.connection.executemany("INSERT INTO rentals VALUES(1, 2, 3, '2020-05-23', '2020-07-23', 'None')",
+                                    [(), ()])
+        self.connection.commit()
+        self.assertRaises(sqlite3.IntegrityError, self.migrator.migrate, "rentals", self.migrations)
+        self.assertEqual(self.migrator.get_version("rentals"), 1)
+        self.assertEqual(self.connection.execute("SELECT COUNT(*) FROM rentals").fetchone()[0], 2)
@@ -0,0 +1,56 @@
+import io
+import os
+import pickle
+from unittest import TestCase
+
+from domain.client import Client
+from domain.validators import ClientValidator, ClientException
+from repository.binaryrepository import BinaryRepository
+from repository.streamingloader import StreamingLoader
+
+
+class TestStreamingLoader(TestCase):
+    def test_chunks(self):
+        self.assertEqual(list(StreamingLoader.chunks(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(StreamingLoader.chunks([], 2)), [])
+
+    def test_load(self):
+        progress = []
+        added = []
+        loader = StreamingLoader(2, lambda file_name, loaded_count: progress.append((file_name, loaded_count)))
+        self.assertEqual(loader.load("file", ["1", "2", "3"], int, added.append), 3)
+        self.assertEqual(added, [[1, 2], [3]])
+        self.assertEqual(progress, [("file", 2), ("file", 3)])
+
+    def test_read_json_values(self):
+        text = '{"1": {"name": "a, b"}, "22" : [1, 2.5, "}"],\n "3": 12345, "4": null}'
+        self.assertEqual(list(StreamingLoader.read_json_values(io.StringIO(text), 3)),
+                         [{"name": "a, b"}, [1, 2.5, "}"], 12345, None])
+        self.assertEqual(list(StreamingLoader.read_json_values(io.StringIO(" [ 1, {\"a\": 2} ] "), 2)),
+                         [1, {"a": 2}])
+        self.assertEqual(list(StreamingLoader.read_json_values(io.StringIO("{}"))), [])
+        self.assertRaises(ValueError, list, StreamingLoader.read_json_values(io.StringIO("12")))
+        self.assertRaises(ValueError, list, StreamingLoader.read_json_values(io.StringIO('{"1": [1, 2')))
+
+    def test_read_pickle_records(self):
+        file = io.BytesIO()
+        pickle.dump({1: "a", 2: "b"}, file)
+        pickle.dump([3, 4], file)
+        file.seek(0)
+        self.assertEqual(list(StreamingLoader.read_pickle_records(file)), ["a", "b", 3, 4])
+
+    def test_binary_repository_chunks(self):
+        file_name = "../../TestFiles/test_streaming_loader.pickle"
+        with open(file_name, "wb") as f:
+            pickle.dump({}, f)
+        repo = BinaryRepository(ClientValidator, ClientException, file_name, StreamingLoader(2))
+        for client_id in range(1, 6):
+            repo.add(Client(client_id, "name" + str(client_id)))
+        chunks = []
+        with open(file_name, "rb") as f:
+            while f.peek(1):
+                chunks.append([client.id for client in pickle.load(f)])
+        self.assertEqual(chunks, [[1, 2], [3, 4], [5]])
+        other_repo = BinaryRepository(ClientValidator, ClientException, file_name)
+        self.assertEqual(other_repo.get_current_ids(), [1, 2, 3, 4, 5])
+        os.remove(file_name)
@@ -0,0 +1,93 @@
+import os
+from unittest import TestCase
+
+from domain.client import Client
+from domain.validators import ClientValidator, ClientException
+from repository.textdataaccessentity import ClientTextDataAccess
+from repository.textfilerepository import TextFileRepository
+
+
+class TestTextFileRepository(TestCase):
+    def setUp(self):
+        self.file_name = "../../TestFiles/test_text_file_repository.txt"
+        with open(self.file_name, "wt") as f:
+            f.write("1;name\n")
+        self.repo = self.open_repository()
+
+    def tearDown(self):
+        self.repo.close()
+        for file_name in (self.file_name, self.repo.journal_file_name):
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
+    def open_repository(self, compaction_threshold=1000):
+        return TextFileRepository(ClientValidator, ClientException, ClientTextDataAccess(), self.file_name, True,
+                                  compaction_threshold)
+
+    def read_file(self, file_name):
+        with open(file_name, "rt") as f:
+            return f.read()
+
+    def test_journal(self):
+        self.repo.add(Client(2, "another name"))
+        self.repo.update(Client(1, "new name"))
+        self.repo.remove(2)
+        self.assertEqual(self.read_file(self.file_name), "1;name\n")
+        self.assertEqual(self.read_file(self.repo.journal_file_name),
+                         "P;2;another name\nC\nP;1;new name\nC\nD;2\nC\n")
+        other_repo = self.open_repository()
+        self.assertEqual([(client.id, client.name) for client in other_repo.entities], [(1, "new name")])
+        other_repo.close()
+
+    def test_transaction(self):
+        with self.repo.transaction():
+            self.repo.add(Client(2, "another name"))
+            self.repo.remove(1)
+        with self.assertRaises(ClientException):
+            with self.repo.transaction():
+                self.repo.add(Client(3, "name"))
+                self.repo.remove(4)
+        self.assertEqual(self.read_file(self.repo.journal_file_name), "P;2;another name\nD;1\nC\n")
+
+    def test_incomplete_group(self):
+        self.repo.add(Client(2, "another name"))
+        self.repo.close()
+        with open(self.repo.journal_file_name, "at") as f:
+            f.write("P;3;name\nD;1\n")
+        self.repo = self.open_repository()
+        self.assertEqual(self.repo.get_current_ids(), [1, 2])
+
+    def test_torn_tail(self):
+        for torn_tail in ("P;3;c\nD;1", "P;3;c\n"):
+            with open(self.repo.journal_file_name, "at") as f:
+                f.write(torn_tail)
+            other_repo = self.open_repository()
+            other_repo.add(Client(4, "d"))
+            self.assertEqual(self.read_file(self.repo.journal_file_name), "P;4;d\nC\n")
+            reopened_repo = self.open_repository()
+            self.assertEqual(reopened_repo.get_current_ids(), [1, 4])
+            reopened_repo.close()
+            other_repo.remove(4)
+            other_repo.close()
+
+    def test_compact(self):
+        self.repo.close()
+        self.repo = self.open_repository(2)
+        self.repo.add(Client(2, "another name"))
+        self.repo.remove(1)
+        self.assertEqual(self.read_file(self.file_name), "2;another name\n")
+        self.assertEqual(self.read_file(self.repo.journal_file_name), "")
+        self.repo.add(Client(3, "name"))
+        self.repo.close()
+        self.assertEqual(self.read_file(self.file_name), "2;another name\n3;name\n")
+        self.assertEqual(self.read_file(self.repo.journal_file_name), "")
+
+    def test_replay_after_compaction(self):
+        self.repo.add(Client(2, "another name"))
+        self.repo.remove(1)
+        journal = self.read_file(self.repo.journal_file_name)
+        self.repo.close()
+        with open(self.repo.journal_file_name, "wt") as f:
+            f.write(journal)
+        self.repo = self.open_repository()
+        self.assertEqual([(client.id, client.name) for client in self.repo.entities], [(2, "another name")])
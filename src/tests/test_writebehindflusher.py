@@ -0,0 +1,72 @@
+import os
+import threading
+from unittest import TestCase
+
+from domain.client import Client
+from domain.validators import ClientValidator, ClientException
+from repository.jsondataaccessentity import ClientJSONDataAccess
+from repository.jsonrepository import JSONRepository
+from repository.writebehindflusher import WriteBehindFlusher
+
+
+class TestWriteBehindFlusher(TestCase):
+    def setUp(self):
+        self.saves = 0
+        self.saved = threading.Event()
+
+    def save(self):
+        self.saves += 1
+        self.saved.set()
+
+    def test_write_through(self):
+        flusher = WriteBehindFlusher(self.save)
+        flusher.mark_dirty()
+        flusher.mark_dirty()
+        self.assertEqual(self.saves, 2)
+        self.assertEqual(flusher.dirty_count, 0)
+        flusher.close()
+        self.assertEqual(self.saves, 2)
+
+    def test_write_behind(self):
+        flusher = WriteBehindFlusher(self.save, 60)
+        for i in range(10):
+            flusher.mark_dirty()
+        self.assertEqual((self.saves, flusher.dirty_count), (0, 10))
+        flusher.flush()
+        self.assertEqual((self.saves, flusher.dirty_count), (1, 0))
+        flusher.flush()
+        flusher.mark_dirty()
+        flusher.close()
+        self.assertEqual(self.saves, 2)
+
+    def test_flush_threshold(self):
+        flusher = WriteBehindFlusher(self.save, 60, 3)
+        flusher.mark_dirty()
+        flusher.mark_dirty()
+        self.assertFalse(self.saved.wait(0.05))
+        flusher.mark_dirty()
+        self.assertTrue(self.saved.wait(5))
+        flusher.close()
+        self.assertEqual(self.saves, 1)
+
+    def test_flush_interval(self):
+        flusher = WriteBehindFlusher(self.save, 0.01)
+        flusher.mark_dirty()
+        self.assertTrue(self.saved.wait(5))
+        flusher.close()
+        self.assertEqual(self.saves, 1)
+
+    def test_json_repository(self):
+        file_name = "../../TestFiles/test_write_behind.json"
+        with open(file_name, "wt") as f:
+            f.write("{}")
+        repo = JSONRepository(ClientValidator, ClientException, ClientJSONDataAccess(), file_name, flush_interval=60)
+        repo.add(Client(1, "name"))
+        with repo.transaction():
+            repo.add(Client(2, "another name"))
+        with open(file_name, "rt") as f:
+            self.assertEqual(f.read(), "{}")
+        repo.close()
+        other_repo = JSONRepository(ClientValidator, ClientException, ClientJSONDataAccess(), file_name)
+        self.assertEqual(other_repo.get_current_ids(), [1, 2])
+        os.remove(file_name)